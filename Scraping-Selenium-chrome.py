@@ -5,480 +5,849 @@ Adaptado del código para Safari, manteniendo la misma funcionalidad
 Enfocado en extraer correctamente título y precio (formato MXN)
 """
 import json
+import sys
 import time
 import os
-import re
 from datetime import datetime
+from urllib.parse import urlsplit
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from webdriver_manager.chrome import ChromeDriverManager
+from batch_extraction import card_links, extract_products_batch
+from offline_parser import LISTING_BASE_URL, PRICE_PATTERNS, parse_listing_html
+from http_fetch import ITEM_HOST, LISTING_HOST, HostRateLimiter, HttpFetcher, USER_AGENT, needs_js_rendering
+from pagination import MAX_PAGES, build_page_urls, prefetch_pages
+from browser_pool import BrowserPool
+from waits import WaitRecorder, dismiss_disclaimer, scroll_into_view, wait_for_listing
+from lean_mode import LeanProfile, PageWeightMonitor, enable_performance_log
+from driver_cache import timed_resolve_chromedriver_path
+from stream_output import ProductStreamWriter, convert_to_json, json_path_for, read_products, stream_path_for
+from screenshots import ScreenshotCapture
+from strategy_cache import STRATEGIES_FILENAME, StrategyCache, run_strategies
+from price_normalizer import annotate_prices
+from page_cache import PAGE_CACHE_FILENAME, PageCache
+from detail_crawler import crawl_details, merge_details
+from item_ids import SEEN_INDEX_FILENAME, SeenIndex, item_id_from_url
+from product_store import STORE_FILENAME, ProductStore
+from parquet_export import PARQUET_DIRNAME, ParquetStreamWriter, TeeWriter
+from phase_timings import PROMETHEUS_FILENAME, PhaseTimings, span, timed
+from driver_profiler import DriverProfiler, profile_card, profile_new_page, profile_site
+from diagnostics import DiagnosticsPolicy, capture_card, page_report, price_formats
+from checkpoint import CHECKPOINT_FILENAME, CheckpointJournal
+from term_scheduler import DEFAULT_PRIORITY, TermScheduler, parse_deadline, read_terms
+from scraper_logging import get_logger
 
-def log(message):
-    """Función simple para mostrar logs con timestamp"""
-    timestamp = datetime.now().strftime("%H:%M:%S")
-    print(f"[{timestamp}] {message}")
+# Mensajes generales en INFO; el detalle por tarjeta en DEBUG (SCRAPER_LOG_LEVEL=DEBUG)
+logger = get_logger("chrome")
+log = logger.info
 
-def scrape_mercadolibre_chrome(search_term, num_pages=1):
-    # Obtener la ruta absoluta del directorio donde está el script o ejecutable
-    base_path = os.path.dirname(os.path.abspath(__file__))
-    
-    # Crear carpeta de output para Chrome si no existe
-    output_dir = os.path.join(base_path, "output-chrome")
-    if not os.path.exists(output_dir):
-        os.makedirs(output_dir)
-        log(f"Carpeta creada: {output_dir}")
+# Métodos de extracción por tarjeta. Cada uno devuelve (valor, método) o None y
+# puede lanzar excepciones de WebDriver, que cuentan como intento fallido.
+
+def title_by_class(driver, item):
+    # Intento 1: Título con clase específica
+    title_text = item.find_element(By.XPATH, './/h2[contains(@class, "ui-search-item__title")]').text.strip()
+    if title_text:
+        logger.debug("Título encontrado con selector específico: %.30s...", title_text)
+        return title_text, "xpath_title_class"
+
+def title_by_h2(driver, item):
+    # Intento 2: Cualquier h2 dentro del elemento
+    title_elems = item.find_elements(By.TAG_NAME, 'h2')
+    if title_elems:
+        title_text = title_elems[0].text.strip()
+        if title_text:
+            logger.debug("Título encontrado con tag h2: %.30s...", title_text)
+            return title_text, "tag_h2"
+
+def title_by_attribute(driver, item):
+    # Intento 3: Elemento con atributo title
+    title_attr_elems = item.find_elements(By.XPATH, './/*[@title]')
+    if title_attr_elems:
+        title_text = title_attr_elems[0].get_attribute('title').strip()
+        if title_text:
+            logger.debug("Título encontrado con atributo title: %.30s...", title_text)
+            return title_text, "attr_title"
+
+def title_by_javascript(driver, item):
+    # Intento 4: JavaScript - buscar título en todo el contenedor
+    js_result = driver.execute_script("""
+        var container = arguments[0];
+        var possibleTitles = [
+            container.querySelector('h2'),
+            container.querySelector('.ui-search-item__title'),
+            container.querySelector('[title]'),
+            container.querySelector('a')
+        ];
+        
+        for (var i = 0; i < possibleTitles.length; i++) {
+            var elem = possibleTitles[i];
+            if (elem) {
+                if (elem.title) return elem.title;
+                if (elem.textContent) return elem.textContent;
+            }
+        }
+        
+        return null;
+    """, item)
     
-    # Nombre del archivo de salida en la carpeta correspondiente
-    current_time = datetime.now().strftime("%Y%m%d_%H%M%S")
-    output_filename = os.path.join(output_dir, f"productos_chrome_{search_term.replace(' ', '_')}_{current_time}.json")
+    if js_result:
+        logger.debug("Título encontrado con JavaScript: %.30s...", js_result)
+        return js_result.strip(), "javascript_title"
 
+def price_by_components(driver, item):
+    # Intento 1: Obtener todos los componentes del precio y juntarlos
+    # Primero buscamos el contenedor principal del precio
+    price_container = item.find_element(By.XPATH, 
+        './/div[contains(@class, "ui-search-price")]')
     
-    # Lista para almacenar los productos
-    products_data = []
+    # Extraer todos los componentes del precio
+    symbol = price_container.find_element(By.XPATH, 
+        './/span[contains(@class, "andes-money-amount__currency-symbol")]').text.strip()
+    
+    fraction = price_container.find_element(By.XPATH, 
+        './/span[contains(@class, "andes-money-amount__fraction")]').text.strip()
     
-    log(f"Iniciando Chrome WebDriver para buscar '{search_term}'")
+    # Intentar obtener decimales si existen
     try:
-        # CAMBIO: Configuración específica para Chrome
-        chrome_options = Options()
-        chrome_options.add_argument("user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/118.0.0.0 Safari/537.36")
-        chrome_options.add_argument("--disable-search-engine-choice-screen")
-        chrome_options.add_argument("--disable-notifications")
-        chrome_options.add_argument("--disable-popup-blocking")
+        decimals = price_container.find_element(By.XPATH, 
+            './/span[contains(@class, "andes-money-amount__cents")]').text.strip()
+        full_price = f"{symbol} {fraction}.{decimals}"
+    except:
+        full_price = f"{symbol} {fraction}"
+    
+    if full_price:
+        logger.debug("Precio completo extraído por componentes: %s", full_price)
+        return full_price, "componentes_separados"
+
+def price_by_text(driver, item):
+    # Intento 2: Buscar el precio como texto directo
+    price_elem = item.find_element(By.XPATH, './/span[contains(@class, "price-tag-amount")]')
+    
+    # Capturar todo el contenido en texto
+    raw_price_text = price_elem.text.strip()
+    
+    # Intentar procesar el texto para asegurar que incluye símbolo y monto
+    if '$' in raw_price_text:
+        logger.debug("Precio encontrado como texto directo: %s", raw_price_text)
+        return raw_price_text, "texto_directo"
+    
+    # Si no incluye el símbolo, intentar encontrarlo cerca
+    symbol_elem = item.find_element(By.XPATH, './/span[contains(@class, "currency-symbol")]')
+    if symbol_elem:
+        symbol = symbol_elem.text.strip()
+        logger.debug("Precio reconstruido: %s %s", symbol, raw_price_text)
+        return f"{symbol} {raw_price_text}", "texto_simbolo_separado"
+
+def price_by_javascript(driver, item):
+    # Intento 3: Método avanzado con JavaScript para formato mexicano
+    js_result = driver.execute_script("""
+        var container = arguments[0];
         
-        # CAMBIO: Inicializar Chrome WebDriver
-        service = Service(ChromeDriverManager().install())
-        driver = webdriver.Chrome(service=service, options=chrome_options)
-        driver.set_window_size(1280, 800)
+        // 1. Intentar obtener componentes separados
+        var symbol = container.querySelector('.andes-money-amount__currency-symbol');
+        var fraction = container.querySelector('.andes-money-amount__fraction');
+        var cents = container.querySelector('.andes-money-amount__cents');
         
-        # Convertir búsqueda para URL
-        search_url = f"https://listado.mercadolibre.com.mx/{search_term.replace(' ', '-')}"
-        log(f"Navegando a: {search_url}")
+        if (symbol && fraction) {
+            var price = symbol.textContent.trim() + ' ' + fraction.textContent.trim();
+            if (cents) {
+                price += '.' + cents.textContent.trim();
+            }
+            return price;
+        }
         
-        # Ir a la página de búsqueda
-        driver.get(search_url)
-        time.sleep(3)  # CAMBIO: Chrome generalmente carga más rápido que Safari
+        // 2. Buscar cualquier elemento que contenga formato de precio mexicano
+        var allText = container.innerText;
+        var priceRegex = /\\$\\s?[0-9,]+(\\.\\d{2})?/g;
+        var matches = allText.match(priceRegex);
+        if (matches && matches.length > 0) {
+            return matches[0].trim();
+        }
         
-        # Guardar screenshot para diagnóstico
-        driver.save_screenshot(os.path.join(output_dir, "pagina_mercadolibre_chrome.png"))
-        log("Screenshot guardado como 'pagina_mercadolibre_chrome.png'")
+        // 3. Extraer cualquier texto con $ y números
+        var allElements = container.querySelectorAll('*');
+        for (var i = 0; i < allElements.length; i++) {
+            var text = allElements[i].textContent.trim();
+            if (text.includes('$') && /\\d/.test(text)) {
+                return text;
+            }
+        }
         
-        # Manejar disclaimer si aparece
+        return null;
+    """, item)
+    
+    if js_result:
+        logger.debug("Precio encontrado con JavaScript MX: %s", js_result)
+        return js_result.strip(), "javascript_precio_mx"
+
+def price_by_regex(driver, item):
+    # Intento 4: Buscar texto que parezca un precio en todo el elemento
+    all_text = item.text
+    for pattern in PRICE_PATTERNS:
+        match = pattern.search(all_text)
+        if match:
+            logger.debug("Precio encontrado con regex: %s", match.group(0))
+            return match.group(0).strip(), "regex_pattern"
+
+def price_by_dollar_sign(driver, item):
+    # Último recurso: guardar cualquier texto corto que tenga "$"
+    for elem in item.find_elements(By.XPATH, './/*[contains(text(), "$")]'):
+        text = elem.text.strip()
+        if '$' in text and len(text) < 20:  # Evitar textos largos
+            logger.debug("Precio encontrado con símbolo $: %s", text)
+            return text, "contains_dollar_sign"
+
+CLASS_LINK_XPATH = './/a[contains(@class, "ui-search-link")]'
+
+def url_by_class(driver, item):
+    link_elems = item.find_elements(By.XPATH, CLASS_LINK_XPATH)
+    if link_elems:
+        href = link_elems[0].get_attribute('href')
+        if href:
+            logger.debug("URL encontrada: %.50s...", href)
+            return href, "class_link"
+
+def url_by_tag(driver, item):
+    # Probar con cualquier enlace dentro del elemento, solo si no hay enlaces con clase
+    # (con enlaces sin href se pasa directo a JavaScript, como en la cascada original)
+    if item.find_elements(By.XPATH, CLASS_LINK_XPATH):
+        return None
+    any_links = item.find_elements(By.TAG_NAME, 'a')
+    if any_links:
+        href = any_links[0].get_attribute('href')
+        if href:
+            logger.debug("URL encontrada (tag genérico): %.50s...", href)
+            return href, "tag_a"
+
+def url_by_javascript(driver, item):
+    url_js = driver.execute_script("return arguments[0].querySelector('a')?.href || null;", item)
+    if url_js:
+        logger.debug("URL encontrada con JavaScript: %.50s...", url_js)
+        return url_js, "javascript"
+
+# Orden fijo de la cascada: el primer método que acierta da el valor
+EXTRACTION_STRATEGIES = {
+    "titulo": [
+        ("xpath_title_class", title_by_class),
+        ("tag_h2", title_by_h2),
+        ("attr_title", title_by_attribute),
+        ("javascript_title", title_by_javascript),
+    ],
+    "precio": [
+        ("componentes_separados", price_by_components),
+        ("texto_directo", price_by_text),
+        ("javascript_precio_mx", price_by_javascript),
+        ("regex_pattern", price_by_regex),
+        ("contains_dollar_sign", price_by_dollar_sign),
+    ],
+    "url": [
+        ("class_link", url_by_class),
+        ("tag_a", url_by_tag),
+        ("javascript", url_by_javascript),
+    ],
+}
+
+# Métodos que devuelven el mismo valor (el href del primer <a>); StrategyCache los ordena
+# entre sí por aciertos / tiempo sin cambiar el resultado
+EQUIVALENT_STRATEGIES = {
+    "url": [("tag_a", "javascript")],
+}
+
+def extract_product_legacy(driver, item, idx, waits=None, strategies=None, layout="unknown", timings=None):
+    """Extrae un producto con la cascada de métodos, una llamada a WebDriver por intento
+    - strategies: StrategyCache para intentar primero el método verificado de cada vista
+      (el resultado es el mismo que con el orden fijo); None usa siempre el orden fijo
+    - timings: PhaseTimings para medir cada cascada (cascada_titulo, cascada_precio, cascada_url)
+    """
+    # Hacer scroll para asegurar que el elemento esté visible
+    try:
+        with profile_site(driver, "scroll"):
+            scroll_into_view(driver, item, waits)
+    except:
+        logger.debug("No se pudo hacer scroll al elemento")
+    
+    # Producto base
+    product_data = {
+        "titulo": "No disponible",
+        "precio": "No disponible",
+        "url": "No disponible",
+        "posicion": idx + 1,
+        "metodo_extraccion": {
+            "titulo": "ninguno",
+            "precio": "ninguno",
+            "url": "ninguno"
+        }
+    }
+    
+    # Título, precio y URL: primer método que acierte en el orden vigente
+    profiler = getattr(driver, "profiler", None)
+    for field, field_strategies in EXTRACTION_STRATEGIES.items():
+        if profiler is not None:
+            field_strategies = profiler.wrap_strategies(field, field_strategies)
+        with span(timings, f"cascada_{field}"):
+            result = run_strategies(strategies, layout, field, field_strategies, driver, item,
+                                    equivalent=EQUIVALENT_STRATEGIES.get(field, ()))
+        if result:
+            product_data[field], product_data["metodo_extraccion"][field] = result
+        else:
+            logger.debug("No se pudo extraer %s del producto %d", field, idx + 1)
+    
+    # Registrar resultado de la extracción
+    logger.debug("Producto %d procesado: %.50s | %s | %.30s | %s", idx + 1, product_data["titulo"], product_data["precio"],
+                 product_data["url"], product_data["metodo_extraccion"],
+                 extra={"campos": {"posicion": idx + 1, "metodos": product_data["metodo_extraccion"]}})
+    
+    return product_data
+
+def create_chrome_driver(headless=False, lean=None, measure_weight=False, timings=None):
+    """Inicializa Chrome WebDriver con la configuración del scraper
+    - lean: LeanProfile con los recursos a bloquear, o None para cargar todo
+    - measure_weight: activa el log de rendimiento para medir el peso de cada página
+    - timings: PhaseTimings donde registrar resolver_chromedriver y arranque_navegador
+    """
+    chrome_options = Options()
+    if headless:
+        chrome_options.add_argument("--headless=new")
+    chrome_options.add_argument(f"user-agent={USER_AGENT}")
+    chrome_options.add_argument("--disable-search-engine-choice-screen")
+    chrome_options.add_argument("--disable-notifications")
+    chrome_options.add_argument("--disable-popup-blocking")
+    if lean is not None:
+        lean.apply_options(chrome_options)
+    if measure_weight:
+        enable_performance_log(chrome_options)
+    
+    # CAMBIO: Inicializar Chrome WebDriver con la ruta de chromedriver en caché
+    driver_path, source, resolve_seconds = timed_resolve_chromedriver_path()
+    
+    start = time.perf_counter()
+    service = Service(driver_path)
+    driver = webdriver.Chrome(service=service, options=chrome_options)
+    driver.set_window_size(1280, 800)
+    if lean is not None:
+        lean.apply(driver)
+    launch_seconds = time.perf_counter() - start
+    if timings is not None:
+        timings.record("resolver_chromedriver", resolve_seconds)
+        timings.record("arranque_navegador", launch_seconds)
+    
+    log(f"Arranque de Chrome{' headless' if headless else ''}: chromedriver resuelto en {resolve_seconds:.2f} s ({source}), "
+        f"navegador iniciado en {launch_seconds:.2f} s")
+    
+    return driver
+
+def open_listing_page(driver, search_url, waits=None, screenshots=None, timings=None):
+    """Navega al listado, captura la página si se pidieron screenshots y cierra el disclaimer"""
+    # Ir a la página de búsqueda y esperar solo hasta que haya resultados y precios
+    profile_new_page(driver)
+    with span(timings, "navegacion"), profile_site(driver, "navegacion"):
+        driver.get(search_url)
+        ready = wait_for_listing(driver, waits)
+    if not ready:
+        logger.warning("Tiempo de espera agotado para el listado. Se continúa con lo cargado")
+    
+    # Screenshot para diagnóstico (se escribe en segundo plano)
+    if screenshots:
         try:
-            disclaimer = WebDriverWait(driver, 5).until(
-                EC.element_to_be_clickable((By.XPATH, '//button[@data-testid="action:understood-button"]'))
-            )
-            disclaimer.click()
-            time.sleep(1)  # CAMBIO: Menos tiempo de espera para Chrome
+            with profile_site(driver, "screenshot"):
+                screenshots.capture_page(driver, "pagina_mercadolibre_chrome.png")
+        except Exception:
+            logger.warning("No se pudo capturar la página")
+    
+    # Manejar disclaimer si aparece
+    try:
+        with span(timings, "disclaimer"), profile_site(driver, "disclaimer"):
+            dismissed = dismiss_disclaimer(driver, waits)
+        if dismissed:
             log("Disclaimer cerrado")
-        except:
-            log("No se encontró disclaimer o no se pudo cerrar")
-        
-        # Verificar el formato de precios en la página actual
-        log("Analizando formatos de precio en la página...")
-        try:
-            # Obtener todos los elementos de precio para analizar formato
-            all_price_elements = driver.find_elements(By.XPATH, '//span[contains(@class, "price-tag-amount")]')
-            
-            # Si encontramos elementos, mostrar los primeros 3 para análisis
-            if all_price_elements:
-                log(f"Encontrados {len(all_price_elements)} elementos de precio para análisis")
-                for i, elem in enumerate(all_price_elements[:3]):
-                    price_text = elem.text.strip()
-                    log(f"Muestra de precio #{i+1}: '{price_text}'")
-                    
-                    # Intentar inspeccionar la estructura interna del precio
-                    try:
-                        price_parts = elem.find_elements(By.XPATH, './/span')
-                        parts_text = [p.text.strip() for p in price_parts]
-                        log(f"  - Componentes internos: {parts_text}")
-                    except:
-                        pass
-            else:
-                log("No se encontraron elementos de precio para análisis previo")
-        except Exception as e:
-            log(f"Error al analizar formatos de precio: {e}")
-        
-        # Detectar contenedor principal de resultados
-        main_container = None
-        container_selectors = [
-            '//section[@class="ui-search-results"]',
-            '//div[@class="ui-search-results"]',
-            '//ol[@class="ui-search-layout"]'
-        ]
-        
-        for selector in container_selectors:
-            containers = driver.find_elements(By.XPATH, selector)
-            if containers:
-                main_container = containers[0]
-                log(f"Contenedor principal encontrado: {selector}")
-                break
-        
-        if not main_container:
-            log("No se encontró el contenedor principal. Usando body como fallback")
-            main_container = driver.find_element(By.TAG_NAME, 'body')
-        
-        # Extraer productos del contenedor principal
-        log("Extrayendo productos del contenedor principal...")
+        else:
+            log("No se encontró disclaimer")
+    except:
+        log("No se encontró disclaimer o no se pudo cerrar")
+
+def capture_page_diagnostics(driver, diagnostics, prefix, products_data, url, timings=None, layout=None):
+    """Guarda el HTML de la página y el análisis de formatos de precio si la política lo pide"""
+    if diagnostics is None or not diagnostics.wants_page(products_data, layout):
+        return
+    try:
+        with span(timings, "analisis_precios"), profile_site(driver, "analisis_precios"):
+            info = page_report(products_data, url, diagnostics, layout)
+            info["formatos_precio"] = price_formats(driver)
+            logger.debug("Formatos de precio en la página: %s", info["formatos_precio"])
+            diagnostics.save_page(prefix, 1, driver.page_source, info)
+    except Exception as e:
+        logger.warning("No se pudo guardar el diagnóstico de la página: %s", e)
+
+def find_product_items(driver):
+    """Detecta el contenedor principal y el tipo de vista. Devuelve (tarjetas, "grid"|"list"|"unknown")"""
+    # Detectar contenedor principal de resultados
+    main_container = None
+    container_selectors = [
+        '//section[@class="ui-search-results"]',
+        '//div[@class="ui-search-results"]',
+        '//ol[@class="ui-search-layout"]'
+    ]
+    
+    for selector in container_selectors:
+        containers = driver.find_elements(By.XPATH, selector)
+        if containers:
+            main_container = containers[0]
+            log(f"Contenedor principal encontrado: {selector}")
+            break
+    
+    if not main_container:
+        logger.warning("No se encontró el contenedor principal. Usando body como fallback")
+        main_container = driver.find_element(By.TAG_NAME, 'body')
+    
+    # Extraer productos del contenedor principal
+    logger.debug("Extrayendo productos del contenedor principal...")
+    
+    # Detectar el tipo de vista (grid o lista)
+    grid_items = main_container.find_elements(By.XPATH, './/li[contains(@class, "ui-search-layout__item")]')
+    
+    if grid_items:
+        log(f"Detectada vista de cuadrícula con {len(grid_items)} productos")
+        product_items = grid_items
+        layout = "grid"
+    else:
+        # Intentar detectar vista de lista
+        list_items = main_container.find_elements(By.XPATH, './/div[contains(@class, "ui-search-result")]')
+        if list_items:
+            log(f"Detectada vista de lista con {len(list_items)} productos")
+            product_items = list_items
+            layout = "list"
+        else:
+            # Último intento - buscar cualquier tipo de contenedor de producto
+            log("No se detectó un patrón claro. Buscando cualquier contenedor de producto...")
+            product_items = main_container.find_elements(By.XPATH, 
+                './/*[contains(@class, "ui-search-result") or contains(@class, "ui-search-layout__item")]')
+            log(f"Encontrados {len(product_items)} posibles contenedores de productos")
+            layout = "unknown"
+    
+    return product_items, layout
+
+def capture_card_diagnostics(driver, diagnostics, item, product_data, timings=None, layout=None):
+    """html_debug solo si un campo falló o si la tarjeta entra en el muestreo
+    - Los motores batch y offline ya lo traen sin viajes extra: a las tarjetas sanas se les quita
+    """
+    if diagnostics is None:
+        return
+    if not diagnostics.wants_card(product_data, layout):
+        product_data.pop("html_debug", None)
+    elif "html_debug" not in product_data:
+        with span(timings, "html_debug"), profile_site(driver, "html_debug"):
+            product_data["html_debug"] = capture_card(driver, item)
+
+def capture_product(screenshots, item, idx, product_data, layout=None):
+    """Encola el screenshot de la tarjeta si el muestreo lo pide"""
+    if not screenshots or not screenshots.wants(idx, product_data, layout):
+        return
+    try:
+        with profile_site(item.parent, "screenshot"):
+            screenshots.capture_element(item, f"producto_chrome_{idx+1}.png")
+    except Exception:
+        logger.warning("No se pudo capturar el producto %d", idx + 1)
+
+def extract_listing_products(driver, product_items, engine, writer, max_products=15, waits=None, screenshots=None,
+                             strategies=None, layout="unknown", seen=None, timings=None, diagnostics=None):
+    """Extrae los productos de la página actual con el motor indicado y los agrega a writer
+    - seen: SeenIndex para descartar publicaciones ya extraídas antes de procesarlas
+    - timings: PhaseTimings para medir extracción, cascadas y guardado
+    - diagnostics: DiagnosticsPolicy que decide a qué tarjetas se agrega html_debug
+    """
+    products_data = []
+    
+    # Procesar los productos encontrados
+    if product_items:
+        log(f"Procesando {len(product_items)} productos...")
         
-        # Detectar el tipo de vista (grid o lista)
-        grid_items = main_container.find_elements(By.XPATH, './/li[contains(@class, "ui-search-layout__item")]')
+        # CAMBIO: Chrome puede manejar más productos de forma estable
+        max_products = len(product_items) if max_products is None else min(max_products, len(product_items))
+        log(f"Se procesarán los primeros {max_products} productos")
         
-        if grid_items:
-            log(f"Detectada vista de cuadrícula con {len(grid_items)} productos")
-            product_items = grid_items
-        else:
-            # Intentar detectar vista de lista
-            list_items = main_container.find_elements(By.XPATH, './/div[contains(@class, "ui-search-result")]')
-            if list_items:
-                log(f"Detectada vista de lista con {len(list_items)} productos")
-                product_items = list_items
-            else:
-                # Último intento - buscar cualquier tipo de contenedor de producto
-                log("No se detectó un patrón claro. Buscando cualquier contenedor de producto...")
-                product_items = main_container.find_elements(By.XPATH, 
-                    './/*[contains(@class, "ui-search-result") or contains(@class, "ui-search-layout__item")]')
-                log(f"Encontrados {len(product_items)} posibles contenedores de productos")
+        batch_products = None
+        if engine == "batch":
+            # Una sola llamada a WebDriver para todas las tarjetas
+            try:
+                start = time.perf_counter()
+                with span(timings, "extraccion_lote"), profile_site(driver, "lote"):
+                    batch_products = extract_products_batch(driver, product_items[:max_products])
+                elapsed_ms = (time.perf_counter() - start) * 1000
+                log(f"Extracción por lotes: {len(batch_products)} productos en {elapsed_ms:.1f} ms")
+            except Exception as e:
+                logger.warning("Error en extracción por lotes, usando extracción por tarjeta: %.50s...", e)
+        elif engine == "offline":
+            # Parsear page_source sin llamadas adicionales por tarjeta
+            try:
+                start = time.perf_counter()
+                with span(timings, "extraccion_offline"), profile_site(driver, "page_source"):
+                    batch_products = parse_listing_html(driver.page_source, max_products=max_products)
+                elapsed_ms = (time.perf_counter() - start) * 1000
+                log(f"Extracción offline: {len(batch_products)} productos en {elapsed_ms:.1f} ms")
+            except Exception as e:
+                logger.warning("Error en extracción offline, usando extracción por tarjeta: %.50s...", e)
         
-        # Procesar los productos encontrados
-        if product_items:
-            log(f"Procesando {len(product_items)} productos...")
+        if batch_products is not None:
+            annotate_prices(batch_products)
+            keep = [True] * len(batch_products)
+            if seen is not None:
+                for product_data in batch_products:
+                    product_data["item_id"] = item_id_from_url(product_data["url"])
+                keep = seen.filter_new([product_data["item_id"] for product_data in batch_products])
+                log(f"Publicaciones ya vistas descartadas: {keep.count(False)}")
             
-            # CAMBIO: Chrome puede manejar más productos de forma estable
-            max_products = min(15, len(product_items))
-            log(f"Se procesarán los primeros {max_products} productos")
+            for idx, product_data in enumerate(batch_products):
+                if not keep[idx]:
+                    continue
+                capture_card_diagnostics(driver, diagnostics, product_items[idx], product_data, timings, layout)
+                capture_product(screenshots, product_items[idx], idx, product_data, layout)
+                logger.debug("Producto %d: %.50s | %s | %s", idx + 1, product_data["titulo"], product_data["precio"],
+                             product_data["metodo_extraccion"])
+                products_data.append(product_data)
+            
+            with span(timings, "guardado"):
+                writer.write_many(products_data)
+            log(f"Guardado: {len(products_data)} productos guardados")
+        else:
+            # Con índice de vistas, una sola llamada trae las URLs y se descartan repetidos antes de la cascada
+            item_ids = [None] * max_products
+            keep = [True] * max_products
+            if seen is not None:
+                try:
+                    with profile_site(driver, "dedup_urls"):
+                        links = card_links(driver, product_items[:max_products])
+                    item_ids = [item_id_from_url(url) for url in links]
+                    keep = seen.filter_new(item_ids)
+                    log(f"Publicaciones ya vistas descartadas: {keep.count(False)}")
+                except Exception as e:
+                    logger.warning("No se pudieron leer las URLs para descartar repetidos: %.50s...", e)
             
             for idx, item in enumerate(product_items[:max_products]):
+                if not keep[idx]:
+                    continue
                 try:
-                    log(f"Procesando producto {idx+1}/{max_products}")
-                    
-                    # Hacer scroll para asegurar que el elemento esté visible
-                    try:
-                        driver.execute_script("arguments[0].scrollIntoView({block: 'center', behavior: 'smooth'});", item)
-                        time.sleep(0.5)  # CAMBIO: Chrome necesita menos tiempo de espera
-                    except:
-                        log("No se pudo hacer scroll al elemento")
-                    
-                    # Tomar screenshot del elemento actual para diagnóstico
-                    try:
-                        item.screenshot(os.path.join(output_dir, f"producto_chrome_{idx+1}.png"))
-                        log(f"Screenshot guardado como 'producto_chrome_{idx+1}.png'")
-                    except:
-                        log("No se pudo guardar screenshot del elemento")
-                    
-                    # Producto base
-                    product_data = {
-                        "titulo": "No disponible",
-                        "precio": "No disponible",
-                        "url": "No disponible",
-                        "posicion": idx + 1,
-                        "metodo_extraccion": {
-                            "titulo": "ninguno",
-                            "precio": "ninguno",
-                            "url": "ninguno"
-                        }
-                    }
+                    logger.debug("Procesando producto %d/%d", idx + 1, max_products)
+                    with profile_card(driver, idx):
+                        product_data = extract_product_legacy(driver, item, idx, waits, strategies, layout, timings)
+                    if seen is not None:
+                        product_data["item_id"] = item_ids[idx] or item_id_from_url(product_data["url"])
+                    annotate_prices([product_data])
+                    with profile_card(driver, idx):
+                        capture_card_diagnostics(driver, diagnostics, item, product_data, timings, layout)
+                        capture_product(screenshots, item, idx, product_data, layout)
                     
-                    # Extracción de título con múltiples métodos
-                    title_found = False
-                    
-                    # Intento 1: Título con clase específica
-                    if not title_found:
-                        try:
-                            title_elem = item.find_element(By.XPATH, './/h2[contains(@class, "ui-search-item__title")]')
-                            title_text = title_elem.text.strip()
-                            if title_text:
-                                product_data["titulo"] = title_text
-                                product_data["metodo_extraccion"]["titulo"] = "xpath_title_class"
-                                title_found = True
-                                log(f"Título encontrado con selector específico: {title_text[:30]}...")
-                        except:
-                            pass
-                    
-                    # Intento 2: Cualquier h2 dentro del elemento
-                    if not title_found:
-                        try:
-                            title_elems = item.find_elements(By.TAG_NAME, 'h2')
-                            if title_elems:
-                                title_text = title_elems[0].text.strip()
-                                if title_text:
-                                    product_data["titulo"] = title_text
-                                    product_data["metodo_extraccion"]["titulo"] = "tag_h2"
-                                    title_found = True
-                                    log(f"Título encontrado con tag h2: {title_text[:30]}...")
-                        except:
-                            pass
-                    
-                    # Intento 3: Elemento con atributo title
-                    if not title_found:
-                        try:
-                            title_attr_elems = item.find_elements(By.XPATH, './/*[@title]')
-                            if title_attr_elems:
-                                title_text = title_attr_elems[0].get_attribute('title').strip()
-                                if title_text:
-                                    product_data["titulo"] = title_text
-                                    product_data["metodo_extraccion"]["titulo"] = "attr_title"
-                                    title_found = True
-                                    log(f"Título encontrado con atributo title: {title_text[:30]}...")
-                        except:
-                            pass
-                    
-                    # Intento 4: JavaScript - buscar título en todo el contenedor
-                    if not title_found:
-                        try:
-                            js_result = driver.execute_script("""
-                                var container = arguments[0];
-                                var possibleTitles = [
-                                    container.querySelector('h2'),
-                                    container.querySelector('.ui-search-item__title'),
-                                    container.querySelector('[title]'),
-                                    container.querySelector('a')
-                                ];
-                                
-                                for (var i = 0; i < possibleTitles.length; i++) {
-                                    var elem = possibleTitles[i];
-                                    if (elem) {
-                                        if (elem.title) return elem.title;
-                                        if (elem.textContent) return elem.textContent;
-                                    }
-                                }
-                                
-                                return null;
-                            """, item)
-                            
-                            if js_result:
-                                product_data["titulo"] = js_result.strip()
-                                product_data["metodo_extraccion"]["titulo"] = "javascript_title"
-                                title_found = True
-                                log(f"Título encontrado con JavaScript: {js_result[:30]}...")
-                        except:
-                            pass
-                    
-                    # Extracción de precio con enfoque específico para México
-                    price_found = False
-                    
-                    # Intento 1: Obtener todos los componentes del precio y juntarlos
-                    if not price_found:
-                        try:
-                            # Primero buscamos el contenedor principal del precio
-                            price_container = item.find_element(By.XPATH, 
-                                './/div[contains(@class, "ui-search-price")]')
-                            
-                            # Extraer todos los componentes del precio
-                            symbol = price_container.find_element(By.XPATH, 
-                                './/span[contains(@class, "andes-money-amount__currency-symbol")]').text.strip()
-                            
-                            fraction = price_container.find_element(By.XPATH, 
-                                './/span[contains(@class, "andes-money-amount__fraction")]').text.strip()
-                            
-                            # Intentar obtener decimales si existen
-                            try:
-                                decimals = price_container.find_element(By.XPATH, 
-                                    './/span[contains(@class, "andes-money-amount__cents")]').text.strip()
-                                full_price = f"{symbol} {fraction}.{decimals}"
-                            except:
-                                full_price = f"{symbol} {fraction}"
-                            
-                            if full_price:
-                                product_data["precio"] = full_price
-                                product_data["metodo_extraccion"]["precio"] = "componentes_separados"
-                                price_found = True
-                                log(f"Precio completo extraído por componentes: {full_price}")
-                        except Exception as e:
-                            log(f"Error al extraer precio por componentes: {str(e)[:50]}...")
-                    
-                    # Intento 2: Buscar el precio como texto directo
-                    if not price_found:
-                        try:
-                            price_elem = item.find_element(By.XPATH, './/span[contains(@class, "price-tag-amount")]')
-                            
-                            # Capturar todo el contenido en texto
-                            raw_price_text = price_elem.text.strip()
-                            
-                            # Intentar procesar el texto para asegurar que incluye símbolo y monto
-                            if '$' in raw_price_text:
-                                product_data["precio"] = raw_price_text
-                                product_data["metodo_extraccion"]["precio"] = "texto_directo"
-                                price_found = True
-                                log(f"Precio encontrado como texto directo: {raw_price_text}")
-                            else:
-                                # Si no incluye el símbolo, intentar encontrarlo cerca
-                                symbol_elem = item.find_element(By.XPATH, './/span[contains(@class, "currency-symbol")]')
-                                if symbol_elem:
-                                    symbol = symbol_elem.text.strip()
-                                    product_data["precio"] = f"{symbol} {raw_price_text}"
-                                    product_data["metodo_extraccion"]["precio"] = "texto_simbolo_separado"
-                                    price_found = True
-                                    log(f"Precio reconstruido: {symbol} {raw_price_text}")
-                        except Exception as e:
-                            log(f"Error al extraer precio como texto directo: {str(e)[:50]}...")
-                    
-                    # Intento 3: Método avanzado con JavaScript para formato mexicano
-                    if not price_found:
-                        try:
-                            js_result = driver.execute_script("""
-                                var container = arguments[0];
-                                
-                                // 1. Intentar obtener componentes separados
-                                var symbol = container.querySelector('.andes-money-amount__currency-symbol');
-                                var fraction = container.querySelector('.andes-money-amount__fraction');
-                                var cents = container.querySelector('.andes-money-amount__cents');
-                                
-                                if (symbol && fraction) {
-                                    var price = symbol.textContent.trim() + ' ' + fraction.textContent.trim();
-                                    if (cents) {
-                                        price += '.' + cents.textContent.trim();
-                                    }
-                                    return price;
-                                }
-                                
-                                // 2. Buscar cualquier elemento que contenga formato de precio mexicano
-                                var allText = container.innerText;
-                                var priceRegex = /\\$\\s?[0-9,]+(\\.\\d{2})?/g;
-                                var matches = allText.match(priceRegex);
-                                if (matches && matches.length > 0) {
-                                    return matches[0].trim();
-                                }
-                                
-                                // 3. Extraer cualquier texto con $ y números
-                                var allElements = container.querySelectorAll('*');
-                                for (var i = 0; i < allElements.length; i++) {
-                                    var text = allElements[i].textContent.trim();
-                                    if (text.includes('$') && /\\d/.test(text)) {
-                                        return text;
-                                    }
-                                }
-                                
-                                return null;
-                            """, item)
-                            
-                            if js_result:
-                                product_data["precio"] = js_result.strip()
-                                product_data["metodo_extraccion"]["precio"] = "javascript_precio_mx"
-                                price_found = True
-                                log(f"Precio encontrado con JavaScript MX: {js_result}")
-                        except Exception as e:
-                            log(f"Error al extraer precio con JavaScript: {str(e)[:50]}...")
-                    
-                    # Intento 4: Último recurso - buscar texto que parezca un precio en todo el elemento
-                    if not price_found:
-                        try:
-                            # Obtener todo el texto del elemento
-                            all_text = item.text
-                            
-                            # Buscar patrones de precio en el texto
-                            price_patterns = [
-                                r'\$\s?[\d,]+\.?\d*',  # $1,234.56 o $1,234
-                                r'\$\s?[\d.]+,?\d*',   # $1.234,56 o $1.234
-                                r'\$\s?\d+',           # $1234
-                            ]
-                            
-                            for pattern in price_patterns:
-                                matches = re.findall(pattern, all_text)
-                                if matches:
-                                    product_data["precio"] = matches[0].strip()
-                                    product_data["metodo_extraccion"]["precio"] = "regex_pattern"
-                                    price_found = True
-                                    log(f"Precio encontrado con regex: {matches[0]}")
-                                    break
-                        except Exception as e:
-                            log(f"Error al extraer precio con regex: {str(e)[:50]}...")
-                    
-                    # Si todavía no encontramos precio, guardar cualquier texto que tenga "$"
-                    if not price_found:
-                        try:
-                            dollar_elements = item.find_elements(By.XPATH, './/*[contains(text(), "$")]')
-                            if dollar_elements:
-                                for elem in dollar_elements:
-                                    text = elem.text.strip()
-                                    if '$' in text and len(text) < 20:  # Evitar textos largos
-                                        product_data["precio"] = text
-                                        product_data["metodo_extraccion"]["precio"] = "contains_dollar_sign"
-                                        price_found = True
-                                        log(f"Precio encontrado con símbolo $: {text}")
-                                        break
-                        except Exception as e:
-                            log(f"Error al buscar elementos con $: {str(e)[:50]}...")
-                    
-                    # Extracción de URL del producto
-                    try:
-                        link_elems = item.find_elements(By.XPATH, './/a[contains(@class, "ui-search-link")]')
-                        if link_elems:
-                            href = link_elems[0].get_attribute('href')
-                            if href:
-                                product_data["url"] = href
-                                product_data["metodo_extraccion"]["url"] = "class_link"
-                                log(f"URL encontrada: {href[:50]}...")
-                        else:
-                            # Probar con cualquier enlace dentro del elemento
-                            any_links = item.find_elements(By.TAG_NAME, 'a')
-                            if any_links:
-                                href = any_links[0].get_attribute('href')
-                                if href:
-                                    product_data["url"] = href
-                                    product_data["metodo_extraccion"]["url"] = "tag_a"
-                                    log(f"URL encontrada (tag genérico): {href[:50]}...")
-                    except Exception as e:
-                        log(f"Error al extraer URL: {e}")
-                    
-                    # Si no se encontró URL, intentar con JavaScript
-                    if product_data["url"] == "No disponible":
-                        try:
-                            url_js = driver.execute_script("return arguments[0].querySelector('a')?.href || null;", item)
-                            if url_js:
-                                product_data["url"] = url_js
-                                product_data["metodo_extraccion"]["url"] = "javascript"
-                                log(f"URL encontrada con JavaScript: {url_js[:50]}...")
-                        except:
-                            pass
-                    
-                    # Capturar HTML del elemento para diagnóstico y debugging
-                    try:
-                        product_data["html_debug"] = {
-                            "outer_html": driver.execute_script("return arguments[0].outerHTML.substring(0, 1000)", item),
-                            "class": item.get_attribute("class")
-                        }
-                    except:
-                        product_data["html_debug"] = {"error": "No se pudo capturar HTML"}
-                    
-                    # Registrar resultado de la extracción
-                    log(f"Producto {idx+1} procesado:")
-                    log(f"  - Título: {product_data['titulo'][:50]}...")
-                    log(f"  - Precio: {product_data['precio']}")
-                    log(f"  - URL: {product_data['url'][:30]}...")
-                    log(f"  - Métodos: {product_data['metodo_extraccion']}")
-                    
-                    # Añadir a nuestra lista
+                    # Añadir a nuestra lista y agregarlo al archivo en el momento
                     products_data.append(product_data)
+                    with span(timings, "guardado"):
+                        writer.write(product_data)
                     
-                    # CAMBIO: Guardar después de cada 3 productos para Chrome
                     if (idx + 1) % 3 == 0 or (idx == max_products - 1):
-                        with open(output_filename, 'w', encoding='utf-8') as f:
-                            json.dump(products_data, f, ensure_ascii=False, indent=4)
-                        log(f"Guardado parcial: {len(products_data)} productos guardados")
+                        logger.debug("Guardado parcial: %d productos guardados", len(products_data))
                     
                 except Exception as e:
-                    log(f"Error procesando producto {idx+1}: {e}")
+                    logger.warning("Error procesando producto %d: %s", idx + 1, e)
                     continue
-                    
-            # AÑADIDO: Procesamiento para múltiples páginas
-            if num_pages > 1:
-                log(f"Procesadas {num_pages} páginas. Puedes modificar el script para soportar paginación múltiple.")
-        else:
-            log("No se pudieron encontrar productos para procesar")
+    else:
+        logger.warning("No se pudieron encontrar productos para procesar")
+    
+    if seen is not None:
+        seen.add_products(products_data)
+    return products_data
+
+def fetch_page_source(driver, url, waits=None, timings=None):
+    """Navega a una página del listado y devuelve (status, page_source)"""
+    profile_new_page(driver)
+    with span(timings, "navegacion"), profile_site(driver, "navegacion"):
+        driver.get(url)
+        wait_for_listing(driver, waits)
+        return 200, driver.page_source
+
+def scrape_pages(fetch_page, page_urls, writer, max_products=15, seen=None, timings=None, diagnostics=None, dump_prefix=None,
+                 checkpoint=None):
+    """Extrae varias páginas del listado con el parser offline
+    - La descarga de la página N+1 se solapa con la extracción de la página N
+    - Los productos de cada página se agregan a writer al terminar la página
+    - seen: SeenIndex para descartar publicaciones repetidas entre páginas y ejecuciones
+    - timings: PhaseTimings para medir parseo y guardado
+    - diagnostics: DiagnosticsPolicy; las páginas con fallos se guardan como <dump_prefix>_pagina<N>.html
+    - checkpoint: TermCheckpoint para omitir las páginas ya guardadas y registrar cada página terminada
+    - Devuelve None si la primera página requiere renderizado en navegador
+    """
+    products_data = []
     
+    # Al reanudar se empieza después de la última página registrada, con las posiciones a continuación
+    resume_from = checkpoint.resume_from() if checkpoint is not None else 0
+    previous = checkpoint.emitted_count if checkpoint is not None else 0
+    if resume_from:
+        log(f"Reanudando en la página {resume_from + 1}: {resume_from} páginas y {previous} productos ya guardados")
+    try:
+        for index, url, (status, html) in prefetch_pages(fetch_page, page_urls[resume_from:]):
+            page = resume_from + index
+            if needs_js_rendering(status, html):
+                if page == 1:
+                    log("La página requiere renderizado JavaScript. Usando Chrome como respaldo")
+                    return None
+                log(f"Página {page} sin resultados utilizables ({status}). Fin de la paginación")
+                break
+            
+            start = time.perf_counter()
+            page_products = annotate_prices(parse_listing_html(html, max_products=max_products,
+                                                               start_position=previous + len(products_data) + 1))
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            if timings is not None:
+                timings.record("parseo_offline", elapsed_ms / 1000)
+            log(f"Página {page}/{len(page_urls)}: {len(page_products)} productos extraídos en {elapsed_ms:.1f} ms ({url})")
+            
+            # Las tarjetas se cuentan antes de decidir por la página (método esperado por vista)
+            if diagnostics is not None:
+                diagnostics.prune(page_products)
+            # Una página vacía después de la primera es el fin normal de la paginación
+            if diagnostics is not None and (page_products or page == 1) and diagnostics.wants_page(page_products):
+                diagnostics.save_page(dump_prefix, page, html, page_report(page_products, url, diagnostics))
+            
+            if not page_products:
+                log(f"Página {page} sin productos. Fin de la paginación")
+                break
+            
+            # Productos que ya se escribieron antes de una caída (página guardada pero no registrada)
+            if checkpoint is not None:
+                found = len(page_products)
+                page_products = checkpoint.filter_emitted(page_products)
+                if found > len(page_products):
+                    log(f"Página {page}: {found - len(page_products)} productos ya estaban en el .jsonl "
+                        f"(página escrita pero no registrada antes de la interrupción)")
+            
+            if seen is not None:
+                found = len(page_products)
+                page_products = seen.filter_products(page_products)
+                if found > len(page_products):
+                    log(f"Página {page}: {found - len(page_products)} publicaciones ya vistas descartadas")
+            if seen is not None or checkpoint is not None:
+                for offset, product_data in enumerate(page_products):
+                    product_data["posicion"] = previous + len(products_data) + offset + 1
+            
+            for product_data in page_products:
+                logger.debug("Producto %d: %.50s | %s | %s", product_data["posicion"], product_data["titulo"],
+                             product_data["precio"], product_data["metodo_extraccion"])
+            products_data.extend(page_products)
+            
+            # Orden de durabilidad: escribir, marcar como vistos y por último registrar la página.
+            # Si se marcaran antes, una caída entre ambos pasos los descartaría al reanudar sin haberlos escrito
+            with span(timings, "guardado"):
+                writer.write_many(page_products)
+                if seen is not None:
+                    seen.add_products(page_products)
+                if checkpoint is not None:
+                    checkpoint.page_done(page, url, page_products, writer)
+            logger.debug("Guardado parcial: %d productos guardados", len(products_data))
     except Exception as e:
-        log(f"Error general: {e}")
+        if not products_data:
+            logger.error("Error al descargar la primera página: %s", e)
+            return None
+        if checkpoint is not None:
+            # Con diario de avance el término no se da por terminado: el reintento sigue en la página siguiente
+            raise
+        logger.warning("Error durante la paginación, se conservan %d productos: %s", len(products_data), e)
+    
+    return products_data
+
+def scrape_mercadolibre_chrome(search_term, num_pages=1, engine="batch", fetch_mode="browser", base_url=LISTING_BASE_URL, max_products=15,
+                               lean=False, measure_weight=False, headless=False, fsync="close", screenshots=None,
+                               adaptive=True, cache=False, cache_ttl=900, details=False, detail_workers=8, dedup=False,
+                               store=False, parquet=False, metrics=False, profile=False, diagnostics=None):
+    """Scraping del listado con Chrome
+    - engine: "batch" (una llamada por página), "offline" (parsea page_source) o "legacy" (por tarjeta)
+    - fetch_mode: "browser" o "http" (descarga sin navegador, con Chrome como respaldo)
+    - base_url: raíz del listado; permite apuntar a un servidor local de pruebas
+    - num_pages: páginas a recorrer; con más de una se extrae con el parser offline
+    - max_products: máximo de productos por página (None = todos)
+    - lean: True o un LeanProfile para bloquear imágenes, media, fuentes y terceros
+    - measure_weight: mide el peso de cada página (sin lean actualiza la línea base)
+    - headless: ejecuta Chrome sin ventana
+    - fsync: política de fsync del archivo .jsonl ("always", "batch", "close" o "never")
+    - screenshots: True o un ScreenshotCapture para guardar capturas (desactivado por defecto)
+    - adaptive: en la extracción por tarjeta, ordena los métodos según lo aprendido en ejecuciones anteriores
+    - cache: reutiliza listados guardados en disco durante cache_ttl segundos (revalida en modo HTTP)
+    - details: descarga en paralelo la página de cada producto (stock, vendedor, precio)
+    - dedup: omite publicaciones (por ID MLM...) ya extraídas en esta u otras ejecuciones
+    - store: guarda los productos y su precio en output-chrome/productos.sqlite (historial de precios)
+    - parquet: exporta también a output-chrome/parquet/ particionado por fecha y término (requiere pyarrow)
+    - metrics: guarda los tiempos por fase en JSON y en output-chrome/metricas_chrome.prom (Prometheus)
+    - profile: cuenta y mide cada comando de WebDriver por sitio de llamada, tarjeta y página
+    - diagnostics: html_debug y HTML de la página solo para tarjetas y páginas con fallos; un número
+      entre 0 y 1 captura además esa fracción de las sanas (o un DiagnosticsPolicy)
+    """
+    # Obtener la ruta absoluta del directorio donde está el script o ejecutable
+    base_path = os.path.dirname(os.path.abspath(__file__))
+    
+    # Crear carpeta de output para Chrome si no existe
+    output_dir = os.path.join(base_path, "output-chrome")
+    if not os.path.exists(output_dir):
+        os.makedirs(output_dir)
+        log(f"Carpeta creada: {output_dir}")
+    
+    # Nombre del archivo de salida en la carpeta correspondiente
+    current_time = datetime.now().strftime("%Y%m%d_%H%M%S")
+    output_filename = os.path.join(output_dir, f"productos_chrome_{search_term.replace(' ', '_')}_{current_time}.json")
+    
+    # Tiempos por fase de esta ejecución
+    run_timings = PhaseTimings()
+    timings = run_timings.for_term(search_term)
+    
+    # Diagnóstico solo ante fallos (y la fracción de muestreo de las tarjetas sanas)
+    if not isinstance(diagnostics, DiagnosticsPolicy):
+        diagnostics = DiagnosticsPolicy(diagnostics or 0.0)
+    dump_prefix = os.path.join(output_dir, f"diagnostico_chrome_{search_term.replace(' ', '_')}_{current_time}")
     
-    finally:
+    # Los productos se agregan a un .jsonl a medida que se extraen; el .json se genera al final
+    stream_writer = ProductStreamWriter(stream_path_for(output_filename), fsync=fsync)
+    writer = stream_writer
+    parquet_writer = ParquetStreamWriter(os.path.join(output_dir, PARQUET_DIRNAME), search_term) if parquet else None
+    if parquet_writer:
+        writer = TeeWriter(writer, parquet_writer)
+    
+    # Lista para almacenar los productos
+    products_data = []
+    
+    # Convertir búsqueda en URLs de cada página
+    page_urls = build_page_urls(search_term, num_pages, base_url)
+    search_url = page_urls[0]
+    
+    page_cache = PageCache(os.path.join(output_dir, PAGE_CACHE_FILENAME), ttl=cache_ttl) if cache else None
+    seen = SeenIndex(os.path.join(output_dir, SEEN_INDEX_FILENAME)) if dedup else None
+    
+    # Con todas las páginas vigentes en la caché no hace falta abrir el navegador; si falta
+    # alguna se usa Chrome como siempre y solo las páginas guardadas salen de la caché
+    if page_cache is not None and fetch_mode == "browser" and all(page_cache.get(url) is not None for url in page_urls):
+        log("Listado vigente en la caché local. Se extrae sin abrir el navegador")
+        # Una entrada que vence entre la comprobación y la lectura se trata como página no utilizable
+        products_data = scrape_pages(page_cache.wrap(lambda url: (0, "")), page_urls, writer, max_products, seen,
+                                     timings, diagnostics, dump_prefix) or []
+    
+    # Intentar primero sin navegador si se pidió el modo HTTP
+    if fetch_mode == "http":
+        log(f"Descargando por HTTP: {search_url} ({len(page_urls)} páginas)")
+        with HttpFetcher() as fetcher:
+            fetch = page_cache.wrap_http(fetcher) if page_cache else fetcher.fetch
+            http_products = scrape_pages(timed(timings, "descarga_http", fetch), page_urls, writer, max_products, seen, timings,
+                                         diagnostics, dump_prefix)
+        if http_products:
+            products_data = http_products
+    
+    # Sin productos nuevos porque todos ya se habían visto no hace falta el navegador
+    if not products_data and not (seen and seen.skipped):
+        log(f"Iniciando Chrome WebDriver para buscar '{search_term}'")
+        driver = None
+        profiler = DriverProfiler() if profile else None
+        waits = WaitRecorder()
+        lean_profile = LeanProfile() if lean is True else (lean or None)
+        weights = PageWeightMonitor(output_dir, lean=lean_profile is not None) if (lean_profile or measure_weight) else None
+        capture = ScreenshotCapture() if screenshots is True else (screenshots or None)
+        strategies = StrategyCache(os.path.join(output_dir, STRATEGIES_FILENAME)) if adaptive else None
+        if strategies is not None and diagnostics.strategies is None:
+            # El método que más acierta por vista es el esperado para el diagnóstico
+            diagnostics.strategies = strategies
+        if capture:
+            capture.start(output_dir, diagnostics)
         try:
-            driver.quit()
-            log("Navegador cerrado correctamente")
-        except:
-            log("Error al cerrar el navegador")
+            driver = create_chrome_driver(headless=headless, lean=lean_profile, measure_weight=weights is not None,
+                                          timings=timings)
+            if profiler:
+                profiler.attach(driver)
+            if lean_profile is not None:
+                log("Modo lean activo: se bloquean imágenes, media, fuentes y dominios de terceros")
+            
+            log(f"Navegando a: {search_url}")
+            open_listing_page(driver, search_url, waits, capture, timings)
+            if weights:
+                weights.measure(driver, search_url, log)
+            
+            if len(page_urls) == 1:
+                if page_cache:
+                    page_cache.store(search_url, 200, driver.page_source)
+                
+                # Extraer productos del contenedor principal
+                with span(timings, "deteccion_contenedor"), profile_site(driver, "deteccion_contenedor"):
+                    product_items, layout = find_product_items(driver)
+                products_data = extract_listing_products(driver, product_items, engine, writer, max_products, waits, capture,
+                                                         strategies, layout, seen, timings, diagnostics)
+                capture_page_diagnostics(driver, diagnostics, dump_prefix, products_data, search_url, timings, layout)
+            else:
+                # Varias páginas: Chrome navega en segundo plano y se parsea page_source
+                def fetch_with_browser(url):
+                    if url == search_url:
+                        return 200, driver.page_source
+                    result = fetch_page_source(driver, url, waits, timings)
+                    if weights:
+                        weights.measure(driver, url, log)
+                    return result
+                
+                fetch = page_cache.wrap(fetch_with_browser) if page_cache else fetch_with_browser
+                products_data = scrape_pages(fetch, page_urls, writer, max_products, seen, timings,
+                                             diagnostics, dump_prefix) or []
+        
+        except Exception as e:
+            logger.error("Error general: %s", e)
+        
+        finally:
+            try:
+                with span(timings, "cierre_navegador"):
+                    driver.quit()
+                log("Navegador cerrado correctamente")
+            except:
+                logger.warning("Error al cerrar el navegador")
+        
+        waits.log_summary(log)
+        if profiler:
+            profiler.log_summary(log)
+            profile_filename = os.path.join(output_dir, f"perfil_webdriver_{search_term.replace(' ', '_')}_{current_time}.json")
+            profiler.save(profile_filename)
+            log(f"Perfil de WebDriver guardado en: {profile_filename}")
+        if weights:
+            weights.log_summary(log)
+        if capture:
+            capture.close(log)
+        if strategies and strategies.calls:
+            strategies.save()
+            strategies.log_summary(log)
+    
+    if page_cache:
+        page_cache.log_summary(log)
+        page_cache.close()
+    if seen:
+        log(f"Publicaciones repetidas omitidas: {seen.skipped}")
+        seen.close()
+    diagnostics.log_summary(log)
+    
+    # Generar el JSON con indentación a partir del .jsonl, o con el detalle agregado
+    with span(timings, "guardado"):
+        writer.close()
+    # Si el nombre ya existía, el .jsonl (y el .json) llevan sufijo
+    stream_filename = stream_writer.path
+    output_filename = json_path_for(stream_filename)
+    if parquet_writer and parquet_writer.count:
+        log(f"Parquet: {parquet_writer.count} productos en {parquet_writer.row_groups} grupos de filas -> {parquet_writer.path}")
+    if details and products_data:
+        with span(timings, "detalle"):
+            details_by_id = crawl_details(products_data, max_workers=detail_workers, log=log)
+        log(f"Detalle agregado a {merge_details(products_data, details_by_id)}/{len(products_data)} productos")
+        with span(timings, "guardado"), open(output_filename, 'w', encoding='utf-8') as f:
+            json.dump(products_data, f, ensure_ascii=False, indent=4)
+    elif writer.count:
+        with span(timings, "guardado"):
+            convert_to_json(stream_filename, output_filename)
+    
+    # Historial de precios en SQLite
+    if store and products_data:
+        product_store = ProductStore(os.path.join(output_dir, STORE_FILENAME))
+        try:
+            with span(timings, "historial"):
+                saved = product_store.save_products(search_term, products_data)
+            log(f"Historial de precios: {saved} productos guardados en {product_store.path}")
+        finally:
+            product_store.close()
     
     # Verificar productos y archivos finales
     if products_data:
@@ -516,6 +885,10 @@ def scrape_mercadolibre_chrome(search_term, num_pages=1):
                 
                 log(f"Títulos extraídos correctamente: {titles_ok}/{len(saved_data)} ({(titles_ok/len(saved_data))*100:.1f}%)")
                 log(f"Precios extraídos correctamente: {prices_ok}/{len(saved_data)} ({(prices_ok/len(saved_data))*100:.1f}%)")
+                normalized = [p["precio_normalizado"] for p in saved_data if "precio_normalizado" in p]
+                cents_ok = sum(1 for n in normalized if n["amount_cents"] is not None)
+                ambiguous = sum(1 for n in normalized if n["ambiguous"])
+                log(f"Precios normalizados a centavos: {cents_ok}/{len(saved_data)} ({ambiguous} ambiguos)")
                 log(f"URLs extraídos correctamente: {urls_ok}/{len(saved_data)} ({(urls_ok/len(saved_data))*100:.1f}%)")
                 
                 # Mostrar métodos de extracción usados
@@ -539,19 +912,257 @@ def scrape_mercadolibre_chrome(search_term, num_pages=1):
                 log("URL: " + ", ".join([f"{m}({c})" for m, c in url_methods.items()]))
                 
             except Exception as e:
-                log(f"Error al verificar el archivo guardado: {e}")
+                logger.error("Error al verificar el archivo guardado: %s", e)
         else:
-            log(f"¡ADVERTENCIA! Archivo no encontrado: {output_filename}")
+            logger.warning("Archivo no encontrado: %s", output_filename)
     else:
-        log("No se obtuvieron productos. Verifica el selector o si la página ha cambiado su estructura.")
+        logger.warning("No se obtuvieron productos. Verifica el selector o si la página ha cambiado su estructura.")
+    
+    run_timings.log_summary(log)
+    if metrics:
+        metrics_filename = os.path.join(output_dir, f"metricas_chrome_{search_term.replace(' ', '_')}_{current_time}.json")
+        run_timings.save(metrics_filename, os.path.join(output_dir, PROMETHEUS_FILENAME))
+        log(f"Métricas guardadas en: {metrics_filename}")
     
     return products_data
 
+def scrape_term_with_driver(driver, search_term, output_dir, num_pages=1, max_products=15, base_url=LISTING_BASE_URL,
+                            page_cache=None, seen=None, store=None, parquet_dir=None, timings=None, diagnostics=None,
+                            checkpoint=None, limiter=None, details=False, detail_workers=8):
+    """Procesa un término con un navegador ya iniciado. Devuelve (productos, páginas procesadas)
+    - checkpoint: CheckpointJournal del lote; un término interrumpido sigue en su mismo archivo
+    - limiter: HostRateLimiter compartido por los workers (listado y páginas de artículo)
+    - details: agrega el detalle de cada producto (stock, vendedor, precio)
+    """
+    current_time = datetime.now().strftime("%Y%m%d_%H%M%S")
+    output_filename = checkpoint.output_for(search_term) if checkpoint else None
+    output_filename = output_filename or os.path.join(output_dir, f"productos_chrome_{search_term.replace(' ', '_')}_{current_time}.json")
+    page_urls = build_page_urls(search_term, num_pages, base_url)
+    term_checkpoint = checkpoint.for_term(search_term, output_filename) if checkpoint else None
+    resumed = term_checkpoint is not None and term_checkpoint.resumed
+    
+    pages_fetched = []
+    def fetch_with_browser(url):
+        if limiter is not None:
+            limiter.acquire(url)
+        pages_fetched.append(url)
+        return fetch_page_source(driver, url, timings=timings)
+    
+    fetch = page_cache.wrap(fetch_with_browser) if page_cache else fetch_with_browser
+    # Solo un término reanudado sigue agregando a su .jsonl; uno nuevo nunca pisa un archivo existente
+    stream_writer = ProductStreamWriter(stream_path_for(output_filename), resume=resumed)
+    writer = stream_writer
+    # Un término reanudado se exporta completo a Parquet al final (el archivo anterior no llegó a publicarse)
+    if parquet_dir and not resumed:
+        writer = TeeWriter(writer, ParquetStreamWriter(parquet_dir, search_term))
+    dump_prefix = os.path.join(output_dir, f"diagnostico_chrome_{search_term.replace(' ', '_')}_{current_time}")
+    with writer:
+        products = scrape_pages(fetch, page_urls, writer, max_products, seen, timings, diagnostics, dump_prefix,
+                                term_checkpoint)
+    stream_filename = stream_writer.path
+    output_filename = json_path_for(stream_filename)
+    resumed = resumed and os.path.exists(stream_filename)
+    if writer.count or resumed:
+        with span(timings, "guardado"):
+            convert_to_json(stream_filename, output_filename)
+    if products is None:
+        raise RuntimeError(f"No se pudo obtener el listado de '{search_term}'")
+    if resumed:
+        # Los productos de la ejecución interrumpida siguen en el mismo .jsonl
+        products = read_products(stream_filename)
+        if parquet_dir and products:
+            with ParquetStreamWriter(parquet_dir, search_term) as parquet_writer:
+                parquet_writer.write_many(products)
+    if details and products:
+        with span(timings, "detalle"):
+            details_by_id = crawl_details(products, max_workers=detail_workers, log=log, limiter=limiter)
+        merge_details(products, details_by_id)
+        with span(timings, "guardado"), open(output_filename, 'w', encoding='utf-8') as f:
+            json.dump(products, f, ensure_ascii=False, indent=4)
+    if store is not None and products:
+        with span(timings, "historial"):
+            store.save_products(search_term, products)
+    if term_checkpoint is not None:
+        term_checkpoint.done(len(products))
+    return products, len(pages_fetched)
+
+def scrape_mercadolibre_chrome_batch(search_terms, workers=4, num_pages=1, max_products=15,
+                                     max_pages_per_worker=50, headless=True, base_url=LISTING_BASE_URL, lean=False,
+                                     cache=False, cache_ttl=900, dedup=False, store=False,
+                                     parquet=False, metrics=False, diagnostics=0.0, checkpoint=None, scheduler=None,
+                                     limiter=None, details=False, detail_workers=8, summary=False):
+    """Procesa una lista de términos con un pool de navegadores Chrome reutilizados
+    - diagnostics: fracción de páginas sanas que se guardan para diagnóstico (las páginas con fallos siempre)
+    - checkpoint: True (output-chrome/checkpoint_lote_chrome.jsonl) o ruta del diario de avance;
+      si el lote se interrumpe, la siguiente ejecución retoma desde la última página guardada
+    - scheduler: TermScheduler con prioridad y plazo por término; por defecto en el orden de la lista
+    - limiter: HostRateLimiter compartido para listado.mercadolibre.com.mx y articulo.mercadolibre.com.mx
+    - details: agrega el detalle de cada producto con detail_workers descargas en paralelo
+    - summary: True (output-chrome/resumen_lote_<fecha>.json) o ruta del resumen de la ejecución
+    """
+    base_path = os.path.dirname(os.path.abspath(__file__))
+    output_dir = os.path.join(base_path, "output-chrome")
+    if not os.path.exists(output_dir):
+        os.makedirs(output_dir)
+        log(f"Carpeta creada: {output_dir}")
+    
+    # Con diario de avance se omiten los términos que ya terminaron en una ejecución anterior
+    journal = None
+    finished = {}
+    if checkpoint:
+        journal_path = os.path.join(output_dir, CHECKPOINT_FILENAME) if checkpoint is True else checkpoint
+        journal = CheckpointJournal(journal_path, {"paginas": num_pages, "max_productos": max_products, "base_url": base_url})
+        finished = journal.completed_results(search_terms)
+        if finished:
+            log(f"Reanudando lote: {len(finished)} términos ya terminados se omiten ({journal_path})")
+        search_terms = journal.pending(search_terms)
+    
+    log(f"Iniciando pool de {workers} navegadores para {len(search_terms)} términos")
+    lean_profile = LeanProfile() if lean is True else (lean or None)
+    run_timings = PhaseTimings()
+    pool = BrowserPool(lambda: create_chrome_driver(headless=headless, lean=lean_profile, timings=run_timings), size=workers,
+                       max_pages_per_driver=max_pages_per_worker)
+    page_cache = PageCache(os.path.join(output_dir, PAGE_CACHE_FILENAME), ttl=cache_ttl) if cache else None
+    seen = SeenIndex(os.path.join(output_dir, SEEN_INDEX_FILENAME)) if dedup else None
+    product_store = ProductStore(os.path.join(output_dir, STORE_FILENAME)) if store else None
+    parquet_dir = os.path.join(output_dir, PARQUET_DIRNAME) if parquet else None
+    if not isinstance(diagnostics, DiagnosticsPolicy):
+        diagnostics = DiagnosticsPolicy(diagnostics or 0.0)
+    results = pool.run(search_terms, lambda driver, term: scrape_term_with_driver(
+        driver, term, output_dir, num_pages, max_products, base_url, page_cache, seen, product_store, parquet_dir,
+        run_timings.for_term(term), diagnostics, journal, limiter, details, detail_workers), scheduler)
+    pool.report()
+    results.update(finished)
+    
+    # Resumen de la ejecución: rendimiento del pool, términos vencidos y esperas por host
+    run_summary = pool.summary()
+    run_summary["inicio"] = run_timings.started_at.isoformat(timespec="seconds")
+    run_summary["omitidos_reanudacion"] = len(finished)
+    if scheduler is not None:
+        run_summary["vencidos"] = list(scheduler.expired)
+        if scheduler.expired:
+            logger.warning("Términos vencidos sin procesar: %d", len(scheduler.expired))
+    if limiter is not None:
+        run_summary["limites_por_host"] = limiter.summary()
+        for host, stats in run_summary["limites_por_host"].items():
+            log(f"Límite {host}: {stats['peticiones']} peticiones a {stats['limite']}/s, "
+                f"{stats['espera_s']:.1f} s de espera")
+    log(f"Rendimiento: {run_summary['paginas_por_min']:.1f} páginas/min, {run_summary['productos_por_min']:.1f} productos/min")
+    if summary:
+        summary_filename = summary if summary is not True else os.path.join(
+            output_dir, f"resumen_lote_{run_timings.started_at.strftime('%Y%m%d_%H%M%S')}.json")
+        with open(summary_filename, 'w', encoding='utf-8') as f:
+            json.dump(run_summary, f, ensure_ascii=False, indent=4)
+        log(f"Resumen del lote guardado en: {summary_filename}")
+    if page_cache:
+        page_cache.log_summary(log)
+        page_cache.close()
+    if seen:
+        log(f"Publicaciones repetidas omitidas: {seen.skipped}")
+        seen.close()
+    if product_store:
+        log(f"Historial de precios guardado en: {product_store.path}")
+        product_store.close()
+    diagnostics.log_summary(log)
+    if journal:
+        pending = len(pool.errors) + len(run_summary.get("vencidos", []))
+        if pending:
+            log(f"Diario de avance conservado en {journal.path}: {pending} términos pendientes")
+            journal.close()
+        else:
+            journal.finish()
+    
+    run_timings.log_summary(log)
+    if metrics:
+        metrics_filename = os.path.join(output_dir, f"metricas_chrome_lote_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+        run_timings.save(metrics_filename, os.path.join(output_dir, PROMETHEUS_FILENAME))
+        log(f"Métricas guardadas en: {metrics_filename}")
+    
+    return results
+
+def run_batch_cli(argv=None):
+    """Lote sin intervención: términos desde la línea de comandos, un archivo o la entrada estándar
+    - Devuelve el código de salida: 1 si algún término falló o venció sin procesarse
+    """
+    import argparse
+    
+    def _positive(kind):
+        """Tipo de argparse que solo acepta números mayores que 0"""
+        def parse(value):
+            try:
+                number = kind(value)
+            except ValueError:
+                raise argparse.ArgumentTypeError(f"número no válido: {value!r}")
+            if number <= 0:
+                raise argparse.ArgumentTypeError(f"debe ser mayor que 0: {value}")
+            return number
+        return parse
+    
+    parser = argparse.ArgumentParser(description="Lote de búsquedas en Mercado Libre con Chrome, sin intervención")
+    parser.add_argument("terminos", nargs="*", help="Términos a buscar (además de los de --archivo)")
+    parser.add_argument("--archivo", help="Un término por línea ('-' = entrada estándar): término[TAB prioridad[TAB plazo]]")
+    parser.add_argument("--workers", type=_positive(int), default=4, help="Navegadores en paralelo")
+    parser.add_argument("--paginas", type=int, default=1)
+    parser.add_argument("--max-productos", type=int, default=15)
+    parser.add_argument("--prioridad", type=int, default=DEFAULT_PRIORITY, help="Prioridad por defecto (menor = antes)")
+    parser.add_argument("--plazo", help="Plazo por defecto: fecha ISO o minutos desde el inicio")
+    parser.add_argument("--listado-por-segundo", type=_positive(float), default=1.0, help=f"Peticiones por segundo a {LISTING_HOST}")
+    parser.add_argument("--articulo-por-segundo", type=_positive(float), default=2.0, help=f"Peticiones por segundo a {ITEM_HOST}")
+    parser.add_argument("--rafaga", type=_positive(int), default=2, help="Peticiones seguidas permitidas por host")
+    parser.add_argument("--detalle", action="store_true", help="Agrega el detalle de cada producto")
+    parser.add_argument("--cache", action="store_true")
+    parser.add_argument("--dedup", action="store_true")
+    parser.add_argument("--historial", action="store_true", help="Guarda los precios en productos.sqlite")
+    parser.add_argument("--parquet", action="store_true")
+    parser.add_argument("--metricas", action="store_true")
+    parser.add_argument("--lean", action="store_true")
+    parser.add_argument("--reanudar", action="store_true", help="Diario de avance para retomar un lote interrumpido")
+    parser.add_argument("--ventana", action="store_true", help="Chrome con ventana (por defecto headless)")
+    parser.add_argument("--base-url", default=LISTING_BASE_URL)
+    parser.add_argument("--resumen", help="Ruta del resumen JSON (por defecto output-chrome/resumen_lote_<fecha>.json)")
+    args = parser.parse_args(argv)
+    
+    start = time.time()
+    lines = list(args.terminos)
+    if args.archivo == "-":
+        lines += sys.stdin.read().splitlines()
+    elif args.archivo:
+        with open(args.archivo, 'r', encoding='utf-8') as f:
+            lines += f.read().splitlines()
+    try:
+        terms = read_terms(lines, args.prioridad, parse_deadline(args.plazo, start), start)
+    except ValueError as e:
+        parser.error(str(e))
+    if not terms:
+        parser.error("No se indicaron términos")
+    
+    scheduler = TermScheduler()
+    search_terms = scheduler.add_many(terms)
+    listing_host = urlsplit(args.base_url).netloc.lower() or LISTING_HOST
+    limiter = HostRateLimiter(rate=args.listado_por_segundo, burst=args.rafaga,
+                              rates={listing_host: args.listado_por_segundo, ITEM_HOST: args.articulo_por_segundo})
+    
+    results = scrape_mercadolibre_chrome_batch(
+        search_terms, workers=args.workers, num_pages=args.paginas, max_products=args.max_productos,
+        headless=not args.ventana, base_url=args.base_url, lean=args.lean, cache=args.cache, dedup=args.dedup,
+        store=args.historial, parquet=args.parquet, metrics=args.metricas, checkpoint=args.reanudar or None,
+        scheduler=scheduler, limiter=limiter, details=args.detalle, summary=args.resumen or True)
+    
+    missing = [term for term in search_terms if term not in results]
+    log(f"Términos completados: {len(search_terms) - len(missing)}/{len(search_terms)}")
+    return 1 if missing else 0
+
 # Ejecutar el script
+#   python Scraping-Selenium-chrome.py                                  # interactivo, un término
+#   python Scraping-Selenium-chrome.py --archivo terminos.txt --workers 4 --reanudar
+#   cat terminos.txt | python Scraping-Selenium-chrome.py --archivo - --listado-por-segundo 0.5
 if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        sys.exit(run_batch_cli())
+    
     print("\n=== WEB SCRAPING DE MERCADO LIBRE (CHROME) - OPTIMIZADO PARA FORMATO MX ===")
     print("NOTA: Asegúrate de tener instalado Chrome y las bibliotecas necesarias:")
-    print("pip install selenium webdriver-manager")
+    print("pip install selenium webdriver-manager lxml requests")
     
     # Obtener búsqueda
     search_term = input("Producto a buscar: ")
@@ -561,15 +1172,20 @@ if __name__ == "__main__":
     
     # Número de páginas
     try:
-        num_pages = int(input("Número de páginas a procesar (1-5): "))
-        if num_pages < 1 or num_pages > 5:
+        num_pages = int(input(f"Número de páginas a procesar (1-{MAX_PAGES}): "))
+        if num_pages < 1 or num_pages > MAX_PAGES:
             num_pages = 1
             print(f"Número inválido, usando {num_pages} página por defecto")
     except:
         num_pages = 1
         print(f"Entrada inválida, usando {num_pages} página por defecto")
     
+    # Modo de descarga
+    fetch_mode = "http" if input("¿Descargar sin navegador cuando sea posible? (s/N): ").strip().lower() == "s" else "browser"
+    headless = input("¿Ejecutar Chrome sin ventana (headless)? (s/N): ").strip().lower() == "s"
+    screenshots = input("¿Guardar screenshots para diagnóstico? (s/N): ").strip().lower() == "s"
+    
     # Ejecutar script
-    results = scrape_mercadolibre_chrome(search_term, num_pages)
+    results = scrape_mercadolibre_chrome(search_term, num_pages, fetch_mode=fetch_mode, headless=headless, screenshots=screenshots)
     
     print("\nScript finalizado. Revisa los logs para detalles.")
\ No newline at end of file
@@ -0,0 +1,237 @@
+# -*- coding: utf-8 -*-
+"""
+Extracción por lotes de tarjetas de producto en un solo viaje a WebDriver
+- Envía un único script al navegador con todas las tarjetas como argumento
+- Evalúa dentro de la página la misma cascada de métodos que el bucle por tarjeta
+- Devuelve un arreglo JSON con el método ganador (metodo_extraccion) por campo
+"""
+import json
+
+# Script ejecutado dentro del navegador. Reproduce, en el mismo orden, los
+# intentos de título (4), precio (5) y URL (3) del bucle por tarjeta.
+BATCH_EXTRACTION_SCRIPT = r"""
+var cards = arguments[0];
+
+function text(elem) {
+    return elem ? (elem.innerText || '').trim() : '';
+}
+
+function firstOwnText(elem) {
+    for (var i = 0; i < elem.childNodes.length; i++) {
+        if (elem.childNodes[i].nodeType === 3) return elem.childNodes[i].nodeValue;
+    }
+    return '';
+}
+
+function extractTitle(card) {
+    // Intento 1: Título con clase específica
+    var text1 = text(card.querySelector('h2[class*="ui-search-item__title"]'));
+    if (text1) return [text1, 'xpath_title_class'];
+
+    // Intento 2: Cualquier h2 dentro del elemento
+    var text2 = text(card.querySelector('h2'));
+    if (text2) return [text2, 'tag_h2'];
+
+    // Intento 3: Elemento con atributo title
+    var withTitle = card.querySelector('[title]');
+    if (withTitle) {
+        var text3 = (withTitle.getAttribute('title') || '').trim();
+        if (text3) return [text3, 'attr_title'];
+    }
+
+    // Intento 4: Equivalente a javascript_title
+    var possibleTitles = [
+        card.querySelector('h2'),
+        card.querySelector('.ui-search-item__title'),
+        card.querySelector('[title]'),
+        card.querySelector('a')
+    ];
+    for (var i = 0; i < possibleTitles.length; i++) {
+        var elem = possibleTitles[i];
+        if (elem) {
+            if (elem.title) return [elem.title.trim(), 'javascript_title'];
+            if (elem.textContent) return [elem.textContent.trim(), 'javascript_title'];
+        }
+    }
+    return null;
+}
+
+function extractPrice(card) {
+    // Intento 1: Componentes separados dentro del contenedor de precio
+    var container = card.querySelector('div[class*="ui-search-price"]');
+    if (container) {
+        var symbol = container.querySelector('span[class*="andes-money-amount__currency-symbol"]');
+        var fraction = container.querySelector('span[class*="andes-money-amount__fraction"]');
+        if (symbol && fraction) {
+            var cents = container.querySelector('span[class*="andes-money-amount__cents"]');
+            var full = text(symbol) + ' ' + text(fraction);
+            if (cents) full += '.' + text(cents);
+            return [full, 'componentes_separados'];
+        }
+    }
+
+    // Intento 2: Precio como texto directo
+    var priceElem = card.querySelector('span[class*="price-tag-amount"]');
+    if (priceElem) {
+        var raw = text(priceElem);
+        if (raw.indexOf('$') !== -1) return [raw, 'texto_directo'];
+        var symbolElem = card.querySelector('span[class*="currency-symbol"]');
+        if (symbolElem) return [text(symbolElem) + ' ' + raw, 'texto_simbolo_separado'];
+    }
+
+    // Intento 3: Equivalente a javascript_precio_mx
+    var jsSymbol = card.querySelector('.andes-money-amount__currency-symbol');
+    var jsFraction = card.querySelector('.andes-money-amount__fraction');
+    var jsCents = card.querySelector('.andes-money-amount__cents');
+    if (jsSymbol && jsFraction) {
+        var jsPrice = jsSymbol.textContent.trim() + ' ' + jsFraction.textContent.trim();
+        if (jsCents) jsPrice += '.' + jsCents.textContent.trim();
+        return [jsPrice.trim(), 'javascript_precio_mx'];
+    }
+    var allText = card.innerText || '';
+    var jsMatches = allText.match(/\$\s?[0-9,]+(\.\d{2})?/g);
+    if (jsMatches && jsMatches.length > 0) return [jsMatches[0].trim(), 'javascript_precio_mx'];
+    var all = card.querySelectorAll('*');
+    for (var i = 0; i < all.length; i++) {
+        var t = all[i].textContent.trim();
+        if (t.indexOf('$') !== -1 && /\d/.test(t)) return [t, 'javascript_precio_mx'];
+    }
+
+    // Intento 4: Patrones regex sobre el texto del elemento
+    var patterns = [/\$\s?[\d,]+\.?\d*/, /\$\s?[\d.]+,?\d*/, /\$\s?\d+/];
+    for (var p = 0; p < patterns.length; p++) {
+        var match = allText.match(patterns[p]);
+        if (match) return [match[0].trim(), 'regex_pattern'];
+    }
+
+    // Último recurso: cualquier elemento con "$" en su primer nodo de texto
+    for (var j = 0; j < all.length; j++) {
+        if (firstOwnText(all[j]).indexOf('$') !== -1) {
+            var dollarText = text(all[j]);
+            if (dollarText.indexOf('$') !== -1 && dollarText.length < 20) {
+                return [dollarText, 'contains_dollar_sign'];
+            }
+        }
+    }
+    return null;
+}
+
+function extractUrl(card) {
+    var classLinks = card.querySelectorAll('a[class*="ui-search-link"]');
+    if (classLinks.length > 0) {
+        if (classLinks[0].href) return [classLinks[0].href, 'class_link'];
+    } else {
+        var anyLink = card.querySelector('a');
+        if (anyLink && anyLink.href) return [anyLink.href, 'tag_a'];
+    }
+    var jsLink = card.querySelector('a');
+    if (jsLink && jsLink.href) return [jsLink.href, 'javascript'];
+    return null;
+}
+
+var results = [];
+for (var c = 0; c < cards.length; c++) {
+    var card = cards[c];
+    var record = {titulo: null, precio: null, url: null};
+    try {
+        record.titulo = extractTitle(card);
+        record.precio = extractPrice(card);
+        record.url = extractUrl(card);
+        record.html_debug = {
+            outer_html: card.outerHTML.substring(0, 1000),
+            'class': card.getAttribute('class')
+        };
+    } catch (e) {
+        record.error = String(e);
+    }
+    results.push(record);
+}
+return JSON.stringify(results);
+"""
+
+# Detección de tarjetas dentro de la página, con los mismos selectores que
+# find_product_items. Se usa cuando no hay WebElements (por ejemplo, vía CDP).
+CARD_DISCOVERY_SCRIPT = r"""
+function findProductCards(maxProducts) {
+    var selectors = [
+        'section[class="ui-search-results"]',
+        'div[class="ui-search-results"]',
+        'ol[class="ui-search-layout"]'
+    ];
+    var container = null;
+    for (var i = 0; i < selectors.length && !container; i++) {
+        container = document.querySelector(selectors[i]);
+    }
+    container = container || document.body;
+
+    var cards = container.querySelectorAll('li[class*="ui-search-layout__item"]');
+    if (!cards.length) cards = container.querySelectorAll('div[class*="ui-search-result"]');
+    if (!cards.length) cards = container.querySelectorAll('[class*="ui-search-result"], [class*="ui-search-layout__item"]');
+
+    cards = Array.prototype.slice.call(cards);
+    return maxProducts ? cards.slice(0, maxProducts) : cards;
+}
+"""
+
+def build_page_extraction_expression(max_products=None):
+    """Expresión JavaScript autónoma que detecta las tarjetas y devuelve el arreglo JSON"""
+    return (
+        "(function() {\n" + CARD_DISCOVERY_SCRIPT + "\n"
+        "return (function() {\n" + BATCH_EXTRACTION_SCRIPT + "\n})"
+        f".call(null, findProductCards({int(max_products or 0)}));\n"
+        "})()"
+    )
+
+def build_products(raw_results, start_position=1):
+    """Convierte el arreglo devuelto por el navegador en registros de producto"""
+    products = []
+    for offset, raw in enumerate(raw_results):
+        # Misma estructura que el producto base del bucle por tarjeta
+        product_data = {
+            "titulo": "No disponible",
+            "precio": "No disponible",
+            "url": "No disponible",
+            "posicion": start_position + offset,
+            "metodo_extraccion": {
+                "titulo": "ninguno",
+                "precio": "ninguno",
+                "url": "ninguno"
+            }
+        }
+
+        for field in ("titulo", "precio", "url"):
+            if raw.get(field):
+                value, method = raw[field]
+                product_data[field] = value
+                product_data["metodo_extraccion"][field] = method
+
+        if "html_debug" in raw:
+            product_data["html_debug"] = raw["html_debug"]
+        else:
+            product_data["html_debug"] = {"error": raw.get("error", "No se pudo capturar HTML")}
+
+        products.append(product_data)
+
+    return products
+
+def extract_products_batch(driver, items, start_position=1):
+    """Extrae todas las tarjetas con una sola llamada a execute_script"""
+    if not items:
+        return []
+
+    raw_results = json.loads(driver.execute_script(BATCH_EXTRACTION_SCRIPT, list(items)))
+    return build_products(raw_results, start_position)
+
+# Primer enlace de cada tarjeta, en una sola llamada (para descartar repetidos antes de extraer)
+CARD_LINKS_SCRIPT = """
+return Array.prototype.map.call(arguments[0], function(card) {
+    var link = card.querySelector('a[class*="ui-search-link"]') || card.querySelector('a');
+    return link ? link.href : null;
+});
+"""
+
+def card_links(driver, items):
+    """URL de cada tarjeta (o None) con una sola llamada a execute_script"""
+    if not items:
+        return []
+    return driver.execute_script(CARD_LINKS_SCRIPT, list(items))
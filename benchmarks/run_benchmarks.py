@@ -0,0 +1,267 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmarks de extracción sobre páginas guardadas, sin conexión
+- Fixtures versionadas en benchmarks/fixtures/<versión>/ con manifest.json (productos esperados)
+- Mide cada motor por página y por tarjeta (p50/p95) y cuenta los viajes a WebDriver
+- Compara con benchmarks/baseline.json y termina con código 1 si una página empeora
+  más que el umbral, si aumentan los viajes, si cambian los datos extraídos (o el método
+  declarado en el manifest) o si no hay línea base
+- Los motores con navegador cargan las páginas desde un servidor HTTP local (o file://)
+"""
+import argparse
+import contextlib
+import functools
+import importlib.util
+import io
+import json
+import math
+import os
+import sys
+import threading
+import time
+from datetime import datetime
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCHMARKS_DIR)
+sys.path.insert(0, REPO_DIR)
+
+from offline_parser import parse_listing_html
+from scraper_logging import configure_logging
+
+ENGINES = ("offline", "batch", "legacy")
+BROWSER_ENGINES = ("batch", "legacy")
+BASELINE_PATH = os.path.join(BENCHMARKS_DIR, "baseline.json")
+
+def percentile(values, q):
+    """Percentil por rango más cercano"""
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, math.ceil(q / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+def load_fixtures(version):
+    fixtures_dir = os.path.join(BENCHMARKS_DIR, "fixtures", version)
+    with open(os.path.join(fixtures_dir, "manifest.json"), 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+    return fixtures_dir, manifest
+
+@contextlib.contextmanager
+def static_server(directory):
+    """Servidor HTTP local en un puerto libre que sirve las fixtures"""
+    class QuietHandler(SimpleHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), functools.partial(QuietHandler, directory=directory))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}/"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+class CommandCounter:
+    """Cuenta los comandos enviados a WebDriver (también los de cada WebElement)"""
+
+    def __init__(self, driver):
+        self.count = 0
+        original = driver.execute
+
+        def execute(driver_command, params=None):
+            self.count += 1
+            return original(driver_command, params)
+        driver.execute = execute
+
+def load_chrome_script():
+    """Importa Scraping-Selenium-chrome.py (el nombre con guiones no se puede importar directo)"""
+    spec = importlib.util.spec_from_file_location("scraping_chrome", os.path.join(REPO_DIR, "Scraping-Selenium-chrome.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+def run_offline(html_by_page, repetitions):
+    """{página: (tiempos en s, viajes por repetición, productos)}"""
+    results = {}
+    for page, html in html_by_page.items():
+        timings = []
+        for _ in range(repetitions):
+            start = time.perf_counter()
+            products = parse_listing_html(html)
+            timings.append(time.perf_counter() - start)
+        results[page] = (timings, 0, products)
+    return results
+
+def run_browser(engine, chrome, driver, counter, page_urls, repetitions):
+    """Carga cada página una vez y mide detección de tarjetas más extracción"""
+    results = {}
+    for page, url in page_urls.items():
+        driver.get(url)
+        timings = []
+        trips = 0
+        for _ in range(repetitions):
+            counter.count = 0
+            start = time.perf_counter()
+            items, layout = chrome.find_product_items(driver)
+            if engine == "batch":
+                products = chrome.extract_products_batch(driver, items)
+            else:
+                products = [chrome.extract_product_legacy(driver, item, idx, layout=layout)
+                            for idx, item in enumerate(items)]
+            timings.append(time.perf_counter() - start)
+            trips = counter.count
+        results[page] = (timings, trips, products)
+    return results
+
+def summarize(results, manifest):
+    """Estadísticas por página y diferencias con los productos esperados"""
+    summary = {}
+    mismatches = []
+    for page, (timings, trips, products) in results.items():
+        cards = max(1, len(products))
+        summary[page] = {
+            "tarjetas": len(products),
+            "p50_ms": round(percentile(timings, 50) * 1000, 3),
+            "p95_ms": round(percentile(timings, 95) * 1000, 3),
+            "p50_ms_tarjeta": round(percentile(timings, 50) * 1000 / cards, 4),
+            "p95_ms_tarjeta": round(percentile(timings, 95) * 1000 / cards, 4),
+            "viajes": trips,
+            "viajes_tarjeta": round(trips / cards, 2),
+        }
+
+        expected = manifest["paginas"][page]["esperados"]
+        methods = manifest["paginas"][page].get("metodos", {})
+        if len(products) != len(expected):
+            mismatches.append(f"{page}: {len(products)} tarjetas, se esperaban {len(expected)}")
+            continue
+        for position, (product, wanted) in enumerate(zip(products, expected), 1):
+            for field in ("titulo", "precio"):
+                if product[field] != wanted[field]:
+                    mismatches.append(f"{page} #{position} {field}: {product[field]!r} (esperado {wanted[field]!r})")
+            for field, method in methods.items():
+                if product["metodo_extraccion"][field] != method:
+                    mismatches.append(f"{page} #{position} método de {field}: "
+                                      f"{product['metodo_extraccion'][field]!r} (esperado {method!r})")
+    return summary, mismatches
+
+def compare(current, baseline, threshold):
+    """Regresiones respecto a la línea base: tiempo p50 por encima del umbral o más viajes"""
+    regressions = []
+    for engine, pages in current.items():
+        for page, stats in pages.items():
+            base = baseline.get(engine, {}).get(page)
+            if not base:
+                continue
+            if stats["p50_ms"] > base["p50_ms"] * (1 + threshold):
+                regressions.append(f"{engine}/{page}: p50 {stats['p50_ms']} ms (base {base['p50_ms']} ms, "
+                                   f"+{(stats['p50_ms'] / base['p50_ms'] - 1) * 100:.0f}%)")
+            if stats["viajes"] > base["viajes"]:
+                regressions.append(f"{engine}/{page}: {stats['viajes']} viajes a WebDriver (base {base['viajes']})")
+    return regressions
+
+def print_table(current):
+    print(f"{'motor':<8} {'página':<20} {'tarj.':>5} {'p50 ms':>9} {'p95 ms':>9} "
+          f"{'p50 ms/t':>9} {'p95 ms/t':>9} {'viajes':>7} {'v/tarj.':>7}")
+    for engine, pages in current.items():
+        for page, s in pages.items():
+            print(f"{engine:<8} {page:<20} {s['tarjetas']:>5} {s['p50_ms']:>9.3f} {s['p95_ms']:>9.3f} "
+                  f"{s['p50_ms_tarjeta']:>9.4f} {s['p95_ms_tarjeta']:>9.4f} {s['viajes']:>7} {s['viajes_tarjeta']:>7}")
+
+# Ejecutar:
+#   python benchmarks/run_benchmarks.py                       # compara con baseline.json
+#   python benchmarks/run_benchmarks.py --guardar-base        # actualiza la línea base
+#   python benchmarks/run_benchmarks.py --motores offline --repeticiones 50
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmarks de extracción sin conexión")
+    parser.add_argument("--fixtures", default="v1", help="Versión de las fixtures (carpeta en benchmarks/fixtures)")
+    parser.add_argument("--motores", default=",".join(ENGINES), help="Motores separados por coma")
+    parser.add_argument("--repeticiones", type=int, default=10)
+    parser.add_argument("--umbral", type=float, default=0.25, help="Aumento de p50 tolerado (0.25 = 25%%)")
+    parser.add_argument("--base", default=BASELINE_PATH)
+    parser.add_argument("--guardar-base", action="store_true", help="Guarda los resultados como nueva línea base")
+    parser.add_argument("--file-urls", action="store_true", help="Carga las páginas como file:// en lugar del servidor local")
+    parser.add_argument("--salida", help="Archivo JSON con los resultados")
+    args = parser.parse_args()
+    # Los logs de cada tarjeta no forman parte de la medición ni de la tabla. El hilo de logging
+    # escribe en el sys.stdout original, así que redirect_stdout no los silencia: se sube el nivel
+    configure_logging(level="WARNING")
+
+    engines = [engine.strip() for engine in args.motores.split(",") if engine.strip()]
+    unknown = set(engines) - set(ENGINES)
+    if unknown:
+        parser.error(f"Motores desconocidos: {', '.join(sorted(unknown))}. Opciones: {', '.join(ENGINES)}")
+
+    fixtures_dir, manifest = load_fixtures(args.fixtures)
+    html_by_page = {}
+    for page in manifest["paginas"]:
+        with open(os.path.join(fixtures_dir, page), 'r', encoding='utf-8') as f:
+            html_by_page[page] = f.read()
+
+    raw_results = {}
+    if "offline" in engines:
+        raw_results["offline"] = run_offline(html_by_page, args.repeticiones)
+
+    browser_engines = [engine for engine in engines if engine in BROWSER_ENGINES]
+    if browser_engines:
+        try:
+            chrome = load_chrome_script()
+        except ImportError as e:
+            print(f"Se omiten {', '.join(browser_engines)}: {e}", file=sys.stderr)
+            browser_engines = []
+
+    if browser_engines:
+        with contextlib.ExitStack() as stack:
+            if args.file_urls:
+                page_urls = {page: Path(fixtures_dir, page).as_uri() for page in html_by_page}
+            else:
+                base_url = stack.enter_context(static_server(fixtures_dir))
+                page_urls = {page: base_url + page for page in html_by_page}
+            with contextlib.redirect_stdout(io.StringIO()):
+                driver = chrome.create_chrome_driver(headless=True)
+            stack.callback(driver.quit)
+            counter = CommandCounter(driver)
+            for engine in browser_engines:
+                raw_results[engine] = run_browser(engine, chrome, driver, counter, page_urls, args.repeticiones)
+
+    current = {}
+    mismatches = []
+    for engine, results in raw_results.items():
+        current[engine], engine_mismatches = summarize(results, manifest)
+        mismatches += [f"{engine}: {m}" for m in engine_mismatches]
+    print_table(current)
+
+    output = {
+        "fecha": datetime.now().isoformat(timespec="seconds"),
+        "fixtures": manifest["version"],
+        "repeticiones": args.repeticiones,
+        "motores": current,
+    }
+    if args.salida:
+        with open(args.salida, 'w', encoding='utf-8') as f:
+            json.dump(output, f, ensure_ascii=False, indent=4)
+
+    failures = list(mismatches)
+    if os.path.exists(args.base) and not args.guardar_base:
+        with open(args.base, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        if baseline.get("fixtures") != manifest["version"]:
+            print(f"La línea base es de las fixtures {baseline.get('fixtures')}; no se compara", file=sys.stderr)
+        else:
+            failures += compare(current, baseline["motores"], args.umbral)
+    elif not args.guardar_base:
+        failures.append(f"Sin línea base en {args.base}. Genera una con --guardar-base")
+
+    if args.guardar_base:
+        if mismatches:
+            print("No se guarda la línea base: hay datos distintos a los esperados", file=sys.stderr)
+        else:
+            with open(args.base, 'w', encoding='utf-8') as f:
+                json.dump(output, f, ensure_ascii=False, indent=4)
+            print(f"Línea base guardada en {args.base}", file=sys.stderr)
+
+    if failures:
+        print("\n=== REGRESIONES ===", file=sys.stderr)
+        for failure in failures:
+            print(f"- {failure}", file=sys.stderr)
+        sys.exit(1)
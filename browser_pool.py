@@ -0,0 +1,190 @@
+# -*- coding: utf-8 -*-
+"""
+Pool de navegadores persistentes para procesar lotes de términos
+- N workers, cada uno con su propio WebDriver reutilizado entre términos
+- Limpia cookies y almacenamiento entre trabajos
+- Recicla el navegador tras un número de páginas o si se cae
+- Reporta el rendimiento por worker
+"""
+import queue
+import threading
+import time
+
+from scraper_logging import get_logger
+
+logger = get_logger("pool")
+log = logger.info
+
+def reset_driver_state(driver):
+    """Deja el navegador limpio para el siguiente término sin reiniciarlo"""
+    # Cerrar pestañas extra que haya abierto la página
+    handles = driver.window_handles
+    for handle in handles[1:]:
+        driver.switch_to.window(handle)
+        driver.close()
+    driver.switch_to.window(handles[0])
+
+    try:
+        driver.execute_script("window.localStorage.clear(); window.sessionStorage.clear();")
+    except Exception:
+        pass
+    driver.delete_all_cookies()
+    driver.get("about:blank")
+
+def quit_driver(driver):
+    try:
+        driver.quit()
+    except Exception:
+        pass
+
+class BrowserPool:
+    """Pool de workers con navegador caliente
+
+    driver_factory() crea un WebDriver nuevo.
+    job(driver, term) procesa un término y devuelve (productos, páginas procesadas).
+    """
+
+    def __init__(self, driver_factory, size=4, max_pages_per_driver=50, max_attempts=2):
+        self.driver_factory = driver_factory
+        self.size = size
+        self.max_pages_per_driver = max_pages_per_driver
+        self.max_attempts = max_attempts
+        self.stats = {}
+        self.results = {}
+        self.errors = {}
+        self.elapsed = 0.0
+        self._lock = threading.Lock()
+
+    def run(self, terms, job, scheduler=None):
+        """Procesa todos los términos y devuelve {término: productos}
+        - scheduler: cola con prioridades (TermScheduler); por defecto se siguen en orden de llegada
+        """
+        start = time.perf_counter()
+        jobs = scheduler if scheduler is not None else queue.Queue()
+        for term in terms:
+            jobs.put((term, 1))
+
+        workers = []
+        for worker_id in range(1, min(self.size, len(terms)) + 1):
+            self.stats[worker_id] = {
+                "terminos": 0,
+                "paginas": 0,
+                "productos": 0,
+                "errores": 0,
+                "navegadores_iniciados": 0,
+                "tiempo_ocupado": 0.0,
+                "tiempo_arranque": 0.0,
+            }
+            thread = threading.Thread(target=self._worker, args=(worker_id, jobs, job),
+                                      name=f"browser-worker-{worker_id}", daemon=True)
+            thread.start()
+            workers.append(thread)
+
+        for thread in workers:
+            thread.join()
+
+        self.elapsed = time.perf_counter() - start
+        return self.results
+
+    def _start_driver(self, worker_id):
+        start = time.perf_counter()
+        driver = self.driver_factory()
+        elapsed = time.perf_counter() - start
+        stats = self.stats[worker_id]
+        stats["navegadores_iniciados"] += 1
+        stats["tiempo_arranque"] += elapsed
+        log(f"[worker {worker_id}] Navegador iniciado en {elapsed:.1f} s")
+        return driver
+
+    def _worker(self, worker_id, jobs, job):
+        stats = self.stats[worker_id]
+        driver = None
+        pages_on_driver = 0
+
+        while True:
+            try:
+                term, attempt = jobs.get_nowait()
+            except queue.Empty:
+                break
+
+            try:
+                if driver is None:
+                    driver = self._start_driver(worker_id)
+                    pages_on_driver = 0
+
+                start = time.perf_counter()
+                products, pages = job(driver, term)
+                stats["tiempo_ocupado"] += time.perf_counter() - start
+                stats["terminos"] += 1
+                stats["paginas"] += pages
+                stats["productos"] += len(products)
+                pages_on_driver += pages
+
+                with self._lock:
+                    self.results[term] = products
+                log(f"[worker {worker_id}] '{term}': {len(products)} productos en {pages} páginas")
+
+            except Exception as e:
+                stats["errores"] += 1
+                logger.warning("[worker %s] Error con '%s' (intento %d): %.80s", worker_id, term, attempt, e)
+
+                # Un navegador caído no se reutiliza
+                if driver is not None:
+                    quit_driver(driver)
+                    driver = None
+
+                if attempt < self.max_attempts:
+                    jobs.put((term, attempt + 1))
+                else:
+                    with self._lock:
+                        self.errors[term] = str(e)
+                continue
+
+            # El término ya está guardado: un fallo al limpiar o reciclar solo reemplaza el navegador
+            try:
+                # Reciclar el navegador cuando acumula demasiadas páginas
+                if pages_on_driver >= self.max_pages_per_driver:
+                    log(f"[worker {worker_id}] Reciclando navegador tras {pages_on_driver} páginas")
+                    quit_driver(driver)
+                    driver = None
+                else:
+                    reset_driver_state(driver)
+            except Exception as e:
+                logger.warning("[worker %s] No se pudo limpiar el navegador, se reemplaza: %.80s", worker_id, e)
+                quit_driver(driver)
+                driver = None
+
+        if driver is not None:
+            quit_driver(driver)
+
+    def summary(self):
+        """Totales y rendimiento del pool (términos, páginas y productos por minuto)"""
+        total_pages = sum(stats["paginas"] for stats in self.stats.values())
+        total_products = sum(stats["productos"] for stats in self.stats.values())
+        minutes = self.elapsed / 60
+        return {
+            "terminos": len(self.results),
+            "fallidos": len(self.errors),
+            "paginas": total_pages,
+            "productos": total_products,
+            "duracion_s": round(self.elapsed, 1),
+            "terminos_por_min": round(len(self.results) / minutes, 2) if minutes else 0,
+            "paginas_por_min": round(total_pages / minutes, 2) if minutes else 0,
+            "productos_por_min": round(total_products / minutes, 2) if minutes else 0,
+            "errores": dict(self.errors),
+        }
+
+    def report(self):
+        """Muestra el rendimiento de cada worker y del pool completo"""
+        log("\n=== RENDIMIENTO DEL POOL ===")
+        for worker_id, stats in sorted(self.stats.items()):
+            busy_minutes = stats["tiempo_ocupado"] / 60
+            pages_per_minute = stats["paginas"] / busy_minutes if busy_minutes else 0
+            log(f"Worker {worker_id}: {stats['terminos']} términos, {stats['paginas']} páginas, "
+                f"{stats['productos']} productos, {stats['errores']} errores, "
+                f"{stats['navegadores_iniciados']} navegadores ({stats['tiempo_arranque']:.1f} s de arranque), "
+                f"{pages_per_minute:.1f} páginas/min")
+
+        summary = self.summary()
+        log(f"Total: {summary['terminos']} términos, {summary['paginas']} páginas, {summary['productos']} productos, "
+            f"{summary['fallidos']} términos fallidos en {self.elapsed:.1f} s ({summary['terminos_por_min']:.1f} términos/min)")
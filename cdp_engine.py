@@ -0,0 +1,269 @@
+# -*- coding: utf-8 -*-
+"""
+Motor asíncrono de scraping sobre el protocolo Chrome DevTools (CDP)
+- Un solo proceso de Chrome y un solo WebSocket para muchas pestañas a la vez
+- La concurrencia (pestañas abiertas) se limita con un semáforo
+- Cada página se extrae con el mismo script por lotes que usa Selenium,
+  así que los registros son iguales a los de scrape_mercadolibre_chrome
+"""
+import asyncio
+import itertools
+import json
+import shutil
+import tempfile
+import urllib.request
+
+try:
+    import websockets
+except ImportError:
+    websockets = None
+
+from batch_extraction import build_page_extraction_expression, build_products
+from driver_cache import find_chrome_binary
+from http_fetch import USER_AGENT
+from offline_parser import LISTING_BASE_URL
+from pagination import build_page_urls
+from price_normalizer import annotate_prices
+from scraper_logging import get_logger
+
+# Expresión que indica que el listado ya tiene tarjetas en el DOM
+CARDS_READY_EXPRESSION = (
+    "!!document.querySelector('li[class*=\"ui-search-layout__item\"], div[class*=\"ui-search-result\"]')"
+)
+
+logger = get_logger("cdp")
+log = logger.info
+
+class CDPError(Exception):
+    pass
+
+def require_websockets():
+    if websockets is None:
+        raise RuntimeError("El motor CDP necesita websockets: pip install websockets")
+
+class CDPConnection:
+    """Conexión WebSocket al navegador con sesiones planas (flatten) por pestaña"""
+
+    def __init__(self, websocket):
+        self.websocket = websocket
+        self._ids = itertools.count(1)
+        self._pending = {}
+        self._event_waiters = []
+        self._reader = asyncio.create_task(self._read_loop())
+
+    @classmethod
+    async def connect(cls, ws_url):
+        websocket = await websockets.connect(ws_url, max_size=None)
+        return cls(websocket)
+
+    async def _read_loop(self):
+        try:
+            async for raw in self.websocket:
+                message = json.loads(raw)
+                if "id" in message:
+                    future = self._pending.pop(message["id"], None)
+                    if future is not None and not future.done():
+                        if "error" in message:
+                            future.set_exception(CDPError(message["error"].get("message")))
+                        else:
+                            future.set_result(message.get("result", {}))
+                else:
+                    for waiter in list(self._event_waiters):
+                        method, session_id, future = waiter
+                        if (message.get("method") == method and message.get("sessionId") == session_id
+                                and not future.done()):
+                            future.set_result(message.get("params", {}))
+                            self._event_waiters.remove(waiter)
+        finally:
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(CDPError("Conexión con el navegador cerrada"))
+
+    async def send(self, method, params=None, session_id=None, timeout=30):
+        message_id = next(self._ids)
+        message = {"id": message_id, "method": method, "params": params or {}}
+        if session_id:
+            message["sessionId"] = session_id
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending[message_id] = future
+        await self.websocket.send(json.dumps(message))
+        return await asyncio.wait_for(future, timeout)
+
+    def wait_for_event(self, method, session_id=None):
+        """Future que se resuelve con el siguiente evento indicado de la sesión"""
+        future = asyncio.get_running_loop().create_future()
+        self._event_waiters.append((method, session_id, future))
+        return future
+
+    async def close(self):
+        self._reader.cancel()
+        await self.websocket.close()
+
+class AsyncChromeScraper:
+    """Scraper asíncrono: varias pestañas en vuelo dentro de un mismo proceso"""
+
+    def __init__(self, max_tabs=8, headless=True, max_products=15, base_url=LISTING_BASE_URL,
+                 port=9222, page_timeout=30):
+        self.max_tabs = max_tabs
+        self.headless = headless
+        self.max_products = max_products
+        self.base_url = base_url
+        self.port = port
+        self.page_timeout = page_timeout
+        self.process = None
+        self.connection = None
+        self.semaphore = None
+        self.profile_dir = None
+
+    async def start(self):
+        # Antes de lanzar Chrome, para no dejar un proceso huérfano si falta la dependencia
+        require_websockets()
+        self.profile_dir = tempfile.mkdtemp(prefix="cdp-profile-")
+        args = [
+            find_chrome_binary(),
+            f"--remote-debugging-port={self.port}",
+            f"--user-data-dir={self.profile_dir}",
+            f"--user-agent={USER_AGENT}",
+            "--disable-search-engine-choice-screen",
+            "--disable-notifications",
+            "--disable-popup-blocking",
+            "--no-first-run",
+            "--window-size=1280,800",
+            "about:blank",
+        ]
+        if self.headless:
+            args.insert(1, "--headless=new")
+
+        self.process = await asyncio.create_subprocess_exec(
+            *args, stdout=asyncio.subprocess.DEVNULL, stderr=asyncio.subprocess.DEVNULL)
+        ws_url = await self._browser_ws_url()
+        self.connection = await CDPConnection.connect(ws_url)
+        self.semaphore = asyncio.Semaphore(self.max_tabs)
+        log(f"Chrome (CDP) iniciado con hasta {self.max_tabs} pestañas concurrentes")
+
+    async def _browser_ws_url(self, attempts=50):
+        url = f"http://127.0.0.1:{self.port}/json/version"
+        loop = asyncio.get_running_loop()
+        for _ in range(attempts):
+            try:
+                raw = await loop.run_in_executor(None, lambda: urllib.request.urlopen(url, timeout=1).read())
+                return json.loads(raw)["webSocketDebuggerUrl"]
+            except Exception:
+                await asyncio.sleep(0.2)
+        raise CDPError("Chrome no expuso el puerto de DevTools a tiempo")
+
+    async def close(self):
+        if self.connection is not None:
+            try:
+                await self.connection.send("Browser.close", timeout=5)
+            except Exception:
+                pass
+            await self.connection.close()
+        if self.process is not None and self.process.returncode is None:
+            self.process.terminate()
+            await self.process.wait()
+        if self.profile_dir:
+            shutil.rmtree(self.profile_dir, ignore_errors=True)
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def _wait_for_cards(self, session_id):
+        """Espera a que existan tarjetas en el DOM (o a que se agote el tiempo)"""
+        deadline = asyncio.get_running_loop().time() + self.page_timeout
+        while asyncio.get_running_loop().time() < deadline:
+            result = await self.connection.send("Runtime.evaluate", {
+                "expression": CARDS_READY_EXPRESSION, "returnByValue": True}, session_id)
+            if result.get("result", {}).get("value"):
+                return True
+            await asyncio.sleep(0.25)
+        return False
+
+    async def scrape_page(self, url, start_position=1):
+        """Abre una pestaña, navega, extrae las tarjetas en una llamada y la cierra"""
+        async with self.semaphore:
+            target = await self.connection.send("Target.createTarget", {"url": "about:blank"})
+            target_id = target["targetId"]
+            try:
+                attached = await self.connection.send("Target.attachToTarget",
+                                                      {"targetId": target_id, "flatten": True})
+                session_id = attached["sessionId"]
+                await self.connection.send("Page.enable", session_id=session_id)
+
+                loaded = self.connection.wait_for_event("Page.loadEventFired", session_id)
+                await self.connection.send("Page.navigate", {"url": url}, session_id)
+                try:
+                    await asyncio.wait_for(loaded, self.page_timeout)
+                except asyncio.TimeoutError:
+                    logger.warning("Tiempo de carga agotado, se intenta extraer igualmente: %s", url)
+
+                if not await self._wait_for_cards(session_id):
+                    logger.warning("No se encontraron productos en: %s", url)
+                    return []
+
+                result = await self.connection.send("Runtime.evaluate", {
+                    "expression": build_page_extraction_expression(self.max_products),
+                    "returnByValue": True,
+                }, session_id)
+                if "exceptionDetails" in result:
+                    raise CDPError(result["exceptionDetails"].get("text", "Error en el script de extracción"))
+
+                return annotate_prices(build_products(json.loads(result["result"]["value"]), start_position))
+            finally:
+                try:
+                    await self.connection.send("Target.closeTarget", {"targetId": target_id})
+                except Exception:
+                    pass
+
+    async def scrape(self, term, pages=1):
+        """Mismos registros que scrape_mercadolibre_chrome para un término y N páginas"""
+        page_urls = build_page_urls(term, pages, self.base_url)
+        results = await asyncio.gather(*(self.scrape_page(url) for url in page_urls), return_exceptions=True)
+
+        products = []
+        for page, (url, page_products) in enumerate(zip(page_urls, results), start=1):
+            if isinstance(page_products, Exception):
+                logger.error("Error en página %d de '%s': %s", page, term, page_products)
+                continue
+            if not page_products:
+                continue
+            # Posiciones consecutivas entre páginas, como en la paginación síncrona
+            for product_data in page_products:
+                product_data["posicion"] = len(products) + 1
+                products.append(product_data)
+
+        log(f"'{term}': {len(products)} productos en {len(page_urls)} páginas")
+        return products
+
+    async def scrape_many(self, terms, pages=1):
+        """Procesa varios términos a la vez; devuelve {término: productos}"""
+        results = await asyncio.gather(*(self.scrape(term, pages) for term in terms))
+        return dict(zip(terms, results))
+
+async def scrape(term, pages=1, max_tabs=8, **options):
+    """Atajo: inicia Chrome, procesa un término y cierra el navegador"""
+    async with AsyncChromeScraper(max_tabs=max_tabs, **options) as scraper:
+        return await scraper.scrape(term, pages)
+
+# Ejecutar: python cdp_engine.py "iphone 15" "kindle" --paginas 3
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Scraping asíncrono de Mercado Libre vía CDP")
+    parser.add_argument("terminos", nargs="+")
+    parser.add_argument("--paginas", type=int, default=1)
+    parser.add_argument("--pestanas", type=int, default=8)
+    args = parser.parse_args()
+
+    async def main():
+        async with AsyncChromeScraper(max_tabs=args.pestanas) as scraper:
+            return await scraper.scrape_many(args.terminos, args.paginas)
+
+    for term, products in asyncio.run(main()).items():
+        print(f"=== {term}: {len(products)} productos ===")
+        print(json.dumps(products, ensure_ascii=False, indent=4))
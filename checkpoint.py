@@ -0,0 +1,191 @@
+# -*- coding: utf-8 -*-
+"""
+Diario de avance para reanudar lotes interrumpidos
+- JSON Lines de solo agregado: cada registro es una sola escritura seguida de fsync,
+  así una caída solo puede dejar incompleta la última línea, que se descarta al abrir
+- Registra por término el archivo de salida, cada página terminada con los IDs emitidos
+  y el término completo
+- Al reanudar se omiten los términos terminados y, dentro de cada término, las páginas
+  ya guardadas; los productos se siguen agregando al mismo .jsonl
+- Los productos del .jsonl posteriores a la última página registrada (una página que se
+  escribió pero no llegó al diario) no se vuelven a escribir al repetir esa página
+"""
+import json
+import os
+import threading
+import time
+from collections import Counter
+
+from item_ids import canonical_url, item_id_from_url
+from scraper_logging import get_logger
+from stream_output import json_path_for, read_products, stream_path_for
+
+CHECKPOINT_FILENAME = "checkpoint_lote_chrome.jsonl"
+
+logger = get_logger("checkpoint")
+
+class CheckpointJournal:
+    """Avance de un lote por (término, página)
+    - config: parámetros del lote (páginas, máximo de productos...); si no coinciden con los
+      del diario existente, ese diario se aparta y el lote empieza de cero
+    """
+
+    def __init__(self, path, config=None):
+        self.path = path
+        self.config = config or {}
+        self.terms = {}
+        self._lock = threading.Lock()
+
+        records = self._load()
+        if records and records[0].get("config") != self.config:
+            logger.warning("El diario %s es de un lote con otra configuración; se aparta y se empieza de cero", path)
+            os.replace(path, path + ".anterior")
+            records = []
+
+        self._fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        if records:
+            for record in records[1:]:
+                self._apply(record)
+        else:
+            self._append({"tipo": "lote", "config": self.config, "ts": time.time()})
+
+    def _load(self):
+        """Registros del diario. Una última línea incompleta se recorta para poder seguir agregando"""
+        if not os.path.exists(self.path):
+            return []
+        with open(self.path, 'rb') as f:
+            data = f.read()
+        end = data.rfind(b"\n") + 1
+        if end < len(data):
+            with open(self.path, 'r+b') as f:
+                f.truncate(end)
+        return read_products(self.path)
+
+    def _append(self, record):
+        os.write(self._fd, (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8"))
+        os.fsync(self._fd)
+
+    def _apply(self, record):
+        term = self.terms.setdefault(record["termino"], {"archivo": None, "paginas": {}, "terminado": False})
+        if record["tipo"] == "inicio":
+            term["archivo"] = record["archivo"]
+        elif record["tipo"] == "pagina":
+            term["paginas"][record["pagina"]] = record["ids"]
+        elif record["tipo"] == "termino":
+            term["terminado"] = True
+
+    def _record(self, record):
+        with self._lock:
+            self._append(record)
+            self._apply(record)
+
+    def output_for(self, term):
+        """Archivo de salida de un término ya empezado, o None"""
+        with self._lock:
+            return self.terms.get(term, {}).get("archivo")
+
+    def is_done(self, term):
+        with self._lock:
+            return self.terms.get(term, {}).get("terminado", False)
+
+    def pending(self, terms):
+        return [term for term in terms if not self.is_done(term)]
+
+    def completed_results(self, terms):
+        """{término: productos} de los términos terminados, leídos de su .jsonl"""
+        results = {}
+        for term in terms:
+            path = self.output_for(term)
+            if self.is_done(term) and path and os.path.exists(stream_path_for(path)):
+                results[term] = read_products(stream_path_for(path))
+        return results
+
+    def for_term(self, term, output_filename):
+        """Vista del diario para un término. Registra el archivo de salida si es la primera vez"""
+        if self.output_for(term) is None:
+            self._record({"tipo": "inicio", "termino": term, "archivo": output_filename, "ts": time.time()})
+        return TermCheckpoint(self, term, stream_path_for(output_filename))
+
+    def finish(self):
+        """Lote completo: el diario ya no hace falta"""
+        self.close()
+        os.remove(self.path)
+
+    def close(self):
+        with self._lock:
+            if self._fd is not None:
+                os.close(self._fd)
+                self._fd = None
+
+def resume_key(product):
+    """Clave de un producto al reanudar: item_id, la URL canónica o, sin URL, título y precio"""
+    item_id = product.get("item_id") or item_id_from_url(product.get("url"))
+    if item_id:
+        return item_id
+    url = product.get("url")
+    if url and url != "No disponible":
+        return canonical_url(url)
+    return (product.get("titulo"), product.get("precio"))
+
+class TermCheckpoint:
+    """Páginas terminadas de un término y productos escritos sin registrar
+    - unregistered: claves de los productos del .jsonl que siguen a la última página
+      registrada, es decir, los de una página que se escribió pero no llegó al diario
+    """
+
+    def __init__(self, journal, term, stream_filename):
+        self.journal = journal
+        self.term = term
+        self.stream_filename = stream_filename
+        with journal._lock:
+            pages = dict(journal.terms[term]["paginas"])
+        self.completed_pages = set(pages)
+        self.unregistered = Counter()
+        self.emitted_count = 0
+        if os.path.exists(stream_filename):
+            previous = read_products(stream_filename)
+            self.emitted_count = len(previous)
+            registered = sum(len(ids) for ids in pages.values())
+            self.unregistered.update(resume_key(product) for product in previous[registered:])
+        self.resumed = bool(self.completed_pages or self.emitted_count)
+
+    def resume_from(self):
+        """Páginas ya guardadas al inicio del término (se completan en orden)"""
+        page = 0
+        while page + 1 in self.completed_pages:
+            page += 1
+        return page
+
+    def filter_emitted(self, products):
+        """Agrega item_id y descarta los productos de la página que ya estaban en el .jsonl sin registrar
+        - Solo afecta a la primera página después de reanudar; las repeticiones entre páginas
+          las descarta el índice de vistas (dedup), no el diario
+        """
+        kept = []
+        for product in products:
+            product["item_id"] = product.get("item_id") or item_id_from_url(product.get("url"))
+            key = resume_key(product)
+            if self.unregistered[key] > 0:
+                self.unregistered[key] -= 1
+            else:
+                kept.append(product)
+        return kept
+
+    def page_done(self, page, url, products, writer=None):
+        """Registra la página después de que sus productos llegaron al disco"""
+        if writer is not None and hasattr(writer, "sync"):
+            writer.sync()
+        # Un término nuevo cuyo nombre ya estaba ocupado escribe en un archivo con sufijo
+        path = getattr(writer, "path", None)
+        if path and path != self.stream_filename:
+            self.journal._record({"tipo": "inicio", "termino": self.term, "archivo": json_path_for(path), "ts": time.time()})
+            self.stream_filename = path
+        ids = [product.get("item_id") or item_id_from_url(product.get("url")) for product in products]
+        self.journal._record({"tipo": "pagina", "termino": self.term, "pagina": page, "url": url,
+                              "productos": len(products), "ids": ids, "ts": time.time()})
+        self.completed_pages.add(page)
+        self.unregistered.clear()
+        self.emitted_count += len(products)
+
+    def done(self, products_count):
+        self.journal._record({"tipo": "termino", "termino": self.term, "productos": products_count, "ts": time.time()})
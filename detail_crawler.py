@@ -0,0 +1,180 @@
+# -*- coding: utf-8 -*-
+"""
+Etapa de detalle: descarga la página de cada producto y agrega stock, vendedor y precio
+- Descargas en paralelo por HTTP con concurrencia acotada
+- Límite de peticiones por segundo por host (token bucket)
+- Cada publicación se descarga una sola vez desde su URL de artículo (articulo.mercadolibre.com.mx/MLM-<id>)
+  y el resultado se une a los registros por ID (MLM...). En las fichas de catálogo /p/ la compra
+  destacada puede ser de otro vendedor, por eso no se descarga la URL del listado
+"""
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import lxml.html
+
+from http_fetch import ITEM_HOST, JS_REQUIRED_MARKERS, HostRateLimiter, HttpFetcher
+from item_ids import canonical_url, item_id_from_url
+from offline_parser import _first, _has_class, _text
+from price_normalizer import normalize_price
+from stream_output import read_products
+
+STOCK_PATTERN = re.compile(r'(\d[\d,.]*)\s+disponible', re.IGNORECASE)
+SOLD_PATTERN = re.compile(r'\+?(\d[\d,.]*)\s*(mil)?\s+vendid', re.IGNORECASE)
+
+def _amount(container):
+    """Precio con símbolo, fracción y centavos dentro de un contenedor andes-money-amount"""
+    if container is None:
+        return None
+    symbol = _text(_first(container, _has_class("andes-money-amount__currency-symbol")))
+    fraction = _text(_first(container, _has_class("andes-money-amount__fraction")))
+    if not fraction:
+        return None
+    cents = _text(_first(container, _has_class("andes-money-amount__cents")))
+    price = f"{symbol or '$'} {fraction}"
+    return f"{price}.{cents}" if cents else price
+
+def _number(text):
+    return int(re.sub(r'\D', '', text)) if text and re.search(r'\d', text) else None
+
+def parse_detail_html(html):
+    """Extrae los campos de detalle de una página de artículo"""
+    tree = lxml.html.fromstring(html)
+    detail = {
+        "precio": None,
+        "precio_original": None,
+        "moneda": None,
+        "stock": None,
+        "vendedor": None,
+        "condicion": None,
+        "vendidos": None,
+    }
+
+    # Precio: primero los metadatos estructurados, luego el bloque visible
+    price_meta = _first(tree, '//meta[@itemprop="price"]')
+    if price_meta is not None and price_meta.get("content"):
+        detail["precio"] = f"$ {price_meta.get('content')}"
+    else:
+        detail["precio"] = _amount(_first(tree, _has_class("ui-pdp-price__second-line")))
+    detail["precio_original"] = _amount(_first(tree, '//s[contains(@class, "andes-money-amount--previous")]'))
+
+    currency_meta = _first(tree, '//meta[@itemprop="priceCurrency"]')
+    detail["moneda"] = currency_meta.get("content") if currency_meta is not None else None
+
+    # Stock: "(+50 disponibles)", "(15 disponibles)" o "¡Último disponible!"
+    stock_text = _text(_first(tree, _has_class("ui-pdp-buybox__quantity__available")))
+    if not stock_text:
+        stock_text = _text(_first(tree, _has_class("ui-pdp-stock-information__title")))
+    match = STOCK_PATTERN.search(stock_text)
+    if match:
+        detail["stock"] = _number(match.group(1))
+    elif "último disponible" in stock_text.lower():
+        detail["stock"] = 1
+
+    seller = _first(tree, _has_class("ui-pdp-seller__link-trigger"))
+    if seller is None:
+        seller = _first(tree, _has_class("ui-seller-data-header__title"))
+    detail["vendedor"] = _text(seller) or None
+
+    # Subtítulo: "Nuevo  |  +1000 vendidos"
+    subtitle = _text(_first(tree, _has_class("ui-pdp-subtitle")))
+    if subtitle:
+        detail["condicion"] = subtitle.split("|")[0].strip() or None
+        match = SOLD_PATTERN.search(subtitle)
+        if match:
+            sold = _number(match.group(1))
+            detail["vendidos"] = sold * 1000 if match.group(2) else sold
+
+    detail["precio_normalizado"] = normalize_price(detail["precio"]) if detail["precio"] else None
+    return detail
+
+def fetch_detail(fetcher, limiter, url):
+    """Descarga y procesa una página de artículo. Los errores quedan en el campo "error" """
+    limiter.acquire(url)
+    start = time.perf_counter()
+    try:
+        status, html = fetcher.fetch(url)
+    except Exception as e:
+        return {"url": url, "error": f"Error de descarga: {str(e)[:100]}"}
+
+    if status != 200 or not html:
+        return {"url": url, "error": f"Estado HTTP {status}"}
+    if any(marker in html.lower() for marker in JS_REQUIRED_MARKERS):
+        return {"url": url, "error": "Página de verificación"}
+
+    try:
+        detail = parse_detail_html(html)
+    except Exception as e:
+        return {"url": url, "error": f"Error al procesar: {str(e)[:100]}"}
+    detail["url"] = url
+    detail["ms"] = round((time.perf_counter() - start) * 1000, 1)
+    return detail
+
+def crawl_details(products, max_workers=8, rate_per_host=2.0, fetcher=None, log=print, limiter=None):
+    """Descarga el detalle de cada publicación distinta. Devuelve {item_id: detalle}
+    - limiter: HostRateLimiter compartido (por ejemplo entre los workers de un lote); si no, uno propio
+    """
+    urls = {}
+    for product in products:
+        item_id = item_id_from_url(product.get("url"))
+        if item_id and item_id not in urls:
+            urls[item_id] = canonical_url(product["url"])
+
+    if not urls:
+        return {}
+
+    limiter = limiter or HostRateLimiter(rate=rate_per_host, burst=max(1, int(rate_per_host)))
+    own_fetcher = fetcher is None
+    fetcher = fetcher or HttpFetcher(pool_size=max_workers)
+    start = time.perf_counter()
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = executor.map(lambda url: fetch_detail(fetcher, limiter, url), urls.values())
+            details = dict(zip(urls.keys(), results))
+    finally:
+        if own_fetcher:
+            fetcher.close()
+
+    errors = sum(1 for detail in details.values() if "error" in detail)
+    log(f"Detalle de {len(details)} publicaciones en {time.perf_counter() - start:.1f} s "
+        f"({max_workers} en paralelo, {limiter.rates.get(ITEM_HOST, limiter.rate)} por segundo por host), {errors} con error")
+    return details
+
+def merge_details(products, details):
+    """Agrega el detalle a cada registro con el mismo ID. Devuelve cuántos se completaron"""
+    merged = 0
+    for product in products:
+        item_id = item_id_from_url(product.get("url"))
+        if item_id in details:
+            product["item_id"] = item_id
+            product["detalle"] = details[item_id]
+            merged += "error" not in details[item_id]
+    return merged
+
+# Ejecutar: python detail_crawler.py output-chrome/productos_chrome_iphone_20250101_120000.json
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Agrega el detalle de cada producto a un archivo de resultados")
+    parser.add_argument("archivos", nargs="+", help="Archivos .json o .jsonl de productos")
+    parser.add_argument("--concurrencia", type=int, default=8)
+    parser.add_argument("--por-segundo", type=float, default=2.0, help="Peticiones por segundo por host")
+    args = parser.parse_args()
+
+    for path in args.archivos:
+        if path.endswith(".jsonl"):
+            products = read_products(path)
+        else:
+            with open(path, 'r', encoding='utf-8') as f:
+                products = json.load(f)
+
+        details = crawl_details(products, args.concurrencia, args.por_segundo)
+        merged = merge_details(products, details)
+
+        output_path = os.path.splitext(path)[0] + "_detalle.json"
+        with open(output_path, 'w', encoding='utf-8') as f:
+            json.dump(products, f, ensure_ascii=False, indent=4)
+        print(f"{path}: {merged}/{len(products)} productos con detalle -> {output_path}", file=sys.stderr)
@@ -0,0 +1,172 @@
+# -*- coding: utf-8 -*-
+"""
+Diagnóstico activado por fallos en lugar de datos de depuración en cada producto
+- html_debug (outerHTML y clase de la tarjeta), el análisis de formatos de precio y el HTML
+  de la página solo se capturan cuando un campo no salió con el método esperado para
+  esa vista o quedó "No disponible"
+- Método esperado por vista (grid/list): el aprendido por StrategyCache o, sin datos, el
+  que más veces dio el campo en las tarjetas de esta ejecución
+- Las tarjetas y páginas sanas se capturan con una tasa de muestreo (0 por defecto)
+- Cada captura es una sola llamada a WebDriver
+"""
+import json
+import os
+import random
+import threading
+from collections import Counter
+
+FIELDS = ("titulo", "precio", "url")
+
+# outerHTML recortado y clase de la tarjeta en un solo viaje
+CARD_DEBUG_SCRIPT = "return [arguments[0].outerHTML.substring(0, 1000), arguments[0].getAttribute('class')];"
+
+# Los primeros 3 precios de la página con sus componentes internos
+PRICE_FORMATS_SCRIPT = r"""
+var prices = document.querySelectorAll('span[class*="price-tag-amount"]');
+var samples = [];
+for (var i = 0; i < prices.length && i < 3; i++) {
+    var parts = prices[i].querySelectorAll('span');
+    samples.push({
+        texto: (prices[i].innerText || '').trim(),
+        componentes: Array.prototype.map.call(parts, function (p) { return (p.innerText || '').trim(); })
+    });
+}
+return {total: prices.length, muestras: samples};
+"""
+
+def failed_fields(product_data, expected=None):
+    """Campos "No disponible" o que no salieron con el método esperado ({campo: método})"""
+    methods = product_data.get("metodo_extraccion", {})
+    expected = expected or {}
+    return [field for field in FIELDS
+            if product_data.get(field, "No disponible") == "No disponible"
+            or methods.get(field, "ninguno") == "ninguno"
+            or (expected.get(field) and methods.get(field) != expected[field])]
+
+def card_layout(product_data):
+    """Vista de la tarjeta según la clase de html_debug ("grid", "list" o "unknown")"""
+    css_class = (product_data.get("html_debug") or {}).get("class") or ""
+    if "ui-search-layout__item" in css_class:
+        return "grid"
+    if "ui-search-result" in css_class:
+        return "list"
+    return "unknown"
+
+def capture_card(driver, item):
+    """html_debug de la tarjeta"""
+    try:
+        outer_html, css_class = driver.execute_script(CARD_DEBUG_SCRIPT, item)
+        return {"outer_html": outer_html, "class": css_class}
+    except Exception:
+        return {"error": "No se pudo capturar HTML"}
+
+def price_formats(driver):
+    """Muestra de los formatos de precio presentes en la página"""
+    try:
+        return driver.execute_script(PRICE_FORMATS_SCRIPT)
+    except Exception as e:
+        return {"error": str(e)[:200]}
+
+class DiagnosticsPolicy:
+    """Decide qué tarjetas y páginas se capturan para diagnóstico
+    - sample_rate: fracción de tarjetas y páginas sanas que también se capturan (1.0 = todas)
+    - strategies: StrategyCache con el método que más acierta por vista; sin él (o sin datos
+      para la vista) se espera el método más frecuente de las tarjetas ya vistas
+    """
+
+    def __init__(self, sample_rate=0.0, seed=None, strategies=None):
+        self.sample_rate = max(0.0, min(1.0, sample_rate))
+        self.strategies = strategies
+        self.observed = {}
+        self.cards = 0
+        self.pages = 0
+        self.sampled = 0
+        self.saved = []
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def _decide(self, failed):
+        with self._lock:
+            if failed:
+                return True
+            if self.sample_rate and self._random.random() < self.sample_rate:
+                self.sampled += 1
+                return True
+            return False
+
+    def observe(self, product_data, layout=None):
+        """Cuenta los métodos con que salió cada campo de una tarjeta"""
+        layout = layout or card_layout(product_data)
+        methods = product_data.get("metodo_extraccion", {})
+        with self._lock:
+            counts = self.observed.setdefault(layout, {field: Counter() for field in FIELDS})
+            for field in FIELDS:
+                if methods.get(field, "ninguno") != "ninguno":
+                    counts[field][methods[field]] += 1
+
+    def expected_methods(self, layout):
+        """{campo: método esperado} para una vista"""
+        expected = {}
+        with self._lock:
+            counts = self.observed.get(layout, {})
+            for field in FIELDS:
+                learned = self.strategies.expected_method(layout, field) if self.strategies is not None else None
+                most_common = counts[field].most_common(1) if field in counts else []
+                expected[field] = learned or (most_common[0][0] if most_common else None)
+        return expected
+
+    def failed_fields(self, product_data, layout=None):
+        return failed_fields(product_data, self.expected_methods(layout or card_layout(product_data)))
+
+    def wants_card(self, product_data, layout=None):
+        """Registra los métodos de la tarjeta y decide si se captura"""
+        layout = layout or card_layout(product_data)
+        self.observe(product_data, layout)
+        wanted = self._decide(bool(self.failed_fields(product_data, layout)))
+        if wanted:
+            with self._lock:
+                self.cards += 1
+        return wanted
+
+    def prune(self, products, layout=None):
+        """Quita html_debug de las tarjetas sanas fuera del muestreo (motores que ya lo traen sin viajes extra)"""
+        for product_data in products:
+            if not self.wants_card(product_data, layout):
+                product_data.pop("html_debug", None)
+        return products
+
+    def wants_page(self, products, layout=None):
+        """Sin productos o con alguna tarjeta con fallos siempre se captura"""
+        return self._decide(not products or any(self.failed_fields(p, layout) for p in products))
+
+    def save_page(self, prefix, page, html, info=None):
+        """Escribe <prefix>_pagina<N>.html y, si hay info, un .json con el motivo y el análisis de precios"""
+        path = f"{prefix}_pagina{page}.html"
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(html)
+        if info is not None:
+            with open(os.path.splitext(path)[0] + ".json", 'w', encoding='utf-8') as f:
+                json.dump(info, f, ensure_ascii=False, indent=4)
+        with self._lock:
+            self.pages += 1
+            self.saved.append(path)
+        return path
+
+    def log_summary(self, log):
+        if not (self.cards or self.pages):
+            return
+        log(f"Diagnóstico: {self.cards} tarjetas y {self.pages} páginas capturadas "
+            f"({self.sampled} por muestreo)")
+        for path in self.saved:
+            log(f"  - {path}")
+
+def page_report(products, url=None, policy=None, layout=None):
+    """Motivo de la captura de una página: posición y campos con fallos de cada tarjeta
+    - policy: DiagnosticsPolicy con los métodos esperados; sin ella solo cuentan los "No disponible"
+    """
+    failed = [(p, policy.failed_fields(p, layout) if policy is not None else failed_fields(p)) for p in products]
+    return {
+        "url": url,
+        "productos": len(products),
+        "tarjetas_con_fallos": [{"posicion": p.get("posicion"), "campos": fields} for p, fields in failed if fields],
+    }
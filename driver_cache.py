@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+"""
+Caché local de la ruta de chromedriver por versión de Chrome instalada
+- Evita la resolución de versión de ChromeDriverManager().install() en cada ejecución
+- Solo se vuelve a resolver cuando cambia la versión de Chrome o falta el binario
+"""
+import json
+import os
+import re
+import shutil
+import subprocess
+import time
+
+CHROME_CANDIDATES = (
+    "google-chrome",
+    "google-chrome-stable",
+    "chromium",
+    "chromium-browser",
+    "chrome",
+    "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome",
+    r"C:\Program Files\Google\Chrome\Application\chrome.exe",
+    r"C:\Program Files (x86)\Google\Chrome\Application\chrome.exe",
+)
+
+CACHE_PATH = os.path.join(os.path.expanduser("~"), ".cache", "web-scraping", "chromedriver.json")
+
+VERSION_PATTERN = re.compile(r"(\d+\.\d+\.\d+\.\d+)")
+
+def find_chrome_binary():
+    """Ruta del ejecutable de Chrome (CHROME_PATH tiene prioridad)"""
+    if os.environ.get("CHROME_PATH"):
+        return os.environ["CHROME_PATH"]
+    for candidate in CHROME_CANDIDATES:
+        path = shutil.which(candidate) or (candidate if os.path.isfile(candidate) else None)
+        if path:
+            return path
+    raise FileNotFoundError("No se encontró Chrome. Define la variable CHROME_PATH")
+
+def detect_chrome_version():
+    """Versión de Chrome instalada (por ejemplo '131.0.6778.85') o None si no se puede leer"""
+    try:
+        output = subprocess.run([find_chrome_binary(), "--version"], capture_output=True,
+                                text=True, timeout=10).stdout
+    except (OSError, subprocess.SubprocessError):
+        return None
+    match = VERSION_PATTERN.search(output)
+    return match.group(1) if match else None
+
+def _load_cache():
+    try:
+        with open(CACHE_PATH, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def _save_cache(cache):
+    try:
+        os.makedirs(os.path.dirname(CACHE_PATH), exist_ok=True)
+        with open(CACHE_PATH, 'w', encoding='utf-8') as f:
+            json.dump(cache, f, indent=4)
+    except OSError:
+        pass
+
+def resolve_chromedriver_path():
+    """Devuelve (ruta de chromedriver, origen) usando la caché cuando la versión coincide"""
+    version = detect_chrome_version()
+    cache = _load_cache()
+
+    cached_path = cache.get(version) if version else None
+    if cached_path and os.path.isfile(cached_path):
+        return cached_path, "caché"
+
+    from webdriver_manager.chrome import ChromeDriverManager
+    path = ChromeDriverManager().install()
+
+    # Sin versión detectada no se guarda: la entrada podría quedar obsoleta
+    if version:
+        cache[version] = path
+        _save_cache(cache)
+    return path, "webdriver-manager"
+
+def timed_resolve_chromedriver_path():
+    """Igual que resolve_chromedriver_path, midiendo el tiempo de resolución"""
+    start = time.perf_counter()
+    path, source = resolve_chromedriver_path()
+    return path, source, time.perf_counter() - start
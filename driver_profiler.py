@@ -0,0 +1,186 @@
+# -*- coding: utf-8 -*-
+"""
+Perfil de viajes a WebDriver (opcional)
+- Envuelve driver.execute: cada comando remoto, también los de los WebElements,
+  se cuenta y se mide por tipo (find_element, get_attribute, text, execute_script...)
+- Cada comando se atribuye al sitio de llamada vigente (por ejemplo "precio intento 3
+  (javascript_precio_mx)" o "html_debug") y a la tarjeta y página en curso
+- Al final muestra el desglose por sitio, por tipo, por tarjeta y por página
+"""
+import json
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+
+# Comandos del protocolo de WebDriver agrupados con el nombre del método de Selenium
+COMMAND_TYPES = {
+    "findElement": "find_element",
+    "findChildElement": "find_element",
+    "findElements": "find_elements",
+    "findChildElements": "find_elements",
+    "getElementText": "text",
+    "getElementAttribute": "get_attribute",
+    "getElementProperty": "get_property",
+    "w3cExecuteScript": "execute_script",
+    "w3cExecuteScriptAsync": "execute_script",
+    "elementScreenshot": "screenshot",
+    "screenshot": "screenshot",
+    "get": "get",
+    "getPageSource": "page_source",
+    "clickElement": "click",
+}
+
+DEFAULT_SITE = "otros"
+
+def command_type(driver_command, params):
+    """Nombre legible del comando. get_attribute e is_displayed viajan como scripts con un comentario"""
+    if driver_command.startswith("w3cExecuteScript") and params:
+        script = params.get("script", "")
+        if script.startswith("/* getAttribute */"):
+            return "get_attribute"
+        if script.startswith("/* isDisplayed */"):
+            return "is_displayed"
+    return COMMAND_TYPES.get(driver_command, driver_command)
+
+class DriverProfiler:
+    """Cuenta y mide los comandos remotos de un driver por tipo, sitio, tarjeta y página"""
+
+    def __init__(self):
+        self.by_site = {}      # (sitio, tipo) -> [comandos, segundos]
+        self.by_card = {}      # (página, tarjeta) -> {sitio: [comandos, segundos]}
+        self.by_page = {}      # página -> [comandos, segundos]
+        self.page = 0
+        self._wrapped = {}
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def attach(self, driver):
+        """Instala el perfil en el driver (driver.profiler) y devuelve el driver"""
+        original = driver.execute
+
+        def execute(driver_command, params=None):
+            start = time.perf_counter()
+            try:
+                return original(driver_command, params)
+            finally:
+                self._record(command_type(driver_command, params), time.perf_counter() - start)
+
+        driver.execute = execute
+        driver.profiler = self
+        return driver
+
+    def _record(self, kind, seconds):
+        site = getattr(self._local, "site", None) or DEFAULT_SITE
+        card = getattr(self._local, "card", None)
+        with self._lock:
+            totals = self.by_site.setdefault((site, kind), [0, 0.0])
+            totals[0] += 1
+            totals[1] += seconds
+            page_totals = self.by_page.setdefault(self.page, [0, 0.0])
+            page_totals[0] += 1
+            page_totals[1] += seconds
+            if card is not None:
+                card_totals = self.by_card.setdefault((self.page, card), {}).setdefault(site, [0, 0.0])
+                card_totals[0] += 1
+                card_totals[1] += seconds
+
+    def new_page(self):
+        with self._lock:
+            self.page += 1
+
+    @contextmanager
+    def site(self, name):
+        previous = getattr(self._local, "site", None)
+        self._local.site = name
+        try:
+            yield
+        finally:
+            self._local.site = previous
+
+    @contextmanager
+    def card(self, idx):
+        self._local.card = idx + 1
+        try:
+            yield
+        finally:
+            self._local.card = None
+
+    def wrap_strategies(self, field, strategies):
+        """Misma lista de (nombre, función) con cada intento atribuido a su sitio"""
+        if field in self._wrapped:
+            return self._wrapped[field]
+
+        def wrap(site, func):
+            def profiled(*args):
+                with self.site(site):
+                    return func(*args)
+            return profiled
+        self._wrapped[field] = [(name, wrap(f"{field} intento {number} ({name})", func))
+                                for number, (name, func) in enumerate(strategies, 1)]
+        return self._wrapped[field]
+
+    def summary(self):
+        with self._lock:
+            by_site = {f"{site} | {kind}": {"comandos": n, "ms": round(s * 1000, 2)}
+                       for (site, kind), (n, s) in sorted(self.by_site.items(), key=lambda item: -item[1][1])}
+            by_kind = {}
+            for (_, kind), (n, s) in self.by_site.items():
+                totals = by_kind.setdefault(kind, [0, 0.0])
+                totals[0] += n
+                totals[1] += s
+            by_card = {f"{page}.{card}": {site: {"comandos": n, "ms": round(s * 1000, 2)} for site, (n, s) in sites.items()}
+                       for (page, card), sites in sorted(self.by_card.items())}
+            by_page = {str(page): {"comandos": n, "ms": round(s * 1000, 2)} for page, (n, s) in sorted(self.by_page.items())}
+        return {
+            "por_sitio": by_site,
+            "por_tipo": {kind: {"comandos": n, "ms": round(s * 1000, 2)}
+                         for kind, (n, s) in sorted(by_kind.items(), key=lambda item: -item[1][1])},
+            "por_tarjeta": by_card,
+            "por_pagina": by_page,
+        }
+
+    def save(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.summary(), f, ensure_ascii=False, indent=4)
+
+    def log_summary(self, log):
+        summary = self.summary()
+        if not summary["por_pagina"]:
+            return
+        cards = max(1, len(summary["por_tarjeta"]))
+
+        log("Comandos WebDriver por sitio de llamada:")
+        for site, stats in summary["por_sitio"].items():
+            log(f"  - {site}: {stats['comandos']} comandos, {stats['ms']:.1f} ms "
+                f"({stats['comandos'] / cards:.1f} por tarjeta)")
+
+        log("Comandos WebDriver por tipo: " + ", ".join(
+            f"{kind} {stats['comandos']} ({stats['ms']:.0f} ms)" for kind, stats in summary["por_tipo"].items()))
+
+        for card, sites in summary["por_tarjeta"].items():
+            total = sum(stats["comandos"] for stats in sites.values())
+            total_ms = sum(stats["ms"] for stats in sites.values())
+            fields = {}
+            for site, stats in sites.items():
+                field = site.split(" ")[0]
+                fields[field] = fields.get(field, 0) + stats["comandos"]
+            page, number = card.split(".")
+            log(f"  Página {page}, tarjeta {number}: {total} comandos, {total_ms:.1f} ms | "
+                + ", ".join(f"{field} {count}" for field, count in fields.items()))
+
+        for page, stats in summary["por_pagina"].items():
+            log(f"  Página {page}: {stats['comandos']} comandos, {stats['ms']:.1f} ms")
+
+def profile_site(driver, name):
+    """Atribuye los comandos del bloque al sitio indicado si el driver tiene perfil"""
+    profiler = getattr(driver, "profiler", None)
+    return profiler.site(name) if profiler is not None else nullcontext()
+
+def profile_card(driver, idx):
+    profiler = getattr(driver, "profiler", None)
+    return profiler.card(idx) if profiler is not None else nullcontext()
+
+def profile_new_page(driver):
+    profiler = getattr(driver, "profiler", None)
+    if profiler is not None:
+        profiler.new_page()
@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+"""
+Descarga de listados por HTTP sin navegador
+- Cliente requests.Session con pool de conexiones keep-alive
+- Mismo user agent que la configuración de Chrome
+- Detecta páginas que requieren renderizado JavaScript para usar el navegador como respaldo
+"""
+import threading
+import time
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/118.0.0.0 Safari/537.36"
+
+# Hosts del listado y de las páginas de artículo (cada uno con su propio límite de peticiones)
+LISTING_HOST = "listado.mercadolibre.com.mx"
+ITEM_HOST = "articulo.mercadolibre.com.mx"
+
+# Marcadores de que el HTML ya trae las tarjetas renderizadas en el servidor
+LISTING_MARKERS = ("ui-search-layout__item", "ui-search-result")
+
+# Marcadores de páginas de verificación o que dependen de JavaScript
+JS_REQUIRED_MARKERS = ("captcha", "account-verification", "enable javascript", "habilita javascript")
+
+class HttpFetcher:
+    """Cliente HTTP reutilizable con conexiones persistentes"""
+
+    def __init__(self, pool_size=10, timeout=15, retries=2, user_agent=USER_AGENT):
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.session.headers.update({
+            "User-Agent": user_agent,
+            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+            "Accept-Language": "es-MX,es;q=0.9",
+            "Connection": "keep-alive",
+        })
+
+        retry = Retry(total=retries, backoff_factor=0.5, status_forcelist=(500, 502, 503, 504),
+                      allowed_methods=("GET", "HEAD"))
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def fetch(self, url, headers=None):
+        """Descarga una URL y devuelve (status, html)"""
+        status, html, _ = self.fetch_with_headers(url, headers)
+        return status, html
+
+    def fetch_with_headers(self, url, headers=None):
+        """Como fetch, pero también devuelve las cabeceras de la respuesta (ETag, Last-Modified...)"""
+        response = self.session.get(url, headers=headers, timeout=self.timeout)
+        if not response.encoding or response.encoding.lower() == "iso-8859-1":
+            response.encoding = "utf-8"
+        return response.status_code, response.text, response.headers
+
+    def close(self):
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+class HostRateLimiter:
+    """Token bucket por host: como máximo `rate` peticiones por segundo, con ráfagas de `burst`
+    - rates: {host: peticiones por segundo} para hosts con un límite distinto
+    """
+
+    def __init__(self, rate=2.0, burst=1, rates=None):
+        # Con ráfaga < 1 nunca hay turno y con límite 0 la espera es infinita
+        if burst < 1:
+            raise ValueError(f"La ráfaga debe ser al menos 1: {burst}")
+        for host, host_rate in [(None, rate)] + list((rates or {}).items()):
+            if not host_rate or host_rate <= 0:
+                raise ValueError(f"Peticiones por segundo no válidas{f' para {host}' if host else ''}: {host_rate}")
+        self.rate = rate
+        self.burst = burst
+        self.rates = dict(rates or {})
+        self.stats = {}        # host -> [peticiones, segundos de espera]
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, url):
+        """Bloquea hasta que el host de la URL tenga un turno disponible"""
+        host = urlsplit(url).netloc.lower()
+        waited = 0.0
+        while True:
+            with self._lock:
+                rate = self.rates.get(host, self.rate)
+                now = time.monotonic()
+                tokens, last = self._buckets.get(host, (self.burst, now))
+                tokens = min(self.burst, tokens + (now - last) * rate)
+                if tokens >= 1:
+                    self._buckets[host] = (tokens - 1, now)
+                    stats = self.stats.setdefault(host, [0, 0.0])
+                    stats[0] += 1
+                    stats[1] += waited
+                    return
+                self._buckets[host] = (tokens, now)
+                wait = (1 - tokens) / rate
+            time.sleep(wait)
+            waited += wait
+
+    def summary(self):
+        """{host: {"peticiones", "espera_s", "limite"}}"""
+        with self._lock:
+            return {host: {"peticiones": n, "espera_s": round(waited, 2), "limite": self.rates.get(host, self.rate)}
+                    for host, (n, waited) in sorted(self.stats.items())}
+
+def needs_js_rendering(status, html):
+    """Indica si la respuesta no sirve para el parser offline y hay que usar el navegador"""
+    if status != 200 or not html:
+        return True
+
+    if not any(marker in html for marker in LISTING_MARKERS):
+        return True
+
+    # Tarjetas presentes, pero dentro de una página de verificación
+    lowered = html.lower()
+    return any(marker in lowered for marker in JS_REQUIRED_MARKERS)
@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+"""
+Identificadores de publicación de Mercado Libre México (MLM...)
+- Extrae el ID de la URL de artículo, de los parámetros de catálogo (wid, pdp_filters,
+  en la query o en el fragmento) o de la URL destino de los enlaces patrocinados (click tracking)
+- URL canónica sin parámetros de seguimiento
+- Índice persistente de IDs ya vistos (SQLite con hashes de 64 bits) para descartar
+  repetidos entre páginas y entre ejecuciones antes de extraerlos
+"""
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+from urllib.parse import parse_qs, unquote, urlsplit
+
+ITEM_ID_PATTERN = re.compile(r'\b(MLM)-?(\d{6,})', re.IGNORECASE)
+
+SEEN_INDEX_FILENAME = "publicaciones_vistas.sqlite"
+
+def item_id_from_url(url, _depth=0):
+    """ID normalizado ('MLM1234567890') o None si la URL no identifica una publicación"""
+    if not url or url == "No disponible":
+        return None
+
+    parts = urlsplit(url)
+    query = parse_qs(parts.query)
+
+    # Enlaces patrocinados: la URL real viaja codificada en un parámetro
+    if _depth < 2:
+        for key in ("url", "go"):
+            for target in query.get(key, []):
+                item_id = item_id_from_url(unquote(target), _depth + 1)
+                if item_id:
+                    return item_id
+
+    # Páginas de catálogo (/p/MLM...): el ID de la publicación va en wid o en pdp_filters,
+    # en la query o en el fragmento (las poly-cards del listado usan "#polycard_client=...&wid=MLM...")
+    fragment = parse_qs(parts.fragment)
+    for value in (query.get("wid", []) + query.get("pdp_filters", [])
+                  + fragment.get("wid", []) + fragment.get("pdp_filters", [])):
+        match = ITEM_ID_PATTERN.search(value)
+        if match:
+            return (match.group(1) + match.group(2)).upper()
+
+    if "/p/" in parts.path:
+        return None
+
+    match = ITEM_ID_PATTERN.search(parts.path)
+    if match:
+        return (match.group(1) + match.group(2)).upper()
+    return None
+
+def canonical_url(url):
+    """URL sin parámetros de seguimiento: la del artículo si hay ID, o la misma sin query ni fragmento"""
+    item_id = item_id_from_url(url)
+    if item_id:
+        return f"https://articulo.mercadolibre.com.mx/MLM-{item_id[3:]}"
+    if not url or url == "No disponible":
+        return url
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}{parts.path}"
+
+class SeenIndex:
+    """Conjunto persistente de publicaciones ya extraídas
+    - Guarda un hash de 64 bits por ID (8 bytes por publicación más el índice de SQLite)
+    - scope separa conjuntos independientes en el mismo archivo (por ejemplo, por término)
+    """
+
+    def __init__(self, path, scope=""):
+        self.path = path
+        self.scope = scope
+        self.skipped = 0
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("CREATE TABLE IF NOT EXISTS seen (hash INTEGER PRIMARY KEY, first_seen REAL NOT NULL)")
+        self._db.commit()
+
+    def _hash(self, item_id):
+        digest = hashlib.blake2b(f"{self.scope}:{item_id}".encode("utf-8"), digest_size=8).digest()
+        return int.from_bytes(digest, "big", signed=True)
+
+    def seen_many(self, item_ids):
+        """Subconjunto de item_ids que ya está en el índice"""
+        hashes = {self._hash(item_id): item_id for item_id in item_ids if item_id}
+        found = set()
+        keys = list(hashes)
+        with self._lock:
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                rows = self._db.execute(
+                    f"SELECT hash FROM seen WHERE hash IN ({','.join('?' * len(chunk))})", chunk).fetchall()
+                found.update(hashes[row[0]] for row in rows)
+        return found
+
+    def __contains__(self, item_id):
+        return bool(self.seen_many([item_id]))
+
+    def add_many(self, item_ids):
+        now = time.time()
+        with self._lock:
+            self._db.executemany("INSERT OR IGNORE INTO seen VALUES (?, ?)",
+                                 [(self._hash(item_id), now) for item_id in item_ids if item_id])
+            self._db.commit()
+
+    def filter_new(self, item_ids):
+        """Máscara de posiciones a extraer: False para IDs ya vistos o repetidos en la misma lista"""
+        seen = self.seen_many(item_ids)
+        keep = []
+        for item_id in item_ids:
+            if item_id and item_id in seen:
+                keep.append(False)
+                continue
+            keep.append(True)
+            if item_id:
+                seen.add(item_id)
+        self.skipped += keep.count(False)
+        return keep
+
+    def filter_products(self, products):
+        """Agrega item_id a cada registro y devuelve solo los no vistos (sin marcarlos)"""
+        for product in products:
+            product["item_id"] = item_id_from_url(product.get("url"))
+        keep = self.filter_new([product["item_id"] for product in products])
+        return [product for product, new in zip(products, keep) if new]
+
+    def add_products(self, products):
+        self.add_many(product.get("item_id") or item_id_from_url(product.get("url")) for product in products)
+
+    def close(self):
+        with self._lock:
+            self._db.close()
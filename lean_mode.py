@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+"""
+Modo "lean": bloqueo de recursos que no se usan para extraer título, precio y URL
+- Imágenes por preferencia de Chrome; media y fuentes con Network.setBlockedURLs
+- Dominios de terceros bloqueados con --host-resolver-rules (lista de permitidos configurable)
+- Peso de cada página medido con el log de rendimiento de Chrome y comparado contra
+  una línea base de ejecuciones sin bloqueo para estimar los bytes ahorrados
+"""
+import json
+import os
+
+IMAGE_PATTERNS = ["*.jpg", "*.jpeg", "*.png", "*.gif", "*.webp", "*.avif", "*.svg", "*.ico"]
+MEDIA_PATTERNS = ["*.mp4", "*.webm", "*.m3u8", "*.mp3", "*.ogg"]
+FONT_PATTERNS = ["*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot"]
+
+# Dominios propios que siempre deben resolverse
+FIRST_PARTY_DOMAINS = [
+    "mercadolibre.com.mx",
+    "mercadolibre.com",
+    "mlstatic.com",
+    "mercadopago.com",
+    "mercadolivre.com",
+]
+
+BASELINE_FILENAME = "peso_pagina_base.json"
+
+class LeanProfile:
+    """Configuración de bloqueo de recursos para Chrome"""
+
+    def __init__(self, block_images=True, block_media=True, block_fonts=True, block_third_party=True,
+                 allow_domains=None, deny_patterns=None):
+        self.block_images = block_images
+        self.block_media = block_media
+        self.block_fonts = block_fonts
+        self.block_third_party = block_third_party
+        self.allow_domains = list(allow_domains or [])
+        self.deny_patterns = list(deny_patterns or [])
+
+    def blocked_patterns(self):
+        patterns = list(self.deny_patterns)
+        if self.block_images:
+            patterns += IMAGE_PATTERNS
+        if self.block_media:
+            patterns += MEDIA_PATTERNS
+        if self.block_fonts:
+            patterns += FONT_PATTERNS
+        return patterns
+
+    def host_resolver_rules(self):
+        """Regla que hace fallar la resolución DNS de todo dominio no permitido"""
+        rules = ["MAP * ~NOTFOUND"]
+        for domain in FIRST_PARTY_DOMAINS + self.allow_domains:
+            rules.append(f"EXCLUDE {domain}")
+            rules.append(f"EXCLUDE *.{domain}")
+        return ", ".join(rules)
+
+    def apply_options(self, chrome_options):
+        """Ajustes que deben aplicarse antes de iniciar Chrome"""
+        if self.block_images:
+            chrome_options.add_experimental_option("prefs", {
+                "profile.managed_default_content_settings.images": 2,
+            })
+        if self.block_third_party:
+            chrome_options.add_argument(f"--host-resolver-rules={self.host_resolver_rules()}")
+
+    def apply(self, driver):
+        """Ajustes que se aplican por CDP con el navegador ya iniciado"""
+        patterns = self.blocked_patterns()
+        if patterns:
+            driver.execute_cdp_cmd("Network.enable", {})
+            driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+
+def enable_performance_log(chrome_options):
+    """Activa el log de rendimiento de Chrome, necesario para medir el peso de cada página"""
+    chrome_options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+
+def read_page_weight(driver):
+    """Bytes transferidos y peticiones bloqueadas desde la última lectura del log de rendimiento"""
+    types = {}
+    sizes = {}
+    weight = {"bytes": 0, "peticiones": 0, "bloqueadas": 0, "por_tipo": {}}
+
+    for entry in driver.get_log("performance"):
+        message = json.loads(entry["message"])["message"]
+        method = message.get("method")
+        params = message.get("params", {})
+
+        if method == "Network.requestWillBeSent":
+            types[params["requestId"]] = params.get("type", "Other")
+            weight["peticiones"] += 1
+        elif method == "Network.loadingFinished":
+            sizes[params["requestId"]] = params.get("encodedDataLength", 0)
+        elif method == "Network.loadingFailed":
+            if params.get("blockedReason") or "NAME_NOT_RESOLVED" in params.get("errorText", ""):
+                weight["bloqueadas"] += 1
+
+    for request_id, size in sizes.items():
+        resource_type = types.get(request_id, "Other")
+        weight["por_tipo"][resource_type] = weight["por_tipo"].get(resource_type, 0) + size
+        weight["bytes"] += size
+
+    return weight
+
+class PageWeightMonitor:
+    """Acumula el peso por página y lo compara con la línea base sin bloqueo"""
+
+    def __init__(self, output_dir, lean=False):
+        self.lean = lean
+        self.baseline_path = os.path.join(output_dir, BASELINE_FILENAME)
+        self.pages = []
+        self.baseline = self._load_baseline()
+
+    def _load_baseline(self):
+        try:
+            with open(self.baseline_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def measure(self, driver, url, log):
+        try:
+            weight = read_page_weight(driver)
+        except Exception as e:
+            log(f"No se pudo medir el peso de la página: {e}")
+            return None
+
+        self.pages.append(weight)
+        message = (f"Peso de la página: {weight['bytes'] / 1024:.1f} KB en {weight['peticiones']} peticiones, "
+                   f"{weight['bloqueadas']} bloqueadas")
+        if self.lean and self.baseline and self.baseline["bytes_promedio"]:
+            saved = self.baseline["bytes_promedio"] - weight["bytes"]
+            message += f", ahorro estimado {saved / 1024:.1f} KB"
+        log(f"{message} ({url})")
+        return weight
+
+    def log_summary(self, log):
+        if not self.pages:
+            return
+
+        total = sum(page["bytes"] for page in self.pages)
+        average = total / len(self.pages)
+        log(f"Peso total: {total / 1024:.1f} KB en {len(self.pages)} páginas ({average / 1024:.1f} KB por página)")
+
+        if not self.lean:
+            self._update_baseline(average)
+        elif self.baseline and self.baseline["bytes_promedio"]:
+            saved = self.baseline["bytes_promedio"] - average
+            log(f"Ahorro estimado por página: {saved / 1024:.1f} KB "
+                f"({saved / self.baseline['bytes_promedio'] * 100:.1f}% frente a la línea base)")
+        else:
+            log("Sin línea base para estimar el ahorro. Ejecuta una vez sin modo lean")
+
+    def _update_baseline(self, average):
+        """La línea base es el promedio acumulado de las páginas cargadas sin bloqueo"""
+        previous = self.baseline or {"bytes_promedio": 0, "paginas": 0}
+        pages = previous["paginas"] + len(self.pages)
+        bytes_average = (previous["bytes_promedio"] * previous["paginas"] + average * len(self.pages)) / pages
+        try:
+            with open(self.baseline_path, 'w', encoding='utf-8') as f:
+                json.dump({"bytes_promedio": bytes_average, "paginas": pages}, f, indent=4)
+        except OSError:
+            pass
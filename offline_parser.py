@@ -0,0 +1,236 @@
+# -*- coding: utf-8 -*-
+"""
+Parser offline del listado de Mercado Libre a partir de page_source
+- Reproduce la cascada de extracción (título, precio, URL) sin navegador
+- Usa los mismos selectores XPath que los scripts de Selenium
+- Permite procesar páginas guardadas en paralelo y en pruebas
+"""
+import json
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from urllib.parse import urljoin
+
+import lxml.html
+
+LISTING_BASE_URL = "https://listado.mercadolibre.com.mx/"
+
+CONTAINER_SELECTORS = [
+    '//section[@class="ui-search-results"]',
+    '//div[@class="ui-search-results"]',
+    '//ol[@class="ui-search-layout"]'
+]
+
+# Patrones del intento regex, compilados una sola vez
+PRICE_PATTERNS = [
+    re.compile(r'\$\s?[\d,]+\.?\d*'),  # $1,234.56 o $1,234
+    re.compile(r'\$\s?[\d.]+,?\d*'),   # $1.234,56 o $1.234
+    re.compile(r'\$\s?\d+'),           # $1234
+]
+JS_PRICE_PATTERN = re.compile(r'\$\s?[0-9,]+(?:\.\d{2})?')
+WHITESPACE = re.compile(r'\s+')
+
+def _has_class(name):
+    """XPath equivalente a un selector CSS de clase (.name)"""
+    return f'.//*[contains(concat(" ", normalize-space(@class), " "), " {name} ")]'
+
+def _text(elem):
+    """Aproximación de WebElement.text: texto sin scripts y con espacios normalizados"""
+    if elem is None:
+        return ""
+    parts = elem.xpath('.//text()[not(ancestor::script) and not(ancestor::style)]')
+    return WHITESPACE.sub(" ", "".join(parts)).strip()
+
+def _first(elem, xpath):
+    found = elem.xpath(xpath)
+    return found[0] if found else None
+
+def find_product_items(tree):
+    """Detecta contenedor principal y tipo de vista igual que los scripts de Selenium"""
+    main_container = None
+    for selector in CONTAINER_SELECTORS:
+        containers = tree.xpath(selector)
+        if containers:
+            main_container = containers[0]
+            break
+
+    if main_container is None:
+        main_container = _first(tree, '//body')
+        if main_container is None:
+            main_container = tree
+
+    grid_items = main_container.xpath('.//li[contains(@class, "ui-search-layout__item")]')
+    if grid_items:
+        return grid_items, "grid"
+
+    list_items = main_container.xpath('.//div[contains(@class, "ui-search-result")]')
+    if list_items:
+        return list_items, "list"
+
+    return main_container.xpath(
+        './/*[contains(@class, "ui-search-result") or contains(@class, "ui-search-layout__item")]'), "unknown"
+
+def extract_title(item):
+    # Intento 1: Título con clase específica
+    title_text = _text(_first(item, './/h2[contains(@class, "ui-search-item__title")]'))
+    if title_text:
+        return title_text, "xpath_title_class"
+
+    # Intento 2: Cualquier h2 dentro del elemento
+    title_text = _text(_first(item, './/h2'))
+    if title_text:
+        return title_text, "tag_h2"
+
+    # Intento 3: Elemento con atributo title
+    title_attr_elem = _first(item, './/*[@title]')
+    if title_attr_elem is not None:
+        title_text = title_attr_elem.get("title", "").strip()
+        if title_text:
+            return title_text, "attr_title"
+
+    # Intento 4: Equivalente a javascript_title
+    for xpath in ('.//h2', _has_class("ui-search-item__title"), './/*[@title]', './/a'):
+        elem = _first(item, xpath)
+        if elem is not None:
+            if elem.get("title"):
+                return elem.get("title").strip(), "javascript_title"
+            if elem.text_content():
+                return elem.text_content().strip(), "javascript_title"
+
+    return None
+
+def extract_price(item):
+    # Intento 1: Componentes separados dentro del contenedor de precio
+    price_container = _first(item, './/div[contains(@class, "ui-search-price")]')
+    if price_container is not None:
+        symbol = _first(price_container, './/span[contains(@class, "andes-money-amount__currency-symbol")]')
+        fraction = _first(price_container, './/span[contains(@class, "andes-money-amount__fraction")]')
+        if symbol is not None and fraction is not None:
+            decimals = _first(price_container, './/span[contains(@class, "andes-money-amount__cents")]')
+            if decimals is not None:
+                return f"{_text(symbol)} {_text(fraction)}.{_text(decimals)}", "componentes_separados"
+            return f"{_text(symbol)} {_text(fraction)}", "componentes_separados"
+
+    # Intento 2: Precio como texto directo
+    price_elem = _first(item, './/span[contains(@class, "price-tag-amount")]')
+    if price_elem is not None:
+        raw_price_text = _text(price_elem)
+        if '$' in raw_price_text:
+            return raw_price_text, "texto_directo"
+        symbol_elem = _first(item, './/span[contains(@class, "currency-symbol")]')
+        if symbol_elem is not None:
+            return f"{_text(symbol_elem)} {raw_price_text}", "texto_simbolo_separado"
+
+    # Intento 3: Equivalente a javascript_precio_mx
+    symbol = _first(item, _has_class("andes-money-amount__currency-symbol"))
+    fraction = _first(item, _has_class("andes-money-amount__fraction"))
+    if symbol is not None and fraction is not None:
+        price = f"{symbol.text_content().strip()} {fraction.text_content().strip()}"
+        cents = _first(item, _has_class("andes-money-amount__cents"))
+        if cents is not None:
+            price += "." + cents.text_content().strip()
+        return price.strip(), "javascript_precio_mx"
+
+    all_text = _text(item)
+    match = JS_PRICE_PATTERN.search(all_text)
+    if match:
+        return match.group(0).strip(), "javascript_precio_mx"
+    for elem in item.iterdescendants():
+        if not isinstance(elem.tag, str):
+            continue
+        text = elem.text_content().strip()
+        if '$' in text and any(c.isdigit() for c in text):
+            return text, "javascript_precio_mx"
+
+    # Intento 4: Patrones regex sobre el texto del elemento
+    for pattern in PRICE_PATTERNS:
+        match = pattern.search(all_text)
+        if match:
+            return match.group(0).strip(), "regex_pattern"
+
+    # Último recurso: cualquier elemento con "$"
+    for elem in item.xpath('.//*[contains(text(), "$")]'):
+        text = _text(elem)
+        if '$' in text and len(text) < 20:
+            return text, "contains_dollar_sign"
+
+    return None
+
+def extract_url(item, base_url=LISTING_BASE_URL):
+    link_elems = item.xpath('.//a[contains(@class, "ui-search-link")]')
+    if link_elems:
+        href = link_elems[0].get("href")
+        if href:
+            return urljoin(base_url, href), "class_link"
+    else:
+        any_links = item.xpath('.//a')
+        if any_links and any_links[0].get("href"):
+            return urljoin(base_url, any_links[0].get("href")), "tag_a"
+
+    # Equivalente a la extracción de URL con JavaScript
+    link = _first(item, './/a')
+    if link is not None and link.get("href"):
+        return urljoin(base_url, link.get("href")), "javascript"
+
+    return None
+
+def extract_product(item, position, base_url=LISTING_BASE_URL):
+    """Construye el mismo registro que el bucle de Selenium para una tarjeta"""
+    product_data = {
+        "titulo": "No disponible",
+        "precio": "No disponible",
+        "url": "No disponible",
+        "posicion": position,
+        "metodo_extraccion": {
+            "titulo": "ninguno",
+            "precio": "ninguno",
+            "url": "ninguno"
+        }
+    }
+
+    results = {
+        "titulo": extract_title(item),
+        "precio": extract_price(item),
+        "url": extract_url(item, base_url),
+    }
+    for field, result in results.items():
+        if result:
+            product_data[field], product_data["metodo_extraccion"][field] = result
+
+    product_data["html_debug"] = {
+        "outer_html": lxml.html.tostring(item, encoding="unicode")[:1000],
+        "class": item.get("class")
+    }
+    return product_data
+
+def parse_listing_html(html, max_products=None, start_position=1, base_url=LISTING_BASE_URL):
+    """Extrae los productos de un HTML de listado (por ejemplo driver.page_source)"""
+    if not html or not html.strip():
+        return []
+
+    tree = lxml.html.fromstring(html)
+    product_items, _ = find_product_items(tree)
+    if max_products is not None:
+        product_items = product_items[:max_products]
+
+    return [extract_product(item, start_position + idx, base_url)
+            for idx, item in enumerate(product_items)]
+
+def parse_listing_file(path, max_products=None):
+    with open(path, "r", encoding="utf-8") as f:
+        return parse_listing_html(f.read(), max_products)
+
+def parse_listing_files(paths, max_products=None, max_workers=None):
+    """Procesa varias páginas guardadas en paralelo, una por proceso"""
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(parse_listing_file, paths, [max_products] * len(paths)))
+
+# Ejecutar sobre páginas guardadas: python offline_parser.py source_safari.html [...]
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Uso: python offline_parser.py pagina.html [pagina2.html ...]")
+        sys.exit(1)
+
+    for path, products in zip(sys.argv[1:], parse_listing_files(sys.argv[1:])):
+        print(f"=== {path}: {len(products)} productos ===")
+        print(json.dumps(products, ensure_ascii=False, indent=4))
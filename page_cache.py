@@ -0,0 +1,168 @@
+# -*- coding: utf-8 -*-
+"""
+Caché en disco de páginas de listado
+- Clave: la URL de búsqueda normalizada (minúsculas, sin fragmento, parámetros ordenados)
+- HTML comprimido con zlib en un único archivo SQLite
+- TTL: dentro del plazo la página se sirve sin descargar
+- Vencida, en modo HTTP se revalida con If-None-Match / If-Modified-Since (304 = se reutiliza)
+- Límite de tamaño con expulsión de las entradas usadas hace más tiempo (LRU)
+"""
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from http_fetch import needs_js_rendering
+
+PAGE_CACHE_FILENAME = "cache_listados.sqlite"
+
+def normalize_url(url):
+    """Clave de caché: misma búsqueda con distinta capitalización o parámetros da la misma clave"""
+    parts = urlsplit(url.strip())
+    path = parts.path.lower().rstrip("/") or "/"
+    query = urlencode(sorted(parse_qsl(parts.query)))
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, query, ""))
+
+class PageCache:
+    """Caché de HTML por URL con TTL, revalidación condicional y límite de tamaño"""
+
+    def __init__(self, path, ttl=900, max_bytes=50 * 1024 * 1024):
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.stats = {"aciertos": 0, "revalidadas": 0, "descargas": 0}
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS pages (
+                key TEXT PRIMARY KEY,
+                body BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                stored_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+        """)
+        self._db.commit()
+
+    def lookup(self, url):
+        """Entrada guardada (aunque esté vencida) o None"""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT body, etag, last_modified, stored_at FROM pages WHERE key = ?",
+                (normalize_url(url),)).fetchone()
+        if row is None:
+            return None
+        body, etag, last_modified, stored_at = row
+        return {
+            "html": zlib.decompress(body).decode("utf-8"),
+            "etag": etag,
+            "last_modified": last_modified,
+            "fresh": time.time() - stored_at < self.ttl,
+        }
+
+    def get(self, url):
+        """HTML vigente (dentro del TTL) o None"""
+        entry = self.lookup(url)
+        if entry is None or not entry["fresh"]:
+            return None
+        self._touch(url, refresh=False)
+        return entry["html"]
+
+    def put(self, url, html, etag=None, last_modified=None):
+        body = zlib.compress(html.encode("utf-8"), 6)
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (normalize_url(url), body, len(body), etag, last_modified, now, now))
+            self._evict()
+            self._db.commit()
+
+    def store(self, url, status, html, etag=None, last_modified=None):
+        """Guarda la página solo si es un listado utilizable. Devuelve True si se guardó"""
+        if needs_js_rendering(status, html):
+            return False
+        self.put(url, html, etag, last_modified)
+        return True
+
+    def _touch(self, url, refresh):
+        now = time.time()
+        with self._lock:
+            if refresh:
+                self._db.execute("UPDATE pages SET stored_at = ?, accessed_at = ? WHERE key = ?",
+                                 (now, now, normalize_url(url)))
+            else:
+                self._db.execute("UPDATE pages SET accessed_at = ? WHERE key = ?", (now, normalize_url(url)))
+            self._db.commit()
+
+    def _evict(self):
+        """Borra las entradas menos usadas hasta quedar dentro de max_bytes"""
+        total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM pages").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in self._db.execute("SELECT key, size FROM pages ORDER BY accessed_at").fetchall():
+            self._db.execute("DELETE FROM pages WHERE key = ?", (key,))
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def _count(self, name):
+        # La caché se comparte entre los hilos del pool: += sobre el dict no es atómico
+        with self._lock:
+            self.stats[name] += 1
+
+    def wrap(self, fetch_page):
+        """Envuelve una función fetch_page(url) -> (status, html) para servir y guardar en caché"""
+        def cached_fetch(url):
+            html = self.get(url)
+            if html is not None:
+                self._count("aciertos")
+                return 200, html
+
+            status, html = fetch_page(url)
+            self._count("descargas")
+            self.store(url, status, html)
+            return status, html
+        return cached_fetch
+
+    def wrap_http(self, fetcher):
+        """Como wrap, pero revalida las entradas vencidas con peticiones condicionales"""
+        def cached_fetch(url):
+            entry = self.lookup(url)
+            if entry is not None and entry["fresh"]:
+                self._touch(url, refresh=False)
+                self._count("aciertos")
+                return 200, entry["html"]
+
+            headers = {}
+            if entry is not None:
+                if entry["etag"]:
+                    headers["If-None-Match"] = entry["etag"]
+                if entry["last_modified"]:
+                    headers["If-Modified-Since"] = entry["last_modified"]
+
+            status, html, response_headers = fetcher.fetch_with_headers(url, headers or None)
+            if status == 304 and entry is not None:
+                self._touch(url, refresh=True)
+                self._count("revalidadas")
+                return 200, entry["html"]
+
+            self._count("descargas")
+            self.store(url, status, html, response_headers.get("ETag"), response_headers.get("Last-Modified"))
+            return status, html
+        return cached_fetch
+
+    def log_summary(self, log):
+        if any(self.stats.values()):
+            log(f"Caché de listados: {self.stats['aciertos']} aciertos, {self.stats['revalidadas']} revalidadas (304), "
+                f"{self.stats['descargas']} descargas")
+
+    def close(self):
+        with self._lock:
+            self._db.close()
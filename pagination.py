@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+"""
+Paginación del listado de Mercado Libre con descarga anticipada
+- Construye las URLs de cada página con el desplazamiento _Desde_N
+- Descarga la página N+1 en segundo plano mientras se extrae la página N
+"""
+from concurrent.futures import ThreadPoolExecutor
+
+from offline_parser import LISTING_BASE_URL
+
+# Resultados por página del listado
+PAGE_SIZE = 50
+
+# Límite de páginas por término
+MAX_PAGES = 200
+
+def build_page_url(search_term, page=1, base_url=LISTING_BASE_URL, page_size=PAGE_SIZE):
+    """URL de la página indicada (1 = primera página) para un término de búsqueda"""
+    slug = search_term.replace(' ', '-')
+    if page <= 1:
+        return f"{base_url}{slug}"
+    offset = (page - 1) * page_size + 1
+    return f"{base_url}{slug}_Desde_{offset}_NoIndex_True"
+
+def build_page_urls(search_term, num_pages, base_url=LISTING_BASE_URL, page_size=PAGE_SIZE):
+    num_pages = max(1, min(num_pages, MAX_PAGES))
+    return [build_page_url(search_term, page, base_url, page_size) for page in range(1, num_pages + 1)]
+
+def prefetch_pages(fetch_page, urls):
+    """Generador de (número de página, url, resultado de fetch_page) con una página de adelanto
+
+    fetch_page se ejecuta siempre en el mismo hilo secundario, de modo que puede usar
+    un WebDriver sin competir con el hilo principal. Si el consumidor deja de iterar,
+    la descarga pendiente se descarta.
+    """
+    if not urls:
+        return
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        pending = executor.submit(fetch_page, urls[0])
+        try:
+            for index, url in enumerate(urls):
+                result = pending.result()
+                if index + 1 < len(urls):
+                    pending = executor.submit(fetch_page, urls[index + 1])
+                else:
+                    pending = None
+                yield index + 1, url, result
+        finally:
+            if pending is not None:
+                pending.cancel()
@@ -0,0 +1,220 @@
+# -*- coding: utf-8 -*-
+"""
+Exportación columnar de resultados a Parquet (Apache Arrow)
+- Esquema limpio: título, precio (texto y centavos), URL, ID, posición, métodos y fecha de extracción
+- Los productos se acumulan en memoria y se escriben por grupos de filas (row groups)
+  a medida que llegan, sin esperar al final de la ejecución
+- Particiones estilo Hive por fecha y término: parquet/fecha=AAAA-MM-DD/termino=<término>/
+- pyarrow es opcional: solo se necesita al exportar
+"""
+import json
+import os
+import re
+import sys
+from datetime import datetime, timezone
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+
+from item_ids import item_id_from_url
+from price_normalizer import normalize_price
+from scraper_logging import get_logger
+
+PARQUET_DIRNAME = "parquet"
+
+logger = get_logger("parquet")
+
+def _schema():
+    # La fecha y el término no se repiten en cada fila: van en la ruta de la partición
+    return pa.schema([
+        ("titulo", pa.string()),
+        ("precio", pa.string()),
+        ("amount_cents", pa.int64()),
+        ("currency", pa.string()),
+        ("precio_ambiguo", pa.bool_()),
+        ("url", pa.string()),
+        ("item_id", pa.string()),
+        ("posicion", pa.int32()),
+        ("metodo_titulo", pa.string()),
+        ("metodo_precio", pa.string()),
+        ("metodo_url", pa.string()),
+        ("extraido_en", pa.timestamp("ms", tz="UTC")),
+    ])
+
+def require_pyarrow():
+    if pa is None:
+        raise RuntimeError("La exportación a Parquet necesita pyarrow: pip install pyarrow")
+
+def partition_dir(base_dir, term, day):
+    """Carpeta de la partición: base_dir/fecha=AAAA-MM-DD/termino=<término>"""
+    slug = re.sub(r'[^\w-]+', '_', term.strip().lower()).strip("_") or "sin_termino"
+    return os.path.join(base_dir, f"fecha={day:%Y-%m-%d}", f"termino={slug}")
+
+def clean_row(product, extracted_at):
+    """Fila del esquema limpio a partir de un registro de producto"""
+    normalized = product.get("precio_normalizado") or normalize_price(product.get("precio"))
+    methods = product.get("metodo_extraccion", {})
+    return {
+        "titulo": product.get("titulo"),
+        "precio": product.get("precio"),
+        "amount_cents": normalized["amount_cents"],
+        "currency": normalized["currency"],
+        "precio_ambiguo": normalized["ambiguous"],
+        "url": product.get("url"),
+        "item_id": product.get("item_id") or item_id_from_url(product.get("url")),
+        "posicion": product.get("posicion"),
+        "metodo_titulo": methods.get("titulo"),
+        "metodo_precio": methods.get("precio"),
+        "metodo_url": methods.get("url"),
+        "extraido_en": extracted_at,
+    }
+
+class ParquetStreamWriter:
+    """Escribe productos en un archivo Parquet de la partición (fecha, término) por grupos de filas
+    - Misma interfaz que ProductStreamWriter (write, write_many, close, count)
+    - Mientras se escribe el archivo es oculto (.part-*.tmp); al cerrar se renombra,
+      así las lecturas del directorio nunca ven un archivo incompleto
+    - Usado con with, si hay una excepción el temporal se descarta en lugar de publicarse
+    """
+
+    def __init__(self, base_dir, term, row_group_size=5000, started_at=None, compression="zstd", name=None):
+        require_pyarrow()
+        self.started_at = started_at or datetime.now(timezone.utc)
+        self.row_group_size = row_group_size
+        self.compression = compression
+        self.count = 0
+        self.row_groups = 0
+
+        directory = partition_dir(base_dir, term, self.started_at.astimezone())
+        os.makedirs(directory, exist_ok=True)
+        name = name or f"part-{self.started_at.astimezone():%H%M%S}-{os.getpid()}.parquet"
+        self.path = os.path.join(directory, name)
+        self._tmp_path = os.path.join(directory, f".{name}.tmp")
+        self._schema = _schema()
+        self._rows = []
+        self._writer = None
+
+    def write(self, product, extracted_at=None):
+        self._rows.append(clean_row(product, extracted_at or datetime.now(timezone.utc)))
+        self.count += 1
+        if len(self._rows) >= self.row_group_size:
+            self.flush()
+
+    def write_many(self, products):
+        for product in products:
+            self.write(product)
+
+    def flush(self):
+        """Escribe las filas acumuladas como un grupo de filas"""
+        if not self._rows:
+            return
+        if self._writer is None:
+            self._writer = pq.ParquetWriter(self._tmp_path, self._schema, compression=self.compression)
+        self._writer.write_table(pa.Table.from_pylist(self._rows, schema=self._schema))
+        self.row_groups += 1
+        self._rows = []
+
+    def close(self):
+        """Cierra el archivo y lo publica. Sin productos no se crea ningún archivo"""
+        self.flush()
+        if self._writer is None:
+            return None
+        self._writer.close()
+        self._writer = None
+        os.replace(self._tmp_path, self.path)
+        return self.path
+
+    def discard(self):
+        """Cierra sin publicar: el archivo temporal se borra"""
+        self._rows = []
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        if os.path.exists(self._tmp_path):
+            os.remove(self._tmp_path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        # Solo se publica un cierre limpio; si hubo una excepción el término se vuelve a exportar completo
+        if exc[0] is not None:
+            self.discard()
+        else:
+            self.close()
+
+class TeeWriter:
+    """Reparte cada producto entre varios writers. count y path son los del primero"""
+
+    def __init__(self, primary, *others):
+        self.writers = (primary,) + others
+
+    @property
+    def count(self):
+        return self.writers[0].count
+
+    @property
+    def path(self):
+        return self.writers[0].path
+
+    def write(self, product):
+        for writer in self.writers:
+            writer.write(product)
+
+    def write_many(self, products):
+        for writer in self.writers:
+            writer.write_many(products)
+
+    def sync(self):
+        """Lleva al disco los writers que lo permiten (el .jsonl)"""
+        for writer in self.writers:
+            if hasattr(writer, "sync"):
+                writer.sync()
+
+    def close(self):
+        for writer in self.writers:
+            writer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        # Cada writer decide qué hacer ante una excepción (el Parquet parcial no se publica)
+        for writer in self.writers:
+            writer.__exit__(*exc)
+
+def export_file(path, base_dir):
+    """Exporta un productos_<navegador>_<término>_<fecha>.json(l) existente. Devuelve la ruta escrita"""
+    from product_store import RESULT_FILE_PATTERN
+    from stream_output import read_products
+
+    match = RESULT_FILE_PATTERN.search(os.path.basename(path))
+    if not match:
+        logger.warning("Se omite %s: el nombre no es productos_<navegador>_<término>_<fecha>.json(l)", path)
+        return None
+    term = match.group(1).replace("_", " ")
+    started_at = datetime.strptime(match.group(2), "%Y%m%d_%H%M%S").astimezone(timezone.utc)
+
+    if path.endswith(".jsonl"):
+        products = read_products(path)
+    else:
+        with open(path, 'r', encoding='utf-8') as f:
+            products = json.load(f)
+
+    # Mismo nombre que el archivo original: exportarlo otra vez reemplaza el anterior
+    name = os.path.splitext(os.path.basename(path))[0] + ".parquet"
+    writer = ParquetStreamWriter(base_dir, term, started_at=started_at, name=name)
+    for product in products:
+        writer.write(product, extracted_at=started_at)
+    return writer.close()
+
+# Ejecutar: python parquet_export.py output-chrome/productos_chrome_*.json
+# Leer:     pyarrow.dataset.dataset("output-chrome/parquet", partitioning="hive")
+if __name__ == "__main__":
+    require_pyarrow()
+    base_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "output-chrome", PARQUET_DIRNAME)
+    for path in sys.argv[1:]:
+        print(f"{path} -> {export_file(path, base_dir)}")
@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+"""
+Tiempos por fase del scraping (arranque, navegación, disclaimer, contenedor, cascadas, guardado)
+- Cada fase se mide con un span (perf_counter) y se agrega por ejecución y por término
+- Exporta a JSON y al formato de texto de Prometheus (textfile collector de node_exporter)
+"""
+import json
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from datetime import datetime
+
+METRIC_PREFIX = "mercadolibre_scraper"
+PROMETHEUS_FILENAME = "metricas_chrome.prom"
+
+def _percentile(ordered, q):
+    index = min(len(ordered) - 1, max(0, math.ceil(q / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+def _stats(values):
+    ordered = sorted(values)
+    return {
+        "veces": len(ordered),
+        "total": round(sum(ordered), 4),
+        "p50": round(_percentile(ordered, 50), 4),
+        "p95": round(_percentile(ordered, 95), 4),
+        "maximo": round(ordered[-1], 4),
+    }
+
+def _label(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", " ")
+
+class PhaseTimings:
+    """Duraciones por (término, fase) de una ejecución"""
+
+    def __init__(self):
+        self.started_at = datetime.now()
+        self._start = time.perf_counter()
+        self._durations = {}
+        self._lock = threading.Lock()
+
+    def record(self, phase, seconds, term=""):
+        with self._lock:
+            self._durations.setdefault((term, phase), []).append(seconds)
+
+    @contextmanager
+    def span(self, phase, term=""):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(phase, time.perf_counter() - start, term)
+
+    def for_term(self, term):
+        """Vista con la misma interfaz que etiqueta cada span con el término"""
+        return TermTimings(self, term)
+
+    def summary(self):
+        """{"fases": {fase: stats}, "por_termino": {término: {fase: stats}}} en segundos"""
+        with self._lock:
+            durations = {key: list(values) for key, values in self._durations.items()}
+
+        by_phase = {}
+        by_term = {}
+        for (term, phase), values in durations.items():
+            by_phase.setdefault(phase, []).extend(values)
+            if term:
+                by_term.setdefault(term, {})[phase] = _stats(values)
+        return {
+            "inicio": self.started_at.isoformat(timespec="seconds"),
+            "duracion": round(time.perf_counter() - self._start, 3),
+            "fases": {phase: _stats(values) for phase, values in by_phase.items()},
+            "por_termino": by_term,
+        }
+
+    def to_prometheus(self):
+        """Texto de exposición de Prometheus: un summary por (fase, término)"""
+        with self._lock:
+            durations = {key: sorted(values) for key, values in self._durations.items()}
+
+        name = f"{METRIC_PREFIX}_phase_seconds"
+        lines = [
+            f"# HELP {name} Duración de cada fase del scraping en segundos",
+            f"# TYPE {name} summary",
+        ]
+        for (term, phase), values in sorted(durations.items()):
+            labels = f'phase="{_label(phase)}",term="{_label(term)}"'
+            for quantile in (50, 95):
+                lines.append(f'{name}{{{labels},quantile="{quantile / 100}"}} {_percentile(values, quantile):.6f}')
+            lines.append(f"{name}_sum{{{labels}}} {sum(values):.6f}")
+            lines.append(f"{name}_count{{{labels}}} {len(values)}")
+
+        run_name = f"{METRIC_PREFIX}_run_duration_seconds"
+        lines += [
+            f"# HELP {run_name} Duración total de la última ejecución",
+            f"# TYPE {run_name} gauge",
+            f"{run_name} {time.perf_counter() - self._start:.6f}",
+            f"# HELP {METRIC_PREFIX}_run_start_timestamp_seconds Inicio de la última ejecución",
+            f"# TYPE {METRIC_PREFIX}_run_start_timestamp_seconds gauge",
+            f"{METRIC_PREFIX}_run_start_timestamp_seconds {self.started_at.timestamp():.3f}",
+        ]
+        return "\n".join(lines) + "\n"
+
+    def save(self, json_path, prometheus_path=None):
+        """Escribe el resumen JSON y, si se indica, el archivo .prom (reemplazo atómico)"""
+        with open(json_path, 'w', encoding='utf-8') as f:
+            json.dump(self.summary(), f, ensure_ascii=False, indent=4)
+        if prometheus_path:
+            tmp_path = prometheus_path + ".tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(self.to_prometheus())
+            os.replace(tmp_path, prometheus_path)
+
+    def log_summary(self, log):
+        phases = self.summary()["fases"]
+        if not phases:
+            return
+        log("Tiempo por fase:")
+        for phase, stats in sorted(phases.items(), key=lambda item: -item[1]["total"]):
+            log(f"  - {phase}: {stats['total']:.2f} s en {stats['veces']} veces "
+                f"(p50 {stats['p50'] * 1000:.1f} ms, p95 {stats['p95'] * 1000:.1f} ms)")
+
+class TermTimings:
+    """PhaseTimings de un término (para lotes con varios términos en paralelo)"""
+
+    def __init__(self, timings, term):
+        self.timings = timings
+        self.term = term
+
+    def record(self, phase, seconds):
+        self.timings.record(phase, seconds, self.term)
+
+    def span(self, phase):
+        return self.timings.span(phase, self.term)
+
+def span(timings, phase):
+    """Span de la fase, o un contexto vacío si no se miden tiempos"""
+    return timings.span(phase) if timings is not None else nullcontext()
+
+def timed(timings, phase, func):
+    """Envuelve func para medir cada llamada como un span de la fase"""
+    if timings is None:
+        return func
+
+    def timed_func(*args, **kwargs):
+        with timings.span(phase):
+            return func(*args, **kwargs)
+    return timed_func
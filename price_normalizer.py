@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+"""
+Normalización de precios a centavos enteros
+- Convierte "$ 19,999", "$ 1,234.56" o "$ 1.234,56" en {amount_cents, currency, raw, ambiguous}
+- Reglas de México: coma para miles y punto para decimales; si aparecen los dos
+  separadores, el último es el decimal
+- Marca como ambiguos los valores que admiten más de una lectura o traen varios montos
+- Procesa listas completas con patrones compilados una vez y cada texto distinto
+  se interpreta una sola vez (los precios se repiten mucho entre tarjetas)
+"""
+import re
+from functools import lru_cache
+
+DEFAULT_CURRENCY = "MXN"
+
+NUMBER_PATTERN = re.compile(r'\d[\d.,]*')
+USD_PATTERN = re.compile(r'US\$|USD|U\$S', re.IGNORECASE)
+THOUSANDS_GROUPS = re.compile(r'^\d{1,3}(?:[.,]\d{3})+$')
+
+def _parse_number(number):
+    """Devuelve (centavos, ambiguo) para un número con separadores"""
+    number = number.rstrip(".,")
+    last_comma = number.rfind(",")
+    last_dot = number.rfind(".")
+
+    # Sin separadores: pesos enteros
+    if last_comma < 0 and last_dot < 0:
+        return int(number) * 100, False
+
+    # Ambos separadores: el último es el decimal ("1,234.56" o "1.234,56")
+    if last_comma >= 0 and last_dot >= 0:
+        decimal_at = max(last_comma, last_dot)
+        integer = re.sub(r'[.,]', '', number[:decimal_at])
+        decimals = number[decimal_at + 1:]
+        if len(decimals) > 2:
+            return int(integer + decimals) * 100, True
+        return int(integer) * 100 + int(decimals.ljust(2, "0")), last_comma > last_dot
+
+    separator = "," if last_comma >= 0 else "."
+    head, _, tail = number.rpartition(separator)
+
+    # Grupos de tres dígitos: separador de miles ("19,999" o "1.234.567")
+    if THOUSANDS_GROUPS.match(number):
+        # Un solo punto con tres dígitos ("1.234") podría ser notación europea
+        ambiguous = separator == "." and number.count(".") == 1
+        return int(number.replace(separator, "")) * 100, ambiguous
+
+    # Un separador con uno o dos dígitos al final: decimales
+    if number.count(separator) == 1 and len(tail) <= 2:
+        # En México los decimales van con punto; con coma es formato extranjero
+        return int(head or "0") * 100 + int(tail.ljust(2, "0")), separator == ","
+
+    # Cualquier otra combinación: se toman solo los dígitos
+    return int(re.sub(r'\D', '', number)) * 100, True
+
+@lru_cache(maxsize=65536)
+def _normalize_cached(raw):
+    currency = "USD" if USD_PATTERN.search(raw) else DEFAULT_CURRENCY
+    numbers = NUMBER_PATTERN.findall(raw)
+    if not numbers:
+        return None, currency, True
+
+    amount_cents, ambiguous = _parse_number(numbers[0])
+    # Varios montos en el mismo texto (precio anterior, mensualidades, etc.)
+    return amount_cents, currency, ambiguous or len(numbers) > 1
+
+def normalize_price(raw):
+    """Normaliza un texto de precio. amount_cents es None si no hay monto reconocible"""
+    if not raw or raw == "No disponible":
+        return {"amount_cents": None, "currency": DEFAULT_CURRENCY, "raw": raw, "ambiguous": False}
+
+    amount_cents, currency, ambiguous = _normalize_cached(raw.replace("\xa0", " ").strip())
+    return {"amount_cents": amount_cents, "currency": currency, "raw": raw, "ambiguous": ambiguous}
+
+def normalize_prices(raws):
+    """Normaliza una lista de textos de precio de una vez"""
+    return [normalize_price(raw) for raw in raws]
+
+def annotate_prices(products):
+    """Agrega precio_normalizado a cada producto de la lista. Devuelve la misma lista"""
+    for product, normalized in zip(products, normalize_prices([p.get("precio") for p in products])):
+        product["precio_normalizado"] = normalized
+    return products
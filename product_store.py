@@ -0,0 +1,192 @@
+# -*- coding: utf-8 -*-
+"""
+Almacenamiento de productos en SQLite con historial de precios
+- products: último estado de cada publicación (upsert por item_id)
+- price_history: una fila por observación (publicación, término, precio, fecha)
+- Escrituras por lotes en una sola transacción e índices por término, publicación y fecha
+- También importa los productos_*.json de ejecuciones anteriores
+"""
+import json
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+from datetime import datetime
+
+from item_ids import canonical_url, item_id_from_url
+from price_normalizer import normalize_price
+from scraper_logging import get_logger
+
+STORE_FILENAME = "productos.sqlite"
+
+# productos_chrome_<término>_<AAAAMMDD>_<HHMMSS>[_<n>].json (el sufijo _n evita pisar otra ejecución)
+RESULT_FILE_PATTERN = re.compile(r'productos_[a-z]+_(.+)_(\d{8}_\d{6})(?:_\d+)?\.jsonl?$')
+
+logger = get_logger("store")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS products (
+    item_id TEXT PRIMARY KEY,
+    titulo TEXT,
+    url TEXT,
+    precio TEXT,
+    amount_cents INTEGER,
+    currency TEXT,
+    termino TEXT,
+    posicion INTEGER,
+    metodo_titulo TEXT,
+    metodo_precio TEXT,
+    metodo_url TEXT,
+    first_seen REAL NOT NULL,
+    last_seen REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS price_history (
+    item_id TEXT NOT NULL,
+    termino TEXT,
+    precio TEXT,
+    amount_cents INTEGER,
+    currency TEXT,
+    posicion INTEGER,
+    observed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_history_item ON price_history (item_id, observed_at);
+CREATE INDEX IF NOT EXISTS idx_history_term ON price_history (termino, observed_at);
+CREATE INDEX IF NOT EXISTS idx_history_time ON price_history (observed_at);
+CREATE INDEX IF NOT EXISTS idx_products_term ON products (termino);
+"""
+
+LATEST_FIELDS = ("titulo", "url", "precio", "amount_cents", "currency", "termino", "posicion",
+                 "metodo_titulo", "metodo_precio", "metodo_url")
+
+# Los campos solo se actualizan con observaciones más recientes (importar archivos viejos no los pisa)
+UPSERT_PRODUCT = f"""
+INSERT INTO products (item_id, {", ".join(LATEST_FIELDS)}, first_seen, last_seen)
+VALUES ({", ".join("?" * (len(LATEST_FIELDS) + 3))})
+ON CONFLICT (item_id) DO UPDATE SET
+    {", ".join(f"{field} = CASE WHEN excluded.last_seen >= products.last_seen THEN excluded.{field} ELSE products.{field} END"
+               for field in LATEST_FIELDS)},
+    first_seen = MIN(products.first_seen, excluded.first_seen),
+    last_seen = MAX(products.last_seen, excluded.last_seen)
+"""
+
+def _record_key(product):
+    """ID de la publicación (el wid del fragmento en las fichas de catálogo /p/),
+    o la URL canónica si la URL no trae ID"""
+    item_id = item_id_from_url(product.get("url")) or product.get("item_id")
+    if item_id:
+        return item_id
+    url = product.get("url")
+    return f"url:{canonical_url(url)}" if url and url != "No disponible" else None
+
+class ProductStore:
+    """Base SQLite de productos e historial de precios"""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(SCHEMA)
+        self._db.commit()
+
+    def save_products(self, term, products, observed_at=None):
+        """Guarda una lista de productos en una transacción. Devuelve cuántos se guardaron"""
+        observed_at = observed_at or time.time()
+        product_rows = []
+        history_rows = []
+        for product in products:
+            key = _record_key(product)
+            if key is None:
+                continue
+            normalized = product.get("precio_normalizado") or normalize_price(product.get("precio"))
+            methods = product.get("metodo_extraccion", {})
+            product_rows.append((
+                key, product.get("titulo"), product.get("url"), product.get("precio"),
+                normalized["amount_cents"], normalized["currency"], term, product.get("posicion"),
+                methods.get("titulo"), methods.get("precio"), methods.get("url"),
+                observed_at, observed_at,
+            ))
+            history_rows.append((key, term, product.get("precio"), normalized["amount_cents"],
+                                 normalized["currency"], product.get("posicion"), observed_at))
+
+        with self._lock, self._db:
+            self._db.executemany(UPSERT_PRODUCT, product_rows)
+            self._db.executemany("INSERT INTO price_history VALUES (?, ?, ?, ?, ?, ?, ?)", history_rows)
+        return len(product_rows)
+
+    def price_history(self, item_id, days=90):
+        """[(fecha ISO, centavos, precio)] de una publicación en los últimos `days` días"""
+        since = time.time() - days * 86400
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT observed_at, amount_cents, precio FROM price_history "
+                "WHERE item_id = ? AND observed_at >= ? ORDER BY observed_at",
+                (item_id, since)).fetchall()
+        return [(datetime.fromtimestamp(ts).isoformat(timespec="seconds"), cents, raw) for ts, cents, raw in rows]
+
+    def term_summary(self, term, days=90):
+        """Precio mínimo, promedio y máximo por día para un término"""
+        since = time.time() - days * 86400
+        with self._lock:
+            return self._db.execute(
+                "SELECT date(observed_at, 'unixepoch', 'localtime') AS dia, COUNT(*), "
+                "MIN(amount_cents), CAST(AVG(amount_cents) AS INTEGER), MAX(amount_cents) "
+                "FROM price_history WHERE termino = ? AND observed_at >= ? AND amount_cents IS NOT NULL "
+                "GROUP BY dia ORDER BY dia", (term, since)).fetchall()
+
+    def import_file(self, path):
+        """Importa un productos_<navegador>_<término>_<fecha>.json(l). Devuelve cuántos se guardaron"""
+        match = RESULT_FILE_PATTERN.search(os.path.basename(path))
+        if not match:
+            logger.warning("Se omite %s: el nombre no es productos_<navegador>_<término>_<fecha>.json(l)", path)
+            return 0
+        term = match.group(1).replace("_", " ")
+        observed_at = datetime.strptime(match.group(2), "%Y%m%d_%H%M%S").timestamp()
+
+        if path.endswith(".jsonl"):
+            from stream_output import read_products
+            products = read_products(path)
+        else:
+            with open(path, 'r', encoding='utf-8') as f:
+                products = json.load(f)
+        return self.save_products(term, products, observed_at)
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+# Ejecutar:
+#   python product_store.py importar output-chrome/productos_chrome_*.json
+#   python product_store.py historial MLM1234567890 --dias 90
+#   python product_store.py resumen "iphone 15" --dias 30
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Base SQLite de productos e historial de precios")
+    parser.add_argument("--base", default=os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                                       "output-chrome", STORE_FILENAME))
+    commands = parser.add_subparsers(dest="comando", required=True)
+    importar = commands.add_parser("importar")
+    importar.add_argument("archivos", nargs="+")
+    historial = commands.add_parser("historial")
+    historial.add_argument("item_id")
+    historial.add_argument("--dias", type=int, default=90)
+    resumen = commands.add_parser("resumen")
+    resumen.add_argument("termino")
+    resumen.add_argument("--dias", type=int, default=90)
+    args = parser.parse_args()
+
+    store = ProductStore(args.base)
+    if args.comando == "importar":
+        total = sum(store.import_file(path) for path in args.archivos)
+        print(f"{total} productos importados de {len(args.archivos)} archivos", file=sys.stderr)
+    elif args.comando == "historial":
+        for day, cents, raw in store.price_history(args.item_id.upper(), args.dias):
+            print(f"{day}\t{cents / 100 if cents is not None else '-'}\t{raw}")
+    else:
+        for day, count, low, average, high in store.term_summary(args.termino, args.dias):
+            print(f"{day}\t{count} precios\tmín {low / 100:.2f}\tprom {average / 100:.2f}\tmáx {high / 100:.2f}")
+    store.close()
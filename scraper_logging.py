@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+"""
+Logging con niveles para los scripts de scraping
+- Un logger por módulo bajo "mercadolibre" (get_logger("chrome") -> "mercadolibre.chrome")
+- Formato lazy: logger.debug("Producto %d: %s", n, titulo) no formatea nada si DEBUG está apagado
+- El detalle por tarjeta va en DEBUG; el nivel por defecto es INFO
+- Los registros pasan por una cola y un hilo en segundo plano escribe en la terminal o el archivo
+- Salida de texto ("[HH:MM:SS] mensaje") o JSON Lines (un objeto por línea)
+- Variables de entorno: SCRAPER_LOG_LEVEL, SCRAPER_LOG_JSON=1, SCRAPER_LOG_FILE
+"""
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import threading
+from datetime import datetime
+
+ROOT_LOGGER = "mercadolibre"
+
+_listener = None
+_lock = threading.Lock()
+
+class ConsoleFormatter(logging.Formatter):
+    """Mismo formato que el antiguo log(): "[HH:MM:SS] mensaje"; el nivel solo si no es INFO"""
+
+    def __init__(self):
+        super().__init__(datefmt="%H:%M:%S")
+
+    def format(self, record):
+        message = record.getMessage()
+        if record.levelno != logging.INFO:
+            message = f"{record.levelname} {message}"
+        if record.exc_info:
+            message += "\n" + self.formatException(record.exc_info)
+        return f"[{self.formatTime(record, self.datefmt)}] {message}"
+
+class JsonLinesFormatter(logging.Formatter):
+    """Un objeto JSON por registro. Los datos de extra={"campos": {...}} se agregan como claves"""
+
+    def format(self, record):
+        entry = {
+            "ts": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "nivel": record.levelname,
+            "logger": record.name,
+            "mensaje": record.getMessage(),
+        }
+        entry.update(getattr(record, "campos", None) or {})
+        if record.exc_info:
+            entry["excepcion"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+def configure_logging(level=None, json_lines=None, path=None):
+    """Configura (o reconfigura) la salida de los loggers de los scrapers
+    - level: "DEBUG", "INFO", "WARNING"... (por defecto SCRAPER_LOG_LEVEL o INFO)
+    - json_lines: True para JSON Lines (por defecto SCRAPER_LOG_JSON)
+    - path: archivo de salida en lugar de la terminal (por defecto SCRAPER_LOG_FILE)
+    """
+    global _listener
+    level = (level or os.environ.get("SCRAPER_LOG_LEVEL") or "INFO").upper()
+    if json_lines is None:
+        json_lines = os.environ.get("SCRAPER_LOG_JSON", "").lower() in ("1", "true", "s", "si", "sí")
+    path = path or os.environ.get("SCRAPER_LOG_FILE")
+
+    with _lock:
+        if _listener is not None:
+            _listener.stop()
+
+        output = logging.FileHandler(path, encoding="utf-8") if path else logging.StreamHandler(sys.stdout)
+        output.setFormatter(JsonLinesFormatter() if json_lines else ConsoleFormatter())
+
+        log_queue = queue.SimpleQueue()
+        root = logging.getLogger(ROOT_LOGGER)
+        for handler in list(root.handlers):
+            root.removeHandler(handler)
+        root.addHandler(logging.handlers.QueueHandler(log_queue))
+        root.setLevel(level)
+        root.propagate = False
+
+        _listener = logging.handlers.QueueListener(log_queue, output)
+        _listener.start()
+
+def shutdown_logging():
+    """Vacía la cola y detiene el hilo de escritura"""
+    global _listener
+    with _lock:
+        if _listener is not None:
+            _listener.stop()
+            _listener = None
+
+atexit.register(shutdown_logging)
+
+def get_logger(name):
+    """Logger del módulo. La primera vez configura la salida con los valores por defecto"""
+    if _listener is None:
+        configure_logging()
+    return logging.getLogger(f"{ROOT_LOGGER}.{name}")
@@ -13,13 +13,16 @@ import sys
 from datetime import datetime
 from selenium import webdriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
+from offline_parser import parse_listing_html
+from waits import WaitRecorder, dismiss_disclaimer, scroll_into_view, wait_for_listing
+from stream_output import ProductStreamWriter, convert_to_json, json_path_for, stream_path_for
+from screenshots import ScreenshotCapture
+from price_normalizer import annotate_prices
+from scraper_logging import get_logger
+from diagnostics import DiagnosticsPolicy, capture_card, page_report, price_formats
 
-def log(message):
-    """Función simple para mostrar logs con timestamp"""
-    timestamp = datetime.now().strftime("%H:%M:%S")
-    print(f"[{timestamp}] {message}")
+logger = get_logger("safari")
+log = logger.info
 
 def get_script_directory():
     """Función para obtener el directorio donde se encuentra el script"""
@@ -30,7 +33,13 @@ def get_script_directory():
         # Si es un archivo .py normal
         return os.path.dirname(os.path.abspath(__file__))
 
-def scrape_mercadolibre_safari(search_term, num_pages=1):
+def scrape_mercadolibre_safari(search_term, num_pages=1, engine="offline", screenshots=None, diagnostics=None):
+    """Scraping del listado con Safari
+    - engine: "offline" (parsea page_source) o "legacy" (por tarjeta)
+    - screenshots: True o un ScreenshotCapture para guardar capturas (desactivado por defecto)
+    - diagnostics: html_debug y HTML de la página solo ante fallos; un número entre 0 y 1
+      captura además esa fracción de las tarjetas y páginas sanas (o un DiagnosticsPolicy)
+    """
     # Obtener el directorio del script para guardar archivos
     script_dir = get_script_directory()
     log(f"Directorio del script: {script_dir}")
@@ -46,10 +55,22 @@ def scrape_mercadolibre_safari(search_term, num_pages=1):
     output_filename = os.path.join(output_dir, f"productos_safari_{search_term.replace(' ', '_')}_{current_time}.json")
     log(f"Los archivos se guardarán en: {output_filename}")
     
+    # Cada producto se agrega al .jsonl al extraerse; el .json se genera al final
+    writer = ProductStreamWriter(stream_path_for(output_filename))
+    
     # Lista para almacenar los productos
     products_data = []
     
+    # Diagnóstico solo para tarjetas y páginas con fallos
+    if not isinstance(diagnostics, DiagnosticsPolicy):
+        diagnostics = DiagnosticsPolicy(diagnostics or 0.0)
+    dump_prefix = os.path.join(output_dir, f"diagnostico_safari_{search_term.replace(' ', '_')}_{current_time}")
+    
     log(f"Iniciando Safari WebDriver para buscar '{search_term}'")
+    waits = WaitRecorder()
+    capture = ScreenshotCapture() if screenshots is True else (screenshots or None)
+    if capture:
+        capture.start(output_dir, diagnostics)
     try:
         # Iniciar Safari
         driver = webdriver.Safari()
@@ -59,431 +80,431 @@ def scrape_mercadolibre_safari(search_term, num_pages=1):
         search_url = f"https://listado.mercadolibre.com.mx/{search_term.replace(' ', '-')}"
         log(f"Navegando a: {search_url}")
         
-        # Ir a la página de búsqueda
+        # Ir a la página de búsqueda y esperar solo hasta que haya resultados y precios
         driver.get(search_url)
-        time.sleep(5)  # Espera para carga completa
+        if not wait_for_listing(driver, waits):
+            logger.warning("Tiempo de espera agotado para el listado. Se continúa con lo cargado")
         
-        # Guardar screenshot para diagnóstico
-        screenshot_path = os.path.join(output_dir, "pagina_mercadolibre_safari.png")
-        driver.save_screenshot(screenshot_path)
-        log(f"Screenshot guardado como: {screenshot_path}")
+        # Screenshot para diagnóstico (se escribe en segundo plano)
+        if capture:
+            capture.capture_page(driver, "pagina_mercadolibre_safari.png")
         
         # Manejar disclaimer si aparece
         try:
-            disclaimer = WebDriverWait(driver, 5).until(
-                EC.element_to_be_clickable((By.XPATH, '//button[@data-testid="action:understood-button"]'))
-            )
-            disclaimer.click()
-            time.sleep(2)
-            log("Disclaimer cerrado")
+            if dismiss_disclaimer(driver, waits):
+                log("Disclaimer cerrado")
+            else:
+                log("No se encontró disclaimer")
         except:
             log("No se encontró disclaimer o no se pudo cerrar")
         
-        # Capturar el HTML para diagnóstico
-        source_path = os.path.join(output_dir, "source_safari.html")
+        # HTML de la página: se parsea sin conexión y se guarda solo si hay fallos
         page_source = driver.page_source
-        with open(source_path, "w", encoding="utf-8") as f:
-            f.write(page_source)
-        log(f"HTML de la página guardado en: {source_path}")
-        
-        # NUEVO: Verificar el formato de precios en la página actual
-        log("Analizando formatos de precio en la página...")
-        try:
-            # Obtener todos los elementos de precio para analizar formato
-            all_price_elements = driver.find_elements(By.XPATH, '//span[contains(@class, "price-tag-amount")]')
-            
-            # Si encontramos elementos, mostrar los primeros 3 para análisis
-            if all_price_elements:
-                log(f"Encontrados {len(all_price_elements)} elementos de precio para análisis")
-                for i, elem in enumerate(all_price_elements[:3]):
-                    price_text = elem.text.strip()
-                    log(f"Muestra de precio #{i+1}: '{price_text}'")
-                    
-                    # Intentar inspeccionar la estructura interna del precio
-                    try:
-                        price_parts = elem.find_elements(By.XPATH, './/span')
-                        parts_text = [p.text.strip() for p in price_parts]
-                        log(f"  - Componentes internos: {parts_text}")
-                    except:
-                        pass
-            else:
-                log("No se encontraron elementos de precio para análisis previo")
-        except Exception as e:
-            log(f"Error al analizar formatos de precio: {e}")
         
-        # Detectar contenedor principal de resultados
-        main_container = None
-        container_selectors = [
-            '//section[@class="ui-search-results"]',
-            '//div[@class="ui-search-results"]',
-            '//ol[@class="ui-search-layout"]'
-        ]
-        
-        for selector in container_selectors:
-            containers = driver.find_elements(By.XPATH, selector)
-            if containers:
-                main_container = containers[0]
-                log(f"Contenedor principal encontrado: {selector}")
-                break
-        
-        if not main_container:
-            log("No se encontró el contenedor principal. Usando body como fallback")
-            main_container = driver.find_element(By.TAG_NAME, 'body')
-        
-        # Extraer productos del contenedor principal
-        log("Extrayendo productos del contenedor principal...")
-        
-        # Detectar el tipo de vista (grid o lista)
-        grid_items = main_container.find_elements(By.XPATH, './/li[contains(@class, "ui-search-layout__item")]')
-        
-        if grid_items:
-            log(f"Detectada vista de cuadrícula con {len(grid_items)} productos")
-            product_items = grid_items
-        else:
-            # Intentar detectar vista de lista
-            list_items = main_container.find_elements(By.XPATH, './/div[contains(@class, "ui-search-result")]')
-            if list_items:
-                log(f"Detectada vista de lista con {len(list_items)} productos")
-                product_items = list_items
-            else:
-                # Último intento - buscar cualquier tipo de contenedor de producto
-                log("No se detectó un patrón claro. Buscando cualquier contenedor de producto...")
-                product_items = main_container.find_elements(By.XPATH, 
-                    './/*[contains(@class, "ui-search-result") or contains(@class, "ui-search-layout__item")]')
-                log(f"Encontrados {len(product_items)} posibles contenedores de productos")
+        # Parsear el HTML guardado sin más llamadas a WebDriver
+        if engine == "offline":
+            try:
+                start = time.perf_counter()
+                products_data = annotate_prices(parse_listing_html(page_source, max_products=10))
+                elapsed_ms = (time.perf_counter() - start) * 1000
+                log(f"Extracción offline: {len(products_data)} productos en {elapsed_ms:.1f} ms")
+                
+                for product_data in products_data:
+                    logger.debug("Producto %d: %.50s | %s | %s", product_data["posicion"], product_data["titulo"],
+                                 product_data["precio"], product_data["metodo_extraccion"])
+                
+                if products_data:
+                    writer.write_many(diagnostics.prune(products_data))
+                    log(f"Datos guardados en: {writer.path}")
+                else:
+                    log("El parser offline no encontró productos. Usando extracción en vivo")
+            except Exception as e:
+                logger.warning("Error en extracción offline, usando extracción en vivo: %s", e)
+                products_data = []
         
-        # Procesar los productos encontrados
-        if product_items:
-            log(f"Procesando {len(product_items)} productos...")
+        if not products_data:
+            # Detectar contenedor principal de resultados
+            main_container = None
+            container_selectors = [
+                '//section[@class="ui-search-results"]',
+                '//div[@class="ui-search-results"]',
+                '//ol[@class="ui-search-layout"]'
+            ]
             
-            # Limitar a máximo 10 productos para pruebas
-            max_products = min(10, len(product_items))
-            log(f"Se procesarán los primeros {max_products} productos")
+            for selector in container_selectors:
+                containers = driver.find_elements(By.XPATH, selector)
+                if containers:
+                    main_container = containers[0]
+                    log(f"Contenedor principal encontrado: {selector}")
+                    break
             
-            for idx, item in enumerate(product_items[:max_products]):
-                try:
-                    log(f"Procesando producto {idx+1}/{max_products}")
-                    
-                    # Hacer scroll para asegurar que el elemento esté visible
-                    try:
-                        driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", item)
-                        time.sleep(1)
-                    except:
-                        log("No se pudo hacer scroll al elemento")
-                    
-                    # Tomar screenshot del elemento actual para diagnóstico
+            if not main_container:
+                logger.warning("No se encontró el contenedor principal. Usando body como fallback")
+                main_container = driver.find_element(By.TAG_NAME, 'body')
+            
+            # Extraer productos del contenedor principal
+            logger.debug("Extrayendo productos del contenedor principal...")
+            
+            # Detectar el tipo de vista (grid o lista)
+            grid_items = main_container.find_elements(By.XPATH, './/li[contains(@class, "ui-search-layout__item")]')
+            
+            if grid_items:
+                log(f"Detectada vista de cuadrícula con {len(grid_items)} productos")
+                product_items = grid_items
+            else:
+                # Intentar detectar vista de lista
+                list_items = main_container.find_elements(By.XPATH, './/div[contains(@class, "ui-search-result")]')
+                if list_items:
+                    log(f"Detectada vista de lista con {len(list_items)} productos")
+                    product_items = list_items
+                else:
+                    # Último intento - buscar cualquier tipo de contenedor de producto
+                    log("No se detectó un patrón claro. Buscando cualquier contenedor de producto...")
+                    product_items = main_container.find_elements(By.XPATH, 
+                        './/*[contains(@class, "ui-search-result") or contains(@class, "ui-search-layout__item")]')
+                    log(f"Encontrados {len(product_items)} posibles contenedores de productos")
+            
+            # Procesar los productos encontrados
+            if product_items:
+                log(f"Procesando {len(product_items)} productos...")
+                
+                # Limitar a máximo 10 productos para pruebas
+                max_products = min(10, len(product_items))
+                log(f"Se procesarán los primeros {max_products} productos")
+                
+                for idx, item in enumerate(product_items[:max_products]):
                     try:
-                        product_screenshot_path = os.path.join(output_dir, f"producto_safari_{idx+1}.png")
-                        item.screenshot(product_screenshot_path)
-                        log(f"Screenshot guardado como: {product_screenshot_path}")
-                    except:
-                        log("No se pudo guardar screenshot del elemento")
-                    
-                    # Producto base
-                    product_data = {
-                        "titulo": "No disponible",
-                        "precio": "No disponible",
-                        "url": "No disponible",
-                        "posicion": idx + 1,
-                        "metodo_extraccion": {
-                            "titulo": "ninguno",
-                            "precio": "ninguno",
-                            "url": "ninguno"
-                        }
-                    }
-                    
-                    # Extracción de título con múltiples métodos
-                    title_found = False
-                    
-                    # Intento 1: Título con clase específica
-                    if not title_found:
-                        try:
-                            title_elem = item.find_element(By.XPATH, './/h2[contains(@class, "ui-search-item__title")]')
-                            title_text = title_elem.text.strip()
-                            if title_text:
-                                product_data["titulo"] = title_text
-                                product_data["metodo_extraccion"]["titulo"] = "xpath_title_class"
-                                title_found = True
-                                log(f"Título encontrado con selector específico: {title_text[:30]}...")
-                        except:
-                            pass
-                    
-                    # Intento 2: Cualquier h2 dentro del elemento
-                    if not title_found:
+                        logger.debug("Procesando producto %d/%d", idx + 1, max_products)
+                        
+                        # Hacer scroll para asegurar que el elemento esté visible
                         try:
-                            title_elems = item.find_elements(By.TAG_NAME, 'h2')
-                            if title_elems:
-                                title_text = title_elems[0].text.strip()
-                                if title_text:
-                                    product_data["titulo"] = title_text
-                                    product_data["metodo_extraccion"]["titulo"] = "tag_h2"
-                                    title_found = True
-                                    log(f"Título encontrado con tag h2: {title_text[:30]}...")
+                            scroll_into_view(driver, item, waits)
                         except:
-                            pass
-                    
-                    # Intento 3: Elemento con atributo title
-                    if not title_found:
-                        try:
-                            title_attr_elems = item.find_elements(By.XPATH, './/*[@title]')
-                            if title_attr_elems:
-                                title_text = title_attr_elems[0].get_attribute('title').strip()
+                            logger.debug("No se pudo hacer scroll al elemento")
+                        
+                        # Producto base
+                        product_data = {
+                            "titulo": "No disponible",
+                            "precio": "No disponible",
+                            "url": "No disponible",
+                            "posicion": idx + 1,
+                            "metodo_extraccion": {
+                                "titulo": "ninguno",
+                                "precio": "ninguno",
+                                "url": "ninguno"
+                            }
+                        }
+                        
+                        # Extracción de título con múltiples métodos
+                        title_found = False
+                        
+                        # Intento 1: Título con clase específica
+                        if not title_found:
+                            try:
+                                title_elem = item.find_element(By.XPATH, './/h2[contains(@class, "ui-search-item__title")]')
+                                title_text = title_elem.text.strip()
                                 if title_text:
                                     product_data["titulo"] = title_text
-                                    product_data["metodo_extraccion"]["titulo"] = "attr_title"
+                                    product_data["metodo_extraccion"]["titulo"] = "xpath_title_class"
                                     title_found = True
-                                    log(f"Título encontrado con atributo title: {title_text[:30]}...")
-                        except:
-                            pass
-                    
-                    # Intento 4: JavaScript - buscar título en todo el contenedor
-                    if not title_found:
-                        try:
-                            js_result = driver.execute_script("""
-                                var container = arguments[0];
-                                var possibleTitles = [
-                                    container.querySelector('h2'),
-                                    container.querySelector('.ui-search-item__title'),
-                                    container.querySelector('[title]'),
-                                    container.querySelector('a')
-                                ];
-                                
-                                for (var i = 0; i < possibleTitles.length; i++) {
-                                    var elem = possibleTitles[i];
-                                    if (elem) {
-                                        if (elem.title) return elem.title;
-                                        if (elem.textContent) return elem.textContent;
+                                    logger.debug("Título encontrado con selector específico: %.30s...", title_text)
+                            except:
+                                pass
+                        
+                        # Intento 2: Cualquier h2 dentro del elemento
+                        if not title_found:
+                            try:
+                                title_elems = item.find_elements(By.TAG_NAME, 'h2')
+                                if title_elems:
+                                    title_text = title_elems[0].text.strip()
+                                    if title_text:
+                                        product_data["titulo"] = title_text
+                                        product_data["metodo_extraccion"]["titulo"] = "tag_h2"
+                                        title_found = True
+                                        logger.debug("Título encontrado con tag h2: %.30s...", title_text)
+                            except:
+                                pass
+                        
+                        # Intento 3: Elemento con atributo title
+                        if not title_found:
+                            try:
+                                title_attr_elems = item.find_elements(By.XPATH, './/*[@title]')
+                                if title_attr_elems:
+                                    title_text = title_attr_elems[0].get_attribute('title').strip()
+                                    if title_text:
+                                        product_data["titulo"] = title_text
+                                        product_data["metodo_extraccion"]["titulo"] = "attr_title"
+                                        title_found = True
+                                        logger.debug("Título encontrado con atributo title: %.30s...", title_text)
+                            except:
+                                pass
+                        
+                        # Intento 4: JavaScript - buscar título en todo el contenedor
+                        if not title_found:
+                            try:
+                                js_result = driver.execute_script("""
+                                    var container = arguments[0];
+                                    var possibleTitles = [
+                                        container.querySelector('h2'),
+                                        container.querySelector('.ui-search-item__title'),
+                                        container.querySelector('[title]'),
+                                        container.querySelector('a')
+                                    ];
+                                    
+                                    for (var i = 0; i < possibleTitles.length; i++) {
+                                        var elem = possibleTitles[i];
+                                        if (elem) {
+                                            if (elem.title) return elem.title;
+                                            if (elem.textContent) return elem.textContent;
+                                        }
                                     }
-                                }
+                                    
+                                    return null;
+                                """, item)
                                 
-                                return null;
-                            """, item)
-                            
-                            if js_result:
-                                product_data["titulo"] = js_result.strip()
-                                product_data["metodo_extraccion"]["titulo"] = "javascript_title"
-                                title_found = True
-                                log(f"Título encontrado con JavaScript: {js_result[:30]}...")
-                        except:
-                            pass
-                    
-                    # Extracción de precio con enfoque específico para México
-                    price_found = False
-                    
-                    # Intento 1: Obtener todos los componentes del precio y juntarlos
-                    if not price_found:
-                        try:
-                            # Primero buscamos el contenedor principal del precio
-                            price_container = item.find_element(By.XPATH, 
-                                './/div[contains(@class, "ui-search-price")]')
-                            
-                            # Extraer todos los componentes del precio
-                            symbol = price_container.find_element(By.XPATH, 
-                                './/span[contains(@class, "andes-money-amount__currency-symbol")]').text.strip()
-                            
-                            fraction = price_container.find_element(By.XPATH, 
-                                './/span[contains(@class, "andes-money-amount__fraction")]').text.strip()
-                            
-                            # Intentar obtener decimales si existen
-                            try:
-                                decimals = price_container.find_element(By.XPATH, 
-                                    './/span[contains(@class, "andes-money-amount__cents")]').text.strip()
-                                full_price = f"{symbol} {fraction}.{decimals}"
+                                if js_result:
+                                    product_data["titulo"] = js_result.strip()
+                                    product_data["metodo_extraccion"]["titulo"] = "javascript_title"
+                                    title_found = True
+                                    logger.debug("Título encontrado con JavaScript: %.30s...", js_result)
                             except:
-                                full_price = f"{symbol} {fraction}"
-                            
-                            if full_price:
-                                product_data["precio"] = full_price
-                                product_data["metodo_extraccion"]["precio"] = "componentes_separados"
-                                price_found = True
-                                log(f"Precio completo extraído por componentes: {full_price}")
-                        except Exception as e:
-                            log(f"Error al extraer precio por componentes: {str(e)[:50]}...")
-                    
-                    # Intento 2: Buscar el precio como texto directo
-                    if not price_found:
-                        try:
-                            price_elem = item.find_element(By.XPATH, './/span[contains(@class, "price-tag-amount")]')
-                            
-                            # Capturar todo el contenido en texto
-                            raw_price_text = price_elem.text.strip()
-                            
-                            # Intentar procesar el texto para asegurar que incluye símbolo y monto
-                            if '$' in raw_price_text:
-                                product_data["precio"] = raw_price_text
-                                product_data["metodo_extraccion"]["precio"] = "texto_directo"
-                                price_found = True
-                                log(f"Precio encontrado como texto directo: {raw_price_text}")
-                            else:
-                                # Si no incluye el símbolo, intentar encontrarlo cerca
-                                symbol_elem = item.find_element(By.XPATH, './/span[contains(@class, "currency-symbol")]')
-                                if symbol_elem:
-                                    symbol = symbol_elem.text.strip()
-                                    product_data["precio"] = f"{symbol} {raw_price_text}"
-                                    product_data["metodo_extraccion"]["precio"] = "texto_simbolo_separado"
-                                    price_found = True
-                                    log(f"Precio reconstruido: {symbol} {raw_price_text}")
-                        except Exception as e:
-                            log(f"Error al extraer precio como texto directo: {str(e)[:50]}...")
-                    
-                    # Intento 3: Método avanzado con JavaScript para formato mexicano
-                    if not price_found:
-                        try:
-                            js_result = driver.execute_script("""
-                                var container = arguments[0];
+                                pass
+                        
+                        # Extracción de precio con enfoque específico para México
+                        price_found = False
+                        
+                        # Intento 1: Obtener todos los componentes del precio y juntarlos
+                        if not price_found:
+                            try:
+                                # Primero buscamos el contenedor principal del precio
+                                price_container = item.find_element(By.XPATH, 
+                                    './/div[contains(@class, "ui-search-price")]')
                                 
-                                // 1. Intentar obtener componentes separados
-                                var symbol = container.querySelector('.andes-money-amount__currency-symbol');
-                                var fraction = container.querySelector('.andes-money-amount__fraction');
-                                var cents = container.querySelector('.andes-money-amount__cents');
+                                # Extraer todos los componentes del precio
+                                symbol = price_container.find_element(By.XPATH, 
+                                    './/span[contains(@class, "andes-money-amount__currency-symbol")]').text.strip()
                                 
-                                if (symbol && fraction) {
-                                    var price = symbol.textContent.trim() + ' ' + fraction.textContent.trim();
-                                    if (cents) {
-                                        price += '.' + cents.textContent.trim();
-                                    }
-                                    return price;
-                                }
+                                fraction = price_container.find_element(By.XPATH, 
+                                    './/span[contains(@class, "andes-money-amount__fraction")]').text.strip()
+                                
+                                # Intentar obtener decimales si existen
+                                try:
+                                    decimals = price_container.find_element(By.XPATH, 
+                                        './/span[contains(@class, "andes-money-amount__cents")]').text.strip()
+                                    full_price = f"{symbol} {fraction}.{decimals}"
+                                except:
+                                    full_price = f"{symbol} {fraction}"
+                                
+                                if full_price:
+                                    product_data["precio"] = full_price
+                                    product_data["metodo_extraccion"]["precio"] = "componentes_separados"
+                                    price_found = True
+                                    logger.debug("Precio completo extraído por componentes: %s", full_price)
+                            except Exception as e:
+                                logger.debug("Error al extraer precio por componentes: %.50s...", e)
+                        
+                        # Intento 2: Buscar el precio como texto directo
+                        if not price_found:
+                            try:
+                                price_elem = item.find_element(By.XPATH, './/span[contains(@class, "price-tag-amount")]')
                                 
-                                // 2. Buscar cualquier elemento que contenga formato de precio mexicano
-                                var allText = container.innerText;
-                                var priceRegex = /\\$\\s?[0-9,]+(\\.\\d{2})?/g;
-                                var matches = allText.match(priceRegex);
-                                if (matches && matches.length > 0) {
-                                    return matches[0].trim();
-                                }
+                                # Capturar todo el contenido en texto
+                                raw_price_text = price_elem.text.strip()
                                 
-                                // 3. Extraer cualquier texto con $ y números
-                                var allElements = container.querySelectorAll('*');
-                                for (var i = 0; i < allElements.length; i++) {
-                                    var text = allElements[i].textContent.trim();
-                                    if (text.includes('$') && /\\d/.test(text)) {
-                                        return text;
+                                # Intentar procesar el texto para asegurar que incluye símbolo y monto
+                                if '$' in raw_price_text:
+                                    product_data["precio"] = raw_price_text
+                                    product_data["metodo_extraccion"]["precio"] = "texto_directo"
+                                    price_found = True
+                                    logger.debug("Precio encontrado como texto directo: %s", raw_price_text)
+                                else:
+                                    # Si no incluye el símbolo, intentar encontrarlo cerca
+                                    symbol_elem = item.find_element(By.XPATH, './/span[contains(@class, "currency-symbol")]')
+                                    if symbol_elem:
+                                        symbol = symbol_elem.text.strip()
+                                        product_data["precio"] = f"{symbol} {raw_price_text}"
+                                        product_data["metodo_extraccion"]["precio"] = "texto_simbolo_separado"
+                                        price_found = True
+                                        logger.debug("Precio reconstruido: %s %s", symbol, raw_price_text)
+                            except Exception as e:
+                                logger.debug("Error al extraer precio como texto directo: %.50s...", e)
+                        
+                        # Intento 3: Método avanzado con JavaScript para formato mexicano
+                        if not price_found:
+                            try:
+                                js_result = driver.execute_script("""
+                                    var container = arguments[0];
+                                    
+                                    // 1. Intentar obtener componentes separados
+                                    var symbol = container.querySelector('.andes-money-amount__currency-symbol');
+                                    var fraction = container.querySelector('.andes-money-amount__fraction');
+                                    var cents = container.querySelector('.andes-money-amount__cents');
+                                    
+                                    if (symbol && fraction) {
+                                        var price = symbol.textContent.trim() + ' ' + fraction.textContent.trim();
+                                        if (cents) {
+                                            price += '.' + cents.textContent.trim();
+                                        }
+                                        return price;
                                     }
-                                }
+                                    
+                                    // 2. Buscar cualquier elemento que contenga formato de precio mexicano
+                                    var allText = container.innerText;
+                                    var priceRegex = /\\$\\s?[0-9,]+(\\.\\d{2})?/g;
+                                    var matches = allText.match(priceRegex);
+                                    if (matches && matches.length > 0) {
+                                        return matches[0].trim();
+                                    }
+                                    
+                                    // 3. Extraer cualquier texto con $ y números
+                                    var allElements = container.querySelectorAll('*');
+                                    for (var i = 0; i < allElements.length; i++) {
+                                        var text = allElements[i].textContent.trim();
+                                        if (text.includes('$') && /\\d/.test(text)) {
+                                            return text;
+                                        }
+                                    }
+                                    
+                                    return null;
+                                """, item)
                                 
-                                return null;
-                            """, item)
-                            
-                            if js_result:
-                                product_data["precio"] = js_result.strip()
-                                product_data["metodo_extraccion"]["precio"] = "javascript_precio_mx"
-                                price_found = True
-                                log(f"Precio encontrado con JavaScript MX: {js_result}")
-                        except Exception as e:
-                            log(f"Error al extraer precio con JavaScript: {str(e)[:50]}...")
-                    
-                    # Intento 4: Último recurso - buscar texto que parezca un precio en todo el elemento
-                    if not price_found:
-                        try:
-                            # Obtener todo el texto del elemento
-                            all_text = item.text
-                            
-                            # Buscar patrones de precio en el texto
-                            price_patterns = [
-                                r'\$\s?[\d,]+\.?\d*',  # $1,234.56 o $1,234
-                                r'\$\s?[\d.]+,?\d*',   # $1.234,56 o $1.234
-                                r'\$\s?\d+',           # $1234
-                            ]
-                            
-                            for pattern in price_patterns:
-                                matches = re.findall(pattern, all_text)
-                                if matches:
-                                    product_data["precio"] = matches[0].strip()
-                                    product_data["metodo_extraccion"]["precio"] = "regex_pattern"
+                                if js_result:
+                                    product_data["precio"] = js_result.strip()
+                                    product_data["metodo_extraccion"]["precio"] = "javascript_precio_mx"
                                     price_found = True
-                                    log(f"Precio encontrado con regex: {matches[0]}")
-                                    break
-                        except Exception as e:
-                            log(f"Error al extraer precio con regex: {str(e)[:50]}...")
-                    
-                    # Si todavía no encontramos precio, guardar cualquier texto que tenga "$"
-                    if not price_found:
-                        try:
-                            dollar_elements = item.find_elements(By.XPATH, './/*[contains(text(), "$")]')
-                            if dollar_elements:
-                                for elem in dollar_elements:
-                                    text = elem.text.strip()
-                                    if '$' in text and len(text) < 20:  # Evitar textos largos
-                                        product_data["precio"] = text
-                                        product_data["metodo_extraccion"]["precio"] = "contains_dollar_sign"
+                                    logger.debug("Precio encontrado con JavaScript MX: %s", js_result)
+                            except Exception as e:
+                                logger.debug("Error al extraer precio con JavaScript: %.50s...", e)
+                        
+                        # Intento 4: Último recurso - buscar texto que parezca un precio en todo el elemento
+                        if not price_found:
+                            try:
+                                # Obtener todo el texto del elemento
+                                all_text = item.text
+                                
+                                # Buscar patrones de precio en el texto
+                                price_patterns = [
+                                    r'\$\s?[\d,]+\.?\d*',  # $1,234.56 o $1,234
+                                    r'\$\s?[\d.]+,?\d*',   # $1.234,56 o $1.234
+                                    r'\$\s?\d+',           # $1234
+                                ]
+                                
+                                for pattern in price_patterns:
+                                    matches = re.findall(pattern, all_text)
+                                    if matches:
+                                        product_data["precio"] = matches[0].strip()
+                                        product_data["metodo_extraccion"]["precio"] = "regex_pattern"
                                         price_found = True
-                                        log(f"Precio encontrado con símbolo $: {text}")
+                                        logger.debug("Precio encontrado con regex: %s", matches[0])
                                         break
-                        except Exception as e:
-                            log(f"Error al buscar elementos con $: {str(e)[:50]}...")
-                    
-                    # Extracción de URL del producto
-                    try:
-                        link_elems = item.find_elements(By.XPATH, './/a[contains(@class, "ui-search-link")]')
-                        if link_elems:
-                            href = link_elems[0].get_attribute('href')
-                            if href:
-                                product_data["url"] = href
-                                product_data["metodo_extraccion"]["url"] = "class_link"
-                                log(f"URL encontrada: {href[:50]}...")
-                        else:
-                            # Probar con cualquier enlace dentro del elemento
-                            any_links = item.find_elements(By.TAG_NAME, 'a')
-                            if any_links:
-                                href = any_links[0].get_attribute('href')
+                            except Exception as e:
+                                logger.debug("Error al extraer precio con regex: %.50s...", e)
+                        
+                        # Si todavía no encontramos precio, guardar cualquier texto que tenga "$"
+                        if not price_found:
+                            try:
+                                dollar_elements = item.find_elements(By.XPATH, './/*[contains(text(), "$")]')
+                                if dollar_elements:
+                                    for elem in dollar_elements:
+                                        text = elem.text.strip()
+                                        if '$' in text and len(text) < 20:  # Evitar textos largos
+                                            product_data["precio"] = text
+                                            product_data["metodo_extraccion"]["precio"] = "contains_dollar_sign"
+                                            price_found = True
+                                            logger.debug("Precio encontrado con símbolo $: %s", text)
+                                            break
+                            except Exception as e:
+                                logger.debug("Error al buscar elementos con $: %.50s...", e)
+                        
+                        # Extracción de URL del producto
+                        try:
+                            link_elems = item.find_elements(By.XPATH, './/a[contains(@class, "ui-search-link")]')
+                            if link_elems:
+                                href = link_elems[0].get_attribute('href')
                                 if href:
                                     product_data["url"] = href
-                                    product_data["metodo_extraccion"]["url"] = "tag_a"
-                                    log(f"URL encontrada (tag genérico): {href[:50]}...")
+                                    product_data["metodo_extraccion"]["url"] = "class_link"
+                                    logger.debug("URL encontrada: %.50s...", href)
+                            else:
+                                # Probar con cualquier enlace dentro del elemento
+                                any_links = item.find_elements(By.TAG_NAME, 'a')
+                                if any_links:
+                                    href = any_links[0].get_attribute('href')
+                                    if href:
+                                        product_data["url"] = href
+                                        product_data["metodo_extraccion"]["url"] = "tag_a"
+                                        logger.debug("URL encontrada (tag genérico): %.50s...", href)
+                        except Exception as e:
+                            logger.debug("Error al extraer URL: %s", e)
+                        
+                        # Si no se encontró URL, intentar con JavaScript
+                        if product_data["url"] == "No disponible":
+                            try:
+                                url_js = driver.execute_script("return arguments[0].querySelector('a')?.href || null;", item)
+                                if url_js:
+                                    product_data["url"] = url_js
+                                    product_data["metodo_extraccion"]["url"] = "javascript"
+                                    logger.debug("URL encontrada con JavaScript: %.50s...", url_js)
+                            except:
+                                pass
+                        
+                        # HTML del elemento solo si algún campo falló (o por muestreo)
+                        if diagnostics.wants_card(product_data):
+                            product_data["html_debug"] = capture_card(driver, item)
+                        
+                        # Registrar resultado de la extracción
+                        logger.debug("Producto %d procesado: %.50s... | %s | %.30s... | %s", idx + 1,
+                                     product_data["titulo"], product_data["precio"], product_data["url"],
+                                     product_data["metodo_extraccion"])
+                        
+                        # Screenshot de la tarjeta según el muestreo, ya con los métodos conocidos
+                        if capture and capture.wants(idx, product_data):
+                            try:
+                                capture.capture_element(item, f"producto_safari_{idx+1}.png")
+                            except:
+                                logger.warning("No se pudo capturar el elemento")
+                        
+                        # Añadir a nuestra lista con el precio normalizado
+                        annotate_prices([product_data])
+                        products_data.append(product_data)
+                        
+                        # Agregar al archivo después de cada producto
+                        writer.write(product_data)
+                        logger.debug("Datos guardados en: %s", writer.path)
+                        
                     except Exception as e:
-                        log(f"Error al extraer URL: {e}")
-                    
-                    # Si no se encontró URL, intentar con JavaScript
-                    if product_data["url"] == "No disponible":
-                        try:
-                            url_js = driver.execute_script("return arguments[0].querySelector('a')?.href || null;", item)
-                            if url_js:
-                                product_data["url"] = url_js
-                                product_data["metodo_extraccion"]["url"] = "javascript"
-                                log(f"URL encontrada con JavaScript: {url_js[:50]}...")
-                        except:
-                            pass
-                    
-                    # Capturar HTML del elemento para diagnóstico y debugging
-                    try:
-                        product_data["html_debug"] = {
-                            "outer_html": driver.execute_script("return arguments[0].outerHTML.substring(0, 1000)", item),
-                            "class": item.get_attribute("class")
-                        }
-                    except:
-                        product_data["html_debug"] = {"error": "No se pudo capturar HTML"}
-                    
-                    # Registrar resultado de la extracción
-                    log(f"Producto {idx+1} procesado:")
-                    log(f"  - Título: {product_data['titulo'][:50]}...")
-                    log(f"  - Precio: {product_data['precio']}")
-                    log(f"  - URL: {product_data['url'][:30]}...")
-                    log(f"  - Métodos: {product_data['metodo_extraccion']}")
-                    
-                    # Añadir a nuestra lista
-                    products_data.append(product_data)
-                    
-                    # Guardar después de cada producto
-                    with open(output_filename, 'w', encoding='utf-8') as f:
-                        json.dump(products_data, f, ensure_ascii=False, indent=4)
-                    log(f"Datos guardados en: {output_filename}")
-                    
-                except Exception as e:
-                    log(f"Error procesando producto {idx+1}: {e}")
-                    continue
-        else:
-            log("No se pudieron encontrar productos para procesar")
+                        logger.warning("Error procesando producto %d: %s", idx + 1, e)
+                        continue
+            else:
+                logger.warning("No se pudieron encontrar productos para procesar")
+        
+        # HTML de la página y formatos de precio para diagnóstico si alguna tarjeta falló
+        if diagnostics.wants_page(products_data):
+            info = page_report(products_data, search_url, diagnostics)
+            info["formatos_precio"] = price_formats(driver)
+            logger.debug("Formatos de precio en la página: %s", info["formatos_precio"])
+            diagnostics.save_page(dump_prefix, 1, page_source, info)
     
     except Exception as e:
-        log(f"Error general: {e}")
+        logger.error("Error general: %s", e)
     
     finally:
         try:
             driver.quit()
             log("Navegador cerrado correctamente")
         except:
-            log("Error al cerrar el navegador")
+            logger.warning("Error al cerrar el navegador")
+        waits.log_summary(log)
+        diagnostics.log_summary(log)
+        if capture:
+            capture.close(log)
+        
+        # Generar el JSON con indentación a partir del .jsonl
+        writer.close()
+        # Si el nombre ya existía, el .jsonl (y el .json) llevan sufijo
+        output_filename = json_path_for(writer.path)
+        if writer.count:
+            convert_to_json(writer.path, output_filename)
     
     # Verificar productos y archivos finales
     if products_data:
@@ -524,6 +545,10 @@ def scrape_mercadolibre_safari(search_term, num_pages=1):
                 
                 log(f"Títulos extraídos correctamente: {titles_ok}/{len(saved_data)} ({(titles_ok/len(saved_data))*100:.1f}%)")
                 log(f"Precios extraídos correctamente: {prices_ok}/{len(saved_data)} ({(prices_ok/len(saved_data))*100:.1f}%)")
+                normalized = [p["precio_normalizado"] for p in saved_data if "precio_normalizado" in p]
+                cents_ok = sum(1 for n in normalized if n["amount_cents"] is not None)
+                ambiguous = sum(1 for n in normalized if n["ambiguous"])
+                log(f"Precios normalizados a centavos: {cents_ok}/{len(saved_data)} ({ambiguous} ambiguos)")
                 log(f"URLs extraídas correctamente: {urls_ok}/{len(saved_data)} ({(urls_ok/len(saved_data))*100:.1f}%)")
                 
                 # Mostrar métodos de extracción usados
@@ -547,9 +572,9 @@ def scrape_mercadolibre_safari(search_term, num_pages=1):
                 log("URL: " + ", ".join([f"{m}({c})" for m, c in url_methods.items()]))
                 
             except Exception as e:
-                log(f"Error al verificar el archivo guardado: {e}")
+                logger.error("Error al verificar el archivo guardado: %s", e)
         else:
-            log(f"¡ADVERTENCIA! Archivo no encontrado: {output_filename}")
+            logger.warning("Archivo no encontrado: %s", output_filename)
             
             # Intento final de guardado
             backup_file = os.path.join(output_dir, f"backup_productos_safari_{search_term.replace(' ', '_')}.json")
@@ -558,9 +583,9 @@ def scrape_mercadolibre_safari(search_term, num_pages=1):
                     json.dump(products_data, f, ensure_ascii=False, indent=4)
                 log(f"Respaldo creado en: {backup_file}")
             except Exception as e:
-                log(f"Error creando respaldo: {e}")
+                logger.error("Error creando respaldo: %s", e)
     else:
-        log("No se obtuvieron productos. Verifica el selector o si la página ha cambiado su estructura.")
+        logger.warning("No se obtuvieron productos. Verifica el selector o si la página ha cambiado su estructura.")
     
     return products_data
 
@@ -575,7 +600,10 @@ if __name__ == "__main__":
         search_term = "iphone"
         print(f"Usando término por defecto: '{search_term}'")
     
+    # Screenshots opcionales
+    screenshots = input("¿Guardar screenshots para diagnóstico? (s/N): ").strip().lower() == "s"
+    
     # Ejecutar script
-    results = scrape_mercadolibre_safari(search_term, 1)
+    results = scrape_mercadolibre_safari(search_term, 1, screenshots=screenshots)
     
     print("\nScript finalizado. Revisa los logs para detalles.")
\ No newline at end of file
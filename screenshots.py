@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+"""
+Screenshots opcionales fuera del bucle de extracción
+- Desactivados por defecto; se activan pasando un ScreenshotCapture al scraper
+- En el hilo del driver solo se pide la captura (base64 tal como la devuelve WebDriver);
+  la decodificación y la escritura a disco se hacen en un hilo de fondo
+- La cola es acotada: si el disco no da abasto se descartan capturas en lugar de frenar el driver
+- Muestreo: una de cada N tarjetas, o solo las tarjetas que usaron un método de respaldo
+  (distinto del esperado para la vista, el mismo criterio que el diagnóstico)
+"""
+import base64
+import os
+import queue
+import threading
+
+from diagnostics import failed_fields
+
+def used_fallback(product_data, diagnostics=None, layout=None):
+    """True si algún campo quedó "No disponible" o no salió con el método esperado para la vista
+    - diagnostics: DiagnosticsPolicy con los métodos esperados por vista; sin ella solo cuentan los faltantes
+    """
+    if diagnostics is not None:
+        return bool(diagnostics.failed_fields(product_data, layout))
+    return bool(failed_fields(product_data))
+
+class ScreenshotCapture:
+    """Captura de screenshots con escritura en segundo plano y muestreo por tarjeta"""
+
+    def __init__(self, every=1, only_fallback=False, max_pending=8, page=True):
+        self.every = max(1, every)
+        self.only_fallback = only_fallback
+        self.max_pending = max_pending
+        self.page = page
+        self.output_dir = None
+        self.diagnostics = None
+        self.written = 0
+        self.dropped = 0
+        self.errors = 0
+        self._queue = None
+        self._thread = None
+
+    def start(self, output_dir, diagnostics=None):
+        """diagnostics: DiagnosticsPolicy que define el método esperado por vista (only_fallback)"""
+        self.output_dir = output_dir
+        self.diagnostics = diagnostics
+        self._queue = queue.Queue(maxsize=self.max_pending)
+        self._thread = threading.Thread(target=self._run, name="screenshots", daemon=True)
+        self._thread.start()
+        return self
+
+    def wants(self, idx, product_data=None, layout=None):
+        """Decide si se captura la tarjeta idx (base 0) según el muestreo configurado"""
+        if self.only_fallback:
+            return product_data is not None and used_fallback(product_data, self.diagnostics, layout)
+        return idx % self.every == 0
+
+    def capture_page(self, driver, filename):
+        if self.page:
+            self._submit(filename, driver.get_screenshot_as_base64())
+
+    def capture_element(self, element, filename):
+        self._submit(filename, element.screenshot_as_base64)
+
+    def _submit(self, filename, data):
+        try:
+            self._queue.put_nowait((filename, data))
+        except queue.Full:
+            self.dropped += 1
+
+    def _run(self):
+        while True:
+            job = self._queue.get()
+            if job is None:
+                break
+            filename, data = job
+            path = os.path.join(self.output_dir, filename)
+            try:
+                with open(path + ".tmp", 'wb') as f:
+                    f.write(base64.b64decode(data))
+                os.replace(path + ".tmp", path)
+                self.written += 1
+            except Exception:
+                self.errors += 1
+
+    def close(self, log=None):
+        """Espera a que se escriban las capturas pendientes"""
+        if self._thread is None:
+            return
+        self._queue.put(None)
+        self._thread.join()
+        self._thread = None
+        if log:
+            log(f"Screenshots: {self.written} guardados en {self.output_dir}, "
+                f"{self.dropped} descartados por cola llena, {self.errors} con error")
@@ -0,0 +1,188 @@
+# -*- coding: utf-8 -*-
+"""
+Orden adaptativo de los métodos de extracción (título, precio, URL)
+- Aprende por tipo de vista (grid/list) qué método da el valor con el orden fijo de la
+  cascada (el primero que acierta) y registra aciertos y tiempo de cada método
+- Ganador verificado: cuando el mismo método fue el primer acierto del orden fijo en varias
+  cascadas completas seguidas, se intenta primero; si falla se sigue con el orden fijo, así
+  el resultado es el del orden fijo y en la vista habitual se evitan los intentos fallidos
+- Cada cierto número de tarjetas se vuelve a ejecutar la cascada completa para verificar el
+  ganador; si el primer acierto cambió (o el ganador falla), deja de adelantarse
+- Los métodos equivalentes (devuelven el mismo valor) se ordenan entre sí por aciertos / tiempo
+- Las estadísticas se guardan en JSON y decaen con el tiempo (pesan más las recientes)
+"""
+import json
+import os
+import threading
+import time
+
+STRATEGIES_FILENAME = "estrategias_extraccion.json"
+
+class StrategyCache:
+    """Estadísticas de acierto y latencia por (vista, campo, método) y ganador verificado por (vista, campo)
+    - explore_every: cada cuántas tarjetas se ejecuta la cascada completa para verificar
+    - confirmations: cascadas completas seguidas con el mismo primer acierto para adelantarlo
+    """
+
+    def __init__(self, path=None, explore_every=20, decay=0.98, default_seconds=0.05, confirmations=3):
+        self.path = path
+        self.explore_every = explore_every
+        self.decay = decay
+        self.default_seconds = default_seconds
+        self.confirmations = confirmations
+        self.stats = {}
+        self.winners = {}
+        self.calls = {}
+        self._lock = threading.Lock()
+        if path:
+            self.load()
+
+    def load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            data = {}
+        # Archivos anteriores: solo las estadísticas por vista
+        if "estadisticas" in data:
+            self.stats, self.winners = data["estadisticas"], data.get("ganadores", {})
+        else:
+            self.stats, self.winners = data, {}
+
+    def save(self):
+        if not self.path:
+            return
+        try:
+            with self._lock:
+                data = json.dumps({"estadisticas": self.stats, "ganadores": self.winners}, ensure_ascii=False, indent=4)
+            with open(self.path + ".tmp", 'w', encoding='utf-8') as f:
+                f.write(data)
+            os.replace(self.path + ".tmp", self.path)
+        except OSError:
+            pass
+
+    def _method_stats(self, layout, field, method):
+        return self.stats.setdefault(layout, {}).setdefault(field, {}).setdefault(
+            method, {"intentos": 0.0, "aciertos": 0.0, "segundos": 0.0})
+
+    def _score(self, stats):
+        # Suavizado de Laplace: un método sin datos se considera prometedor
+        hit_rate = (stats["aciertos"] + 1) / (stats["intentos"] + 2)
+        seconds = stats["segundos"] / stats["intentos"] if stats["intentos"] else self.default_seconds
+        return hit_rate / max(seconds, 1e-4)
+
+    def plan(self, layout, field, methods, equivalent=()):
+        """(orden de intentos, ganador adelantado o None)
+        - Sin ganador verificado, o en las tarjetas de verificación, es el orden fijo de methods
+          (con los grupos equivalentes ordenados por aciertos / tiempo)
+        - Con ganador verificado: el ganador y después el orden fijo sin él
+        - equivalent: grupos de métodos consecutivos que devuelven el mismo valor
+        """
+        with self._lock:
+            key = (layout, field)
+            self.calls[key] = self.calls.get(key, 0) + 1
+            explore = self.explore_every and self.calls[key] % self.explore_every == 0
+
+            ordered = []
+            for block in _blocks(methods, equivalent):
+                known = {method: self._method_stats(layout, field, method) for method in block}
+                ranked = sorted(block, key=lambda method: -self._score(known[method]))
+                if explore and len(block) > 1:
+                    least_tried = min(block, key=lambda method: known[method]["intentos"])
+                    ranked.remove(least_tried)
+                    ranked.insert(0, least_tried)
+                ordered.extend(ranked)
+
+            winner = self._verified_winner(layout, field)
+            if explore or winner not in ordered or ordered[0] == winner:
+                return ordered, None
+            ordered.remove(winner)
+            return [winner] + ordered, winner
+
+    def _verified_winner(self, layout, field):
+        winner = self.winners.get(layout, {}).get(field)
+        return winner["metodo"] if winner and winner["confirmaciones"] >= self.confirmations else None
+
+    def order(self, layout, field, methods, equivalent=()):
+        """Devuelve los nombres de methods en el orden en que conviene intentarlos"""
+        return self.plan(layout, field, methods, equivalent)[0]
+
+    def confirm(self, layout, field, method):
+        """Primer acierto de una cascada en el orden fijo: confirma o reemplaza al ganador"""
+        with self._lock:
+            winners = self.winners.setdefault(layout, {})
+            winner = winners.get(field)
+            if winner and winner["metodo"] == method:
+                winner["confirmaciones"] += 1
+            else:
+                winners[field] = {"metodo": method, "confirmaciones": 1}
+
+    def record(self, layout, field, method, hit, seconds):
+        with self._lock:
+            stats = self._method_stats(layout, field, method)
+            stats["intentos"] = stats["intentos"] * self.decay + 1
+            stats["aciertos"] = stats["aciertos"] * self.decay + (1 if hit else 0)
+            stats["segundos"] = stats["segundos"] * self.decay + seconds
+
+    def expected_method(self, layout, field):
+        """Método que da el campo con el orden fijo en esta vista (ganador o el de más aciertos), o None"""
+        with self._lock:
+            winner = self.winners.get(layout, {}).get(field)
+            if winner:
+                return winner["metodo"]
+            methods = self.stats.get(layout, {}).get(field, {})
+            hits = {method: stats["aciertos"] for method, stats in methods.items() if stats["aciertos"] > 0}
+        return max(hits, key=hits.get) if hits else None
+
+    def summary(self):
+        """{vista: {campo: ganador verificado o "orden fijo"}}"""
+        with self._lock:
+            return {
+                layout: {field: self._verified_winner(layout, field) or "orden fijo" for field in fields}
+                for layout, fields in self.stats.items()
+            }
+
+    def log_summary(self, log):
+        for layout, fields in self.summary().items():
+            log(f"Método adelantado por campo ({layout}): " +
+                "; ".join(f"{field}: {method}" for field, method in fields.items()))
+
+def _blocks(methods, equivalent):
+    """Parte methods en bloques: cada grupo equivalente junto, los demás métodos solos"""
+    group_of = {method: tuple(group) for group in equivalent for method in group}
+    blocks = []
+    for method in methods:
+        group = group_of.get(method)
+        if group and blocks and blocks[-1][0] in group:
+            blocks[-1].append(method)
+        else:
+            blocks.append([method])
+    return blocks
+
+def run_strategies(cache, layout, field, strategies, *args, equivalent=()):
+    """Ejecuta las estrategias de un campo hasta el primer acierto
+    - strategies: lista de (nombre, función) en el orden por defecto
+    - cada función recibe *args y devuelve (valor, método) o None; las excepciones cuentan como fallo
+    - equivalent: grupos de estrategias que devuelven el mismo valor
+    Devuelve (valor, método) o None
+    """
+    by_name = dict(strategies)
+    names = [name for name, _ in strategies]
+    promoted = None
+    if cache is not None:
+        names, promoted = cache.plan(layout, field, names, equivalent)
+
+    for name in names:
+        start = time.perf_counter()
+        try:
+            result = by_name[name](*args)
+        except Exception:
+            result = None
+        if cache is not None:
+            cache.record(layout, field, name, bool(result), time.perf_counter() - start)
+        if result:
+            # Sin adelantar (o si el adelantado falló) es el primer acierto del orden fijo
+            if cache is not None and name != promoted:
+                cache.confirm(layout, field, name)
+            return result
+    return None
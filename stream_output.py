@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+"""
+Salida incremental en JSON Lines (un producto por línea)
+- Cada producto se agrega con una sola escritura O_APPEND: una línea nunca queda
+  mezclada con otra y, si el proceso muere, solo se puede perder la última línea
+- El archivo se crea con el primer producto; una ejecución nueva nunca escribe en un
+  archivo existente (O_EXCL, con sufijo _1, _2... si el nombre ya está ocupado) y solo
+  la reanudación de un lote agrega al .jsonl anterior
+- Política de fsync configurable: "always", "batch", "close" o "never"
+- Conversión bajo demanda al JSON con indentación que usan los scripts
+"""
+import json
+import os
+
+FSYNC_POLICIES = ("always", "batch", "close", "never")
+
+def stream_path_for(output_filename):
+    """Ruta .jsonl que acompaña al archivo .json de salida"""
+    root, _ = os.path.splitext(output_filename)
+    return root + ".jsonl"
+
+def json_path_for(stream_filename):
+    """Ruta .json que se genera a partir del .jsonl"""
+    return os.path.splitext(stream_filename)[0] + ".json"
+
+class ProductStreamWriter:
+    """Agrega productos a un archivo JSON Lines a medida que se extraen
+    - resume: sigue agregando al archivo existente (reanudación desde el diario de avance)
+    - path cambia si el nombre pedido ya existía y se usó uno con sufijo
+    """
+
+    def __init__(self, path, fsync="close", batch_size=10, resume=False):
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"Política de fsync no válida: {fsync}. Opciones: {', '.join(FSYNC_POLICIES)}")
+        self.path = path
+        self.fsync = fsync
+        self.batch_size = batch_size
+        self.resume = resume
+        self.count = 0
+        self._unsynced = 0
+        self._fd = None
+
+    def _open(self):
+        if self.resume:
+            self._fd = os.open(self.path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+            return
+        root, ext = os.path.splitext(self.path)
+        suffix = 0
+        while True:
+            try:
+                self._fd = os.open(self.path, os.O_WRONLY | os.O_CREAT | os.O_EXCL | os.O_APPEND, 0o644)
+                return
+            except FileExistsError:
+                suffix += 1
+                self.path = f"{root}_{suffix}{ext}"
+
+    def write(self, product):
+        """Escribe un producto como una línea completa en una sola llamada al sistema"""
+        line = (json.dumps(product, ensure_ascii=False) + "\n").encode("utf-8")
+        if self._fd is None:
+            self._open()
+        os.write(self._fd, line)
+        self.count += 1
+        self._unsynced += 1
+
+        if self.fsync == "always" or (self.fsync == "batch" and self._unsynced >= self.batch_size):
+            self.sync()
+
+    def write_many(self, products):
+        for product in products:
+            self.write(product)
+
+    def sync(self):
+        if self._unsynced:
+            os.fsync(self._fd)
+            self._unsynced = 0
+
+    def close(self):
+        if self._fd is None:
+            return
+        if self.fsync != "never":
+            self.sync()
+        os.close(self._fd)
+        self._fd = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def read_products(path):
+    """Lee un archivo JSON Lines ignorando una última línea truncada"""
+    products = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                products.append(json.loads(line))
+            except ValueError:
+                # Solo la última línea puede estar incompleta tras una caída
+                break
+    return products
+
+def convert_to_json(jsonl_path, json_path=None):
+    """Genera el JSON con indentación a partir del JSON Lines. Devuelve la ruta escrita"""
+    if json_path is None:
+        json_path = json_path_for(jsonl_path)
+
+    products = read_products(jsonl_path)
+    tmp_path = json_path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(products, f, ensure_ascii=False, indent=4)
+    os.replace(tmp_path, json_path)
+    return json_path
+
+# Ejecutar: python stream_output.py output-chrome/productos_chrome_iphone_20250101_120000.jsonl
+if __name__ == "__main__":
+    import sys
+
+    for path in sys.argv[1:]:
+        print(f"{path} -> {convert_to_json(path)}")
@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+"""
+Planificación de términos para lotes largos sin intervención
+- Cada término tiene una prioridad (menor número = antes) y un plazo opcional
+- Los workers toman siempre el término más prioritario; a igual prioridad, el de plazo
+  más cercano y después el orden de entrada
+- Un término cuyo plazo vence antes de empezar no se procesa: queda como vencido en el resumen
+- Misma interfaz que queue.Queue para BrowserPool (put y get_nowait); los reintentos
+  conservan la prioridad y el plazo del término
+- Archivo de términos: una línea por término, "término[<TAB>prioridad[<TAB>plazo]]"
+"""
+import heapq
+import itertools
+import math
+import queue
+import threading
+import time
+from datetime import datetime
+
+DEFAULT_PRIORITY = 5
+
+def parse_deadline(value, start=None):
+    """Plazo como fecha ISO ("2026-10-18T06:00") o minutos desde el inicio del lote. Devuelve epoch o None"""
+    value = (value or "").strip()
+    if not value:
+        return None
+    try:
+        return (start or time.time()) + float(value) * 60
+    except ValueError:
+        return datetime.fromisoformat(value).timestamp()
+
+def read_terms(lines, default_priority=DEFAULT_PRIORITY, default_deadline=None, start=None):
+    """[(término, prioridad, plazo)] sin líneas vacías, comentarios (#) ni términos repetidos"""
+    terms = []
+    seen = set()
+    for number, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        fields = [field.strip() for field in line.split("\t")]
+        term = fields[0]
+        if term.lower() in seen:
+            continue
+        try:
+            priority = int(fields[1]) if len(fields) > 1 and fields[1] else default_priority
+            deadline = parse_deadline(fields[2], start) if len(fields) > 2 else None
+        except ValueError as e:
+            raise ValueError(f"Línea {number} no válida ({line!r}): {e}")
+        seen.add(term.lower())
+        terms.append((term, priority, deadline if deadline is not None else default_deadline))
+    return terms
+
+class TermScheduler:
+    """Cola de términos por (prioridad, plazo, orden de entrada) con descarte de vencidos"""
+
+    def __init__(self, clock=time.time):
+        self.clock = clock
+        self.expired = []
+        self._info = {}
+        self._heap = []
+        self._order = itertools.count()
+        self._lock = threading.Lock()
+
+    def add(self, term, priority=DEFAULT_PRIORITY, deadline=None):
+        """Registra la prioridad y el plazo de un término (se encola con put)"""
+        with self._lock:
+            self._info[term] = (priority, deadline)
+
+    def add_many(self, terms):
+        """Registra [(término, prioridad, plazo)] y devuelve los términos en el orden de entrada"""
+        for term, priority, deadline in terms:
+            self.add(term, priority, deadline)
+        return [term for term, _, _ in terms]
+
+    def put(self, job):
+        term, attempt = job
+        with self._lock:
+            priority, deadline = self._info.get(term, (DEFAULT_PRIORITY, None))
+            heapq.heappush(self._heap, (priority, math.inf if deadline is None else deadline,
+                                        next(self._order), term, attempt))
+
+    def get_nowait(self):
+        """Siguiente (término, intento). Los vencidos se apartan; sin términos lanza queue.Empty"""
+        with self._lock:
+            now = self.clock()
+            while self._heap:
+                _, deadline, _, term, attempt = heapq.heappop(self._heap)
+                if deadline < now:
+                    self.expired.append(term)
+                    continue
+                return term, attempt
+        raise queue.Empty
+
+    def __len__(self):
+        with self._lock:
+            return len(self._heap)
@@ -0,0 +1,27 @@
+# -*- coding: utf-8 -*-
+import importlib.util
+import json
+import os
+import sys
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+import pytest
+
+# Resultados reales de un listado (poly-cards de catálogo, noviembre de 2025)
+SAMPLE_RESULTS = os.path.join(REPO_DIR, "output-chrome", "productos_chrome_iphoe_17_20251105_111634.json")
+
+@pytest.fixture
+def sample_products():
+    with open(SAMPLE_RESULTS, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+@pytest.fixture(scope="session")
+def chrome_script():
+    """Scraping-Selenium-chrome.py como módulo (requiere selenium)"""
+    pytest.importorskip("selenium")
+    spec = importlib.util.spec_from_file_location("scraping_chrome", os.path.join(REPO_DIR, "Scraping-Selenium-chrome.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+import contextlib
+import io
+import os
+from pathlib import Path
+
+import pytest
+
+from batch_extraction import build_products, extract_products_batch
+from driver_cache import find_chrome_binary
+from offline_parser import parse_listing_html
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks", "fixtures", "v1")
+FIXTURE_PAGES = ("grid.html", "list.html", "missing_prices.html", "cents.html", "polycard.html")
+FIELDS = ("titulo", "precio", "url", "posicion", "metodo_extraccion")
+
+def test_build_products_keeps_the_base_record():
+    products = build_products([
+        {"titulo": ["iPhone 17", "attr_title"], "precio": ["US$ 24,000", "javascript_precio_mx"],
+         "url": None, "html_debug": {"outer_html": "<li></li>", "class": "ui-search-layout__item"}},
+        {"titulo": None, "precio": None, "url": None, "error": "TypeError: card is null"},
+    ], start_position=31)
+
+    assert products[0]["metodo_extraccion"] == {"titulo": "attr_title", "precio": "javascript_precio_mx", "url": "ninguno"}
+    assert products[0]["url"] == "No disponible" and products[0]["posicion"] == 31
+    assert products[1]["titulo"] == "No disponible" and products[1]["posicion"] == 32
+    assert products[1]["html_debug"] == {"error": "TypeError: card is null"}
+
+@pytest.fixture(scope="module")
+def driver(chrome_script):
+    try:
+        find_chrome_binary()
+    except FileNotFoundError as e:
+        pytest.skip(str(e))
+    with contextlib.redirect_stdout(io.StringIO()):
+        driver = chrome_script.create_chrome_driver(headless=True)
+    yield driver
+    driver.quit()
+
+@pytest.mark.parametrize("page", FIXTURE_PAGES)
+def test_batch_matches_offline_on_saved_pages(page, driver, chrome_script):
+    path = os.path.join(FIXTURES_DIR, page)
+    with open(path, 'r', encoding='utf-8') as f:
+        offline = parse_listing_html(f.read())
+
+    driver.get(Path(path).as_uri())
+    items, _ = chrome_script.find_product_items(driver)
+    batch = extract_products_batch(driver, items)
+
+    assert [{field: p[field] for field in FIELDS} for p in batch] == \
+           [{field: p[field] for field in FIELDS} for p in offline]
@@ -0,0 +1,31 @@
+# -*- coding: utf-8 -*-
+from browser_pool import BrowserPool
+
+class BrokenResetDriver:
+    """Navegador cuya limpieza entre términos falla"""
+    quits = 0
+
+    @property
+    def window_handles(self):
+        raise RuntimeError("sesión perdida")
+
+    def quit(self):
+        BrokenResetDriver.quits += 1
+
+def test_reset_failure_keeps_term_result():
+    BrokenResetDriver.quits = 0
+    calls = []
+
+    def job(driver, term):
+        calls.append(term)
+        return [{"titulo": term}], 1
+
+    pool = BrowserPool(BrokenResetDriver, size=1, max_attempts=2)
+    results = pool.run(["iphone 17", "ipad"], job)
+
+    assert calls == ["iphone 17", "ipad"]
+    assert results == {"iphone 17": [{"titulo": "iphone 17"}], "ipad": [{"titulo": "ipad"}]}
+    assert pool.errors == {}
+    assert pool.stats[1]["errores"] == 0
+    assert pool.stats[1]["navegadores_iniciados"] == 2
+    assert BrokenResetDriver.quits == 2
@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+import copy
+import os
+
+from checkpoint import CheckpointJournal
+from stream_output import ProductStreamWriter, stream_path_for
+
+def start_term(tmp_path):
+    journal = CheckpointJournal(str(tmp_path / "checkpoint.jsonl"), {"paginas": 2})
+    output = str(tmp_path / "productos_chrome_iphone_17_20251105_111634.json")
+    return journal, journal.for_term("iphone 17", output), stream_path_for(output)
+
+def test_unregistered_page_is_not_written_twice(tmp_path, sample_products):
+    products = copy.deepcopy(sample_products)
+    page1, page2 = products[:8], products[8:]
+    # Una tarjeta sin URL ni ID en la página que no llegó al diario
+    page2[0]["url"] = "No disponible"
+    page2[0]["item_id"] = None
+
+    journal, term, stream = start_term(tmp_path)
+    with ProductStreamWriter(stream) as writer:
+        writer.write_many(page1)
+        term.page_done(1, "pagina1", page1, writer)
+        writer.write_many(page2[:4])
+    journal.close()
+
+    # Reanudación: la página 2 se vuelve a extraer completa
+    journal, term, stream = start_term(tmp_path)
+    assert term.resumed and term.resume_from() == 1
+    remaining = term.filter_emitted(copy.deepcopy(page2))
+    assert [product["url"] for product in remaining] == [product["url"] for product in page2[4:]]
+    journal.close()
+
+def test_cross_page_repeats_are_kept_without_dedup(tmp_path, sample_products):
+    products = copy.deepcopy(sample_products)
+    journal, term, stream = start_term(tmp_path)
+    with ProductStreamWriter(stream) as writer:
+        writer.write_many(products[:5])
+        term.page_done(1, "pagina1", products[:5], writer)
+    journal.close()
+
+    journal, term, stream = start_term(tmp_path)
+    # Página 2 con una publicación que ya salió en la página 1: el diario no la descarta
+    page2 = copy.deepcopy([products[2]] + products[5:10])
+    assert len(term.filter_emitted(page2)) == 6
+    assert os.path.exists(stream)
+    journal.close()
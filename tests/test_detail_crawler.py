@@ -0,0 +1,25 @@
+# -*- coding: utf-8 -*-
+from detail_crawler import crawl_details, merge_details
+from http_fetch import HostRateLimiter
+
+class FakeFetcher:
+    def __init__(self):
+        self.urls = []
+
+    def fetch(self, url):
+        self.urls.append(url)
+        return 200, '<html><body><meta itemprop="price" content="19999"></body></html>'
+
+def test_details_merge_on_real_output(sample_products):
+    fetcher = FakeFetcher()
+    details = crawl_details(sample_products, max_workers=2, fetcher=fetcher, log=lambda message: None, limiter=HostRateLimiter(rate=1000, burst=100))
+    assert len(details) == len(sample_products)
+    assert merge_details(sample_products, details) == len(sample_products)
+    assert sample_products[0]["item_id"] == "MLM4056190190"
+
+def test_fetches_the_article_of_the_wid(sample_products):
+    fetcher = FakeFetcher()
+    crawl_details(sample_products[:3], max_workers=1, fetcher=fetcher, log=lambda message: None, limiter=HostRateLimiter(rate=1000, burst=100))
+    # Nunca la ficha de catálogo /p/, cuya compra destacada puede ser de otro vendedor
+    assert fetcher.urls[0] == "https://articulo.mercadolibre.com.mx/MLM-4056190190"
+    assert all(url.startswith("https://articulo.mercadolibre.com.mx/MLM-") for url in fetcher.urls)
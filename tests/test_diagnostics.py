@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+import copy
+
+from diagnostics import DiagnosticsPolicy, failed_fields, page_report
+from strategy_cache import StrategyCache
+
+def test_polycard_listing_is_healthy(sample_products):
+    policy = DiagnosticsPolicy(seed=1)
+    products = copy.deepcopy(sample_products)
+
+    policy.prune(products)
+
+    assert policy.cards == 0
+    assert not any("html_debug" in product for product in products)
+    assert not policy.wants_page(products)
+
+def test_unexpected_method_and_missing_field_fail(sample_products):
+    policy = DiagnosticsPolicy(seed=1)
+    products = copy.deepcopy(sample_products)
+    products[5]["metodo_extraccion"]["precio"] = "regex_pattern"
+    products[9]["url"] = "No disponible"
+    products[9]["metodo_extraccion"]["url"] = "ninguno"
+
+    policy.prune(products)
+
+    assert policy.cards == 2
+    assert [index for index, product in enumerate(products) if "html_debug" in product] == [5, 9]
+    report = page_report(products, "https://listado.mercadolibre.com.mx/iphone-17", policy)
+    assert report["tarjetas_con_fallos"] == [{"posicion": products[5]["posicion"], "campos": ["precio"]},
+                                             {"posicion": products[9]["posicion"], "campos": ["url"]}]
+
+def test_learned_method_from_strategy_cache(sample_products):
+    strategies = StrategyCache()
+    strategies.record("grid", "titulo", "xpath_title_class", True, 0.01)
+    policy = DiagnosticsPolicy(seed=1, strategies=strategies)
+
+    assert policy.failed_fields(sample_products[0], "grid") == ["titulo"]
+    assert policy.failed_fields(sample_products[0], "list") == []
+    assert failed_fields(sample_products[0]) == []
@@ -0,0 +1,26 @@
+# -*- coding: utf-8 -*-
+import pytest
+
+from http_fetch import ITEM_HOST, HostRateLimiter
+
+@pytest.mark.parametrize("kwargs", [
+    {"burst": 0},
+    {"rate": 0},
+    {"rate": -1},
+    {"rates": {ITEM_HOST: 0}},
+])
+def test_invalid_limits_are_rejected(kwargs):
+    with pytest.raises(ValueError):
+        HostRateLimiter(**kwargs)
+
+def test_article_host_uses_its_own_rate():
+    limiter = HostRateLimiter(rate=1000, burst=1, rates={ITEM_HOST: 500})
+    limiter.acquire("https://articulo.mercadolibre.com.mx/MLM-4056190190")
+    assert limiter.summary()[ITEM_HOST]["limite"] == 500
+
+@pytest.mark.parametrize("option", [["--rafaga", "0"], ["--workers", "0"], ["--listado-por-segundo", "0"],
+                                    ["--articulo-por-segundo", "-2"]])
+def test_cli_rejects_invalid_limits(chrome_script, option):
+    with pytest.raises(SystemExit) as exit_info:
+        chrome_script.run_batch_cli(option + ["iphone 17"])
+    assert exit_info.value.code == 2
@@ -0,0 +1,20 @@
+# -*- coding: utf-8 -*-
+from item_ids import canonical_url, item_id_from_url
+
+POLYCARD_URL = ("https://www.mercadolibre.com.mx/apple-iphone-17-pro-max-256-gb-naranja-cosmico-solo-esim-distribuidor-autorizado"
+                "/p/MLM1054106936#polycard_client=search-nordic&search_layout=stack&position=1&type=product"
+                "&tracking_id=12c415b8-4d10-4e80-bf33-0bc11f18f773&wid=MLM4056190190&sid=search")
+
+def test_wid_in_fragment():
+    assert item_id_from_url(POLYCARD_URL) == "MLM4056190190"
+    assert canonical_url(POLYCARD_URL) == "https://articulo.mercadolibre.com.mx/MLM-4056190190"
+
+def test_wid_in_query_and_article_url():
+    assert item_id_from_url("https://www.mercadolibre.com.mx/algo/p/MLM123456?wid=MLM987654321") == "MLM987654321"
+    assert item_id_from_url("https://articulo.mercadolibre.com.mx/MLM-1234567890-iphone-_JM") == "MLM1234567890"
+    assert item_id_from_url("https://www.mercadolibre.com.mx/algo/p/MLM123456") is None
+
+def test_every_sample_url_has_an_id(sample_products):
+    ids = [item_id_from_url(product["url"]) for product in sample_products]
+    assert all(ids)
+    assert len(set(ids)) == len(ids)
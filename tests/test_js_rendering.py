@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+import functools
+import os
+import threading
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from http_fetch import USER_AGENT, HttpFetcher, needs_js_rendering
+from offline_parser import parse_listing_html
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks", "fixtures", "v1")
+LISTING = '<ol><li class="ui-search-layout__item">iPhone 17</li></ol>'
+CAPTCHA = '<div class="ui-search-layout__item"></div><form id="captcha">Verifica que no eres un robot</form>'
+
+@pytest.mark.parametrize("status, html, expected", [
+    (200, LISTING, False),
+    (200, '<div class="ui-search-result">iPhone 17</div>', False),
+    (403, LISTING, True),
+    (200, "", True),
+    (200, None, True),
+    # Sin tarjetas en el HTML del servidor: las arma JavaScript
+    (200, '<div id="root"></div><script src="app.js"></script>', True),
+    # Con tarjetas, pero dentro de una página de verificación
+    (200, CAPTCHA, True),
+    (200, LISTING + "<noscript>Habilita JavaScript</noscript>", True),
+])
+def test_needs_js_rendering(status, html, expected):
+    assert needs_js_rendering(status, html) is expected
+
+@pytest.fixture
+def fixture_server():
+    """Servidor local con las páginas de benchmarks; guarda el User-Agent de cada petición"""
+    user_agents = []
+
+    class Handler(SimpleHTTPRequestHandler):
+        def do_GET(self):
+            user_agents.append(self.headers.get("User-Agent"))
+            super().do_GET()
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), functools.partial(Handler, directory=FIXTURES_DIR))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/", user_agents
+    server.shutdown()
+    server.server_close()
+
+def test_http_fetch_from_local_server(fixture_server):
+    base_url, user_agents = fixture_server
+    with HttpFetcher(retries=0) as fetcher:
+        status, html = fetcher.fetch(base_url + "polycard.html")
+        missing_status, _ = fetcher.fetch(base_url + "no_existe.html")
+
+    assert status == 200 and not needs_js_rendering(status, html)
+    assert len(parse_listing_html(html)) == 15
+    assert missing_status == 404
+    assert user_agents == [USER_AGENT, USER_AGENT]
+
+def test_first_page_without_cards_falls_back_to_the_browser(chrome_script):
+    class Writer:
+        def write_many(self, products):
+            raise AssertionError("No se debe escribir nada antes del respaldo con Chrome")
+
+    pages = {"https://listado.mercadolibre.com.mx/iphone-17": (200, CAPTCHA)}
+    assert chrome_script.scrape_pages(pages.get, list(pages), Writer()) is None
+
+def test_later_page_without_cards_ends_pagination(chrome_script):
+    with open(os.path.join(FIXTURES_DIR, "polycard.html"), 'r', encoding='utf-8') as f:
+        html = f.read()
+    written = []
+
+    class Writer:
+        def write_many(self, products):
+            written.extend(products)
+
+    pages = {
+        "https://listado.mercadolibre.com.mx/iphone-17": (200, html),
+        "https://listado.mercadolibre.com.mx/iphone-17_Desde_51_NoIndex_True": (503, ""),
+        "https://listado.mercadolibre.com.mx/iphone-17_Desde_101_NoIndex_True": (200, html),
+    }
+    products = chrome_script.scrape_pages(pages.get, list(pages), Writer(), max_products=None)
+
+    assert len(products) == len(written) == 15
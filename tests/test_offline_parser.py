@@ -0,0 +1,32 @@
+# -*- coding: utf-8 -*-
+import os
+
+from offline_parser import parse_listing_html
+
+# Poly-cards armadas con los títulos, precios y URLs de la salida real de Chrome (tests/conftest.py)
+POLYCARD_HTML = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks", "fixtures", "v1",
+                             "polycard.html")
+
+def test_offline_records_match_the_browser_run(sample_products):
+    with open(POLYCARD_HTML, 'r', encoding='utf-8') as f:
+        products = parse_listing_html(f.read())
+
+    # Mismos campos y mismo método ganador que el bucle de Selenium; html_debug depende del DOM guardado
+    fields = ("titulo", "precio", "url", "posicion", "metodo_extraccion")
+    assert [{field: p[field] for field in fields} for p in products] == \
+           [{field: p[field] for field in fields} for p in sample_products]
+    assert all(p["html_debug"]["class"] == "ui-search-layout__item" for p in products)
+
+def test_missing_fields_keep_the_base_record():
+    html = ('<section class="ui-search-results"><ol><li class="ui-search-layout__item">'
+            '<h2>Funda para iPhone 17</h2></li></ol></section>')
+    product, = parse_listing_html(html, start_position=16)
+
+    assert product["titulo"] == "Funda para iPhone 17"
+    assert product["precio"] == product["url"] == "No disponible"
+    assert product["posicion"] == 16
+    assert product["metodo_extraccion"] == {"titulo": "tag_h2", "precio": "ninguno", "url": "ninguno"}
+
+def test_max_products_limits_the_cards():
+    with open(POLYCARD_HTML, 'r', encoding='utf-8') as f:
+        assert len(parse_listing_html(f.read(), max_products=5)) == 5
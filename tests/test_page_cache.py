@@ -0,0 +1,34 @@
+# -*- coding: utf-8 -*-
+from concurrent.futures import ThreadPoolExecutor
+
+from page_cache import PageCache
+
+LISTING = '<ol><li class="ui-search-layout__item">iphone</li></ol>'
+
+def test_only_cached_pages_come_from_the_cache(tmp_path):
+    cache = PageCache(str(tmp_path / "cache.sqlite"), ttl=900)
+    cache.put("https://listado.mercadolibre.com.mx/iphone", LISTING)
+    fetched = []
+
+    def fetch_with_browser(url):
+        fetched.append(url)
+        return 200, LISTING
+
+    fetch = cache.wrap(fetch_with_browser)
+    fetch("https://listado.mercadolibre.com.mx/iphone")
+    fetch("https://listado.mercadolibre.com.mx/iphone_Desde_51_NoIndex_True")
+
+    assert fetched == ["https://listado.mercadolibre.com.mx/iphone_Desde_51_NoIndex_True"]
+    assert cache.stats["aciertos"] == 1 and cache.stats["descargas"] == 1
+    cache.close()
+
+def test_stats_add_up_across_pool_threads(tmp_path):
+    cache = PageCache(str(tmp_path / "cache.sqlite"), ttl=900)
+    urls = [f"https://listado.mercadolibre.com.mx/iphone_Desde_{n * 50 + 1}_NoIndex_True" for n in range(20)]
+    fetch = cache.wrap(lambda url: (200, LISTING))
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(fetch, urls * 10))
+
+    assert cache.stats["aciertos"] + cache.stats["descargas"] == 200
+    cache.close()
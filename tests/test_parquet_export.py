@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+import glob
+import os
+
+import pytest
+
+from checkpoint import CheckpointJournal
+from stream_output import read_products
+
+pq = pytest.importorskip("pyarrow.parquet")
+
+GRID_HTML = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks", "fixtures", "v1", "grid.html")
+
+def partition_rows(parquet_dir):
+    files = glob.glob(os.path.join(parquet_dir, "fecha=*", "termino=*", "*.parquet"))
+    return sum(pq.ParquetFile(path).metadata.num_rows for path in files)
+
+def test_interrupted_term_is_exported_once(tmp_path, monkeypatch, chrome_script):
+    with open(GRID_HTML, 'r', encoding='utf-8') as f:
+        html = f.read()
+    failing = {"pagina": 2}
+
+    def fake_fetch(driver, url, waits=None, timings=None):
+        if failing["pagina"] and "_Desde_" in url:
+            raise RuntimeError("navegador caído")
+        return 200, html
+    monkeypatch.setattr(chrome_script, "fetch_page_source", fake_fetch)
+
+    output_dir = str(tmp_path)
+    parquet_dir = str(tmp_path / "parquet")
+    journal = CheckpointJournal(str(tmp_path / "checkpoint.jsonl"), {"paginas": 2})
+    with pytest.raises(RuntimeError):
+        chrome_script.scrape_term_with_driver(None, "iphone 17", output_dir, num_pages=2,
+                                              parquet_dir=parquet_dir, checkpoint=journal)
+    assert partition_rows(parquet_dir) == 0
+    assert not glob.glob(os.path.join(parquet_dir, "fecha=*", "termino=*", ".*.tmp"))
+
+    # Reintento: sigue en la página 2 y exporta el término completo una sola vez
+    failing["pagina"] = None
+    products, _ = chrome_script.scrape_term_with_driver(None, "iphone 17", output_dir, num_pages=2,
+                                                        parquet_dir=parquet_dir, checkpoint=journal)
+    stream = glob.glob(os.path.join(output_dir, "productos_chrome_iphone_17_*.jsonl"))
+    assert len(stream) == 1
+    assert len(products) == len(read_products(stream[0])) > 0
+    assert partition_rows(parquet_dir) == len(products)
+    journal.close()
+
+def test_export_suffixed_result_file(tmp_path, sample_products):
+    from parquet_export import export_file
+    from stream_output import ProductStreamWriter
+
+    (tmp_path / "productos_chrome_iphone_17_20251105_111634.jsonl").write_text("")
+    with ProductStreamWriter(str(tmp_path / "productos_chrome_iphone_17_20251105_111634.jsonl")) as writer:
+        writer.write_many(sample_products)
+
+    path = export_file(writer.path, str(tmp_path / "parquet"))
+    assert path.endswith("termino=iphone_17/productos_chrome_iphone_17_20251105_111634_1.parquet")
+    assert pq.ParquetFile(path).metadata.num_rows == len(sample_products)
@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+import pytest
+
+from price_normalizer import annotate_prices, normalize_price, normalize_prices
+
+@pytest.mark.parametrize("raw, cents, ambiguous", [
+    # Reglas de México: coma para miles, punto para decimales
+    ("$ 19,999", 1999900, False),
+    ("$ 1,234.56", 123456, False),
+    ("$ 1,234,567", 123456700, False),
+    ("$ 499", 49900, False),
+    ("$ 24,999.5", 2499950, False),
+    # Formato europeo: el último separador es el decimal, pero se marca como dudoso
+    ("$ 1.234,56", 123456, True),
+    ("$ 99,5", 9950, True),
+])
+def test_mx_and_eu_separators(raw, cents, ambiguous):
+    normalized = normalize_price(raw)
+    assert normalized["amount_cents"] == cents
+    assert normalized["currency"] == "MXN"
+    assert normalized["ambiguous"] is ambiguous
+    assert normalized["raw"] == raw
+
+@pytest.mark.parametrize("raw", ["US$ 24,000", "USD 24,000", "U$S 24,000", "us$\xa024,000"])
+def test_dollar_prices(raw):
+    normalized = normalize_price(raw)
+    assert normalized["amount_cents"] == 2400000
+    assert normalized["currency"] == "USD"
+    assert normalized["ambiguous"] is False
+
+@pytest.mark.parametrize("raw, cents", [
+    # Un solo punto con tres dígitos: miles en México, decimales en notación europea
+    ("$ 1.234", 123400),
+    # Decimales de más de dos dígitos con ambos separadores
+    ("$ 1,234.567", 123456700),
+    # Precio anterior y actual en el mismo texto: se toma el primero
+    ("$ 29,998 $ 24,999", 2999800),
+    # Separadores que no forman grupos de miles
+    ("$ 12,34,5", 1234500),
+])
+def test_ambiguous_values_are_flagged(raw, cents):
+    normalized = normalize_price(raw)
+    assert normalized["amount_cents"] == cents
+    assert normalized["ambiguous"] is True
+
+@pytest.mark.parametrize("raw, ambiguous", [(None, False), ("No disponible", False), ("Consultar precio", True)])
+def test_missing_amount(raw, ambiguous):
+    normalized = normalize_price(raw)
+    assert normalized["amount_cents"] is None
+    assert normalized["ambiguous"] is ambiguous
+
+def test_batch_matches_single_and_annotates_real_prices(sample_products):
+    raws = [product["precio"] for product in sample_products]
+    assert normalize_prices(raws) == [normalize_price(raw) for raw in raws]
+
+    annotated = annotate_prices(sample_products)
+    assert annotated is sample_products
+    by_currency = {product["precio"]: product["precio_normalizado"]["currency"] for product in annotated}
+    assert by_currency["US$ 24,000"] == "USD" and by_currency["$ 30,999"] == "MXN"
+    assert not any(product["precio_normalizado"]["ambiguous"] for product in annotated)
@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+import copy
+
+from product_store import ProductStore
+
+def test_catalog_sellers_are_separate_rows(tmp_path, sample_products):
+    store = ProductStore(str(tmp_path / "productos.sqlite"))
+    first = copy.deepcopy(sample_products[0])
+    # Otro vendedor de la misma ficha de catálogo /p/MLM1054106936
+    other_seller = copy.deepcopy(first)
+    other_seller["url"] = first["url"].replace("wid=MLM4056190190", "wid=MLM4056190191")
+    other_seller["precio"] = "$ 1"
+    other_seller.pop("precio_normalizado", None)
+    other_seller.pop("item_id", None)
+
+    assert store.save_products("iphone 17", [first, other_seller], observed_at=1762363000) == 2
+    assert store.save_products("iphone 17", [first], observed_at=1762366600) == 1
+
+    with store._lock:
+        keys = sorted(row[0] for row in store._db.execute("SELECT item_id FROM products"))
+    assert keys == ["MLM4056190190", "MLM4056190191"]
+    assert len(store.price_history("MLM4056190190", days=100000)) == 2
+    assert [raw for _, _, raw in store.price_history("MLM4056190191", days=100000)] == ["$ 1"]
+    store.close()
+
+def test_import_suffixed_result_file(tmp_path, sample_products):
+    from stream_output import ProductStreamWriter
+
+    taken = tmp_path / "productos_chrome_iphone_17_20251105_111634.jsonl"
+    taken.write_text("")
+    with ProductStreamWriter(str(taken)) as writer:
+        writer.write_many(sample_products)
+    assert writer.path.endswith("_20251105_111634_1.jsonl")
+
+    store = ProductStore(str(tmp_path / "productos.sqlite"))
+    assert store.import_file(writer.path) == len(sample_products)
+    assert store.term_summary("iphone 17", days=100000)
+    assert store.import_file(str(tmp_path / "otro_archivo.jsonl")) == 0
+    store.close()
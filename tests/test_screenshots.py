@@ -0,0 +1,28 @@
+# -*- coding: utf-8 -*-
+import copy
+
+from diagnostics import DiagnosticsPolicy
+from screenshots import ScreenshotCapture
+
+def test_only_fallback_skips_healthy_polycards(tmp_path, sample_products):
+    policy = DiagnosticsPolicy(seed=1)
+    capture = ScreenshotCapture(only_fallback=True).start(str(tmp_path), policy)
+    products = copy.deepcopy(sample_products)
+    products[7]["metodo_extraccion"]["titulo"] = "javascript_title"
+
+    wanted = []
+    for idx, product_data in enumerate(products):
+        policy.wants_card(product_data, "grid")
+        if capture.wants(idx, product_data, "grid"):
+            wanted.append(idx)
+    capture.close()
+
+    assert wanted == [7]
+
+def test_only_fallback_without_policy_counts_missing_fields(sample_products):
+    capture = ScreenshotCapture(only_fallback=True)
+    product_data = copy.deepcopy(sample_products[0])
+    assert not capture.wants(0, product_data)
+    product_data["precio"] = "No disponible"
+    product_data["metodo_extraccion"]["precio"] = "ninguno"
+    assert capture.wants(0, product_data)
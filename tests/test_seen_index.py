@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+import copy
+import os
+
+from item_ids import SeenIndex
+
+POLYCARD_HTML = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks", "fixtures", "v1",
+                             "polycard.html")
+
+def test_repeated_polycard_is_dropped_across_pages(tmp_path, sample_products):
+    index = SeenIndex(str(tmp_path / "vistas.sqlite"))
+    page1 = copy.deepcopy(sample_products[:10])
+    # La misma publicación en la página 2 llega con otra posición y otro tracking_id en el fragmento
+    repeated = copy.deepcopy(sample_products[3])
+    repeated["url"] = repeated["url"].replace("position=4", "position=51").replace("tracking_id=12c4", "tracking_id=99aa")
+    page2 = [repeated] + copy.deepcopy(sample_products[10:])
+
+    new1 = index.filter_products(page1)
+    index.add_products(new1)
+    new2 = index.filter_products(page2)
+    index.add_products(new2)
+
+    assert len(new1) == 10
+    assert [product["item_id"] for product in new2] == [product["item_id"] for product in page2[1:]]
+    assert index.skipped == 1
+    index.close()
+
+def test_dedup_across_runs(tmp_path, sample_products):
+    path = str(tmp_path / "vistas.sqlite")
+    first = SeenIndex(path)
+    first.add_products(first.filter_products(copy.deepcopy(sample_products)))
+    first.close()
+
+    second = SeenIndex(path)
+    assert second.filter_products(copy.deepcopy(sample_products)) == []
+    assert second.skipped == len(sample_products)
+    second.close()
+
+def test_failed_write_does_not_mark_products_as_seen(tmp_path, chrome_script):
+    with open(POLYCARD_HTML, 'r', encoding='utf-8') as f:
+        html = f.read()
+
+    class FailingWriter:
+        def write_many(self, products):
+            raise OSError("disco lleno")
+
+    index = SeenIndex(str(tmp_path / "vistas.sqlite"))
+    products = chrome_script.scrape_pages(lambda url: (200, html), ["https://listado.mercadolibre.com.mx/iphone-17"],
+                                          FailingWriter(), seen=index)
+
+    # Una escritura fallida no debe dejar las publicaciones como vistas: la siguiente ejecución las extrae
+    assert len(products) == 15
+    assert len(index.filter_products(copy.deepcopy(products))) == 15
+    index.close()
@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+from strategy_cache import StrategyCache, run_strategies
+
+def polycard_cascade(card, calls):
+    """Cascada de título como en una poly-card: los dos primeros métodos fallan"""
+    def method(name, value):
+        def run():
+            calls.append(name)
+            return (value, name) if value else None
+        return name, run
+    return [
+        method("xpath_title_class", card.get("clase")),
+        method("tag_h2", card.get("h2")),
+        method("attr_title", card.get("title")),
+        method("javascript_title", card.get("texto")),
+    ]
+
+def fixed_order(card):
+    for _, strategy in polycard_cascade(card, []):
+        result = strategy()
+        if result:
+            return result
+
+def test_verified_winner_skips_failed_attempts_with_same_output():
+    cache = StrategyCache(explore_every=10, confirmations=3)
+    cards = [{"title": f"iPhone {index}", "texto": f"iPhone {index} texto"} for index in range(40)]
+    # Una tarjeta sin atributo title: el adelantado falla y sigue el orden fijo
+    cards[25] = {"texto": "Sin title"}
+    # Otra con la clase clásica: solo la ve la cascada completa de verificación (tarjeta 30)
+    cards[29]["clase"] = "Título clásico"
+
+    calls = []
+    results = [run_strategies(cache, "grid", "titulo", polycard_cascade(card, calls)) for card in cards]
+
+    assert results == [fixed_order(card) for card in cards]
+    # Sin caché serían 3 intentos por tarjeta (2 fallidos + attr_title)
+    assert len(calls) < 3 * len(cards) * 0.6
+    assert cache.expected_method("grid", "titulo") == "attr_title"
+
+def test_winner_is_not_promoted_before_confirmation():
+    cache = StrategyCache(explore_every=0, confirmations=3)
+    methods = ["xpath_title_class", "tag_h2", "attr_title"]
+    cache.confirm("grid", "titulo", "attr_title")
+    cache.confirm("grid", "titulo", "attr_title")
+    assert cache.plan("grid", "titulo", methods) == (methods, None)
+    cache.confirm("grid", "titulo", "attr_title")
+    assert cache.plan("grid", "titulo", methods) == (["attr_title", "xpath_title_class", "tag_h2"], "attr_title")
+    # Un primer acierto distinto en el orden fijo reinicia la confirmación
+    cache.confirm("grid", "titulo", "tag_h2")
+    assert cache.plan("grid", "titulo", methods) == (methods, None)
+
+def test_only_equivalent_methods_are_ranked_by_speed():
+    cache = StrategyCache(explore_every=0)
+    cache.record("grid", "url", "javascript", True, 0.001)
+    cache.record("grid", "url", "tag_a", True, 0.1)
+    cache.record("grid", "url", "class_link", False, 1.0)
+
+    assert cache.order("grid", "url", ["class_link", "tag_a", "javascript"], [("tag_a", "javascript")]) == \
+        ["class_link", "javascript", "tag_a"]
+    assert cache.order("grid", "url", ["class_link", "tag_a", "javascript"]) == ["class_link", "tag_a", "javascript"]
+    assert cache.expected_method("list", "url") is None
+
+def test_winners_persist(tmp_path):
+    path = str(tmp_path / "estrategias.json")
+    cache = StrategyCache(path, confirmations=1)
+    cache.record("grid", "precio", "javascript_precio_mx", True, 0.01)
+    cache.confirm("grid", "precio", "javascript_precio_mx")
+    cache.save()
+
+    reloaded = StrategyCache(path, confirmations=1)
+    assert reloaded.summary() == {"grid": {"precio": "javascript_precio_mx"}}
+
+class Link:
+    def __init__(self, href):
+        self.href = href
+
+    def get_attribute(self, name):
+        return self.href
+
+class Card:
+    """Tarjeta con un enlace ui-search-link sin href y otro enlace con href"""
+    def find_elements(self, by, value):
+        if "ui-search-link" in value:
+            return [Link(None)]
+        return [Link("https://www.mercadolibre.com.mx/otro")]
+
+class Driver:
+    def execute_script(self, script, item):
+        return "https://www.mercadolibre.com.mx/js"
+
+def test_class_link_without_href_goes_to_javascript(chrome_script):
+    result = run_strategies(None, "grid", "url", chrome_script.EXTRACTION_STRATEGIES["url"], Driver(), Card())
+    assert result == ("https://www.mercadolibre.com.mx/js", "javascript")
@@ -0,0 +1,33 @@
+# -*- coding: utf-8 -*-
+import os
+
+from stream_output import ProductStreamWriter, read_products
+
+def test_file_is_created_on_first_write(tmp_path):
+    path = str(tmp_path / "productos.jsonl")
+    writer = ProductStreamWriter(path)
+    assert not os.path.exists(path)
+    writer.close()
+    assert not os.path.exists(path)
+    assert writer.count == 0
+
+def test_new_run_never_appends_to_existing_file(tmp_path):
+    path = str(tmp_path / "productos.jsonl")
+    with ProductStreamWriter(path) as first:
+        first.write({"titulo": "a"})
+    with ProductStreamWriter(path) as second:
+        second.write({"titulo": "b"})
+
+    assert second.path == str(tmp_path / "productos_1.jsonl")
+    assert read_products(path) == [{"titulo": "a"}]
+    assert read_products(second.path) == [{"titulo": "b"}]
+
+def test_resume_appends(tmp_path):
+    path = str(tmp_path / "productos.jsonl")
+    with ProductStreamWriter(path) as first:
+        first.write({"titulo": "a"})
+    with ProductStreamWriter(path, resume=True) as resumed:
+        resumed.write({"titulo": "b"})
+
+    assert resumed.path == path
+    assert read_products(path) == [{"titulo": "a"}, {"titulo": "b"}]
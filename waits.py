@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+"""
+Esperas por eventos en lugar de time.sleep fijos
+- El listado está listo cuando existen el contenedor de resultados y los precios,
+  o cuando la red queda inactiva (sin recursos nuevos) con el documento completo
+- Cada paso tiene su propio tiempo máximo y se registra cuánto tardó realmente
+"""
+import threading
+import time
+
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+
+# Tiempo máximo (segundos) por paso
+DEFAULT_TIMEOUTS = {
+    "listado": 10,
+    "disclaimer": 2,
+    "cierre_disclaimer": 3,
+    "scroll": 2,
+}
+
+POLL_FREQUENCY = 0.1
+
+DISCLAIMER_XPATH = '//button[@data-testid="action:understood-button"]'
+
+LISTING_STATE_SCRIPT = """
+return {
+    container: !!document.querySelector('section.ui-search-results, div.ui-search-results, ol.ui-search-layout'),
+    prices: document.querySelectorAll('.andes-money-amount__fraction, [class*="price-tag-amount"]').length,
+    ready: document.readyState,
+    resources: performance.getEntriesByType('resource').length
+};
+"""
+
+IN_VIEWPORT_SCRIPT = """
+var rect = arguments[0].getBoundingClientRect();
+return rect.top >= 0 && rect.bottom <= (window.innerHeight || document.documentElement.clientHeight);
+"""
+
+class WaitRecorder:
+    """Registra la duración de cada espera por paso"""
+
+    def __init__(self, timeouts=None):
+        self.timeouts = dict(DEFAULT_TIMEOUTS)
+        if timeouts:
+            self.timeouts.update(timeouts)
+        self.durations = {}
+        self.expired = {}
+        self._lock = threading.Lock()
+
+    def timeout(self, step):
+        return self.timeouts.get(step, 5)
+
+    def record(self, step, seconds, expired=False):
+        with self._lock:
+            self.durations.setdefault(step, []).append(seconds)
+            if expired:
+                self.expired[step] = self.expired.get(step, 0) + 1
+
+    def summary(self):
+        """{paso: {esperas, total, maximo, agotadas}} en segundos"""
+        return {
+            step: {
+                "esperas": len(values),
+                "total": round(sum(values), 3),
+                "maximo": round(max(values), 3),
+                "agotadas": self.expired.get(step, 0),
+            }
+            for step, values in self.durations.items()
+        }
+
+    def log_summary(self, log):
+        summary = self.summary()
+        if not summary:
+            return
+        log("Tiempos de espera por paso:")
+        for step, stats in summary.items():
+            log(f"  - {step}: {stats['esperas']} esperas, {stats['total']:.2f} s en total, "
+                f"máximo {stats['maximo']:.2f} s, {stats['agotadas']} agotadas")
+
+def timed_wait(driver, recorder, step, condition):
+    """Espera hasta que condition(driver) sea verdadera. Devuelve su valor o None si se agota"""
+    recorder = recorder or WaitRecorder()
+    start = time.perf_counter()
+    try:
+        result = WebDriverWait(driver, recorder.timeout(step), poll_frequency=POLL_FREQUENCY).until(condition)
+        recorder.record(step, time.perf_counter() - start)
+        return result
+    except TimeoutException:
+        recorder.record(step, time.perf_counter() - start, expired=True)
+        return None
+
+class listing_ready:
+    """Condición de WebDriverWait: resultados y precios presentes, o red inactiva"""
+
+    def __init__(self, idle_time=0.5):
+        self.idle_time = idle_time
+        self.last_resources = None
+        self.last_change = time.perf_counter()
+
+    def __call__(self, driver):
+        state = driver.execute_script(LISTING_STATE_SCRIPT)
+        if state["container"] and state["prices"]:
+            return "contenido"
+
+        if state["ready"] == "complete":
+            if state["resources"] != self.last_resources:
+                self.last_resources = state["resources"]
+                self.last_change = time.perf_counter()
+            elif time.perf_counter() - self.last_change >= self.idle_time:
+                return "red_inactiva"
+        return False
+
+def wait_for_listing(driver, recorder=None):
+    """Bloquea hasta que el listado está utilizable. Devuelve el motivo o None si se agotó"""
+    return timed_wait(driver, recorder, "listado", listing_ready())
+
+def dismiss_disclaimer(driver, recorder=None):
+    """Cierra el disclaimer si aparece y espera a que desaparezca. Devuelve True si se cerró"""
+    # Con el listado ya cargado, si el botón no está en el DOM no hay nada que esperar
+    if not driver.find_elements(By.XPATH, DISCLAIMER_XPATH):
+        return False
+
+    button = timed_wait(driver, recorder, "disclaimer",
+                        EC.element_to_be_clickable((By.XPATH, DISCLAIMER_XPATH)))
+    if not button:
+        return False
+
+    button.click()
+    timed_wait(driver, recorder, "cierre_disclaimer", EC.invisibility_of_element(button))
+    return True
+
+def scroll_into_view(driver, element, recorder=None):
+    """Centra el elemento y espera solo hasta que esté dentro del viewport"""
+    driver.execute_script("arguments[0].scrollIntoView({block: 'center', behavior: 'instant'});", element)
+    return timed_wait(driver, recorder, "scroll",
+                      lambda d: d.execute_script(IN_VIEWPORT_SCRIPT, element))